@@ -7,6 +7,9 @@ Usage:
 Examples:
     python predict.py "Lakers" "Warriors"
     python predict.py "Celtics" "Heat"
+    python predict.py "Lakers" "Warriors" --profile      # cProfile report in data/profiles/
+    python predict.py "Lakers" "Warriors" --timings      # per-step wall/CPU breakdown
+    python predict.py --batch matchups.csv --out results.csv --workers 4
 """
 
 if __name__ == "__main__":
@@ -16,6 +19,6 @@ if __name__ == "__main__":
     # Add src to path so imports work
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
     
-    # Now run the predictor
-    from advanced_enhanced_predictor import main
-    main()
+    # Now run the predictor (--profile, --profile=sample and --timings are handled here)
+    from profiling import profile_main
+    profile_main('batch:main' if '--batch' in sys.argv else 'advanced_enhanced_predictor:main')
@@ -7,6 +7,7 @@ Usage:
     python quick_analyze.py matchup "Team1" "Team2"
     python quick_analyze.py player "Player Name"
     python quick_analyze.py today
+    python quick_analyze.py today --profile=sample   # collapsed stacks for flame graphs
 """
 
 import sys
@@ -15,8 +16,8 @@ import os
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-# Import and run the analyzer
-from src.analyze import main
+# Import and run the analyzer (imported under the profiler when --profile is given)
+from profiling import profile_main
 
 if __name__ == "__main__":
-    main()
+    profile_main('src.analyze:main')
@@ -12,18 +12,112 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from main import NBADataExtractor
-from prediction_model import AdvancedPredictor
-from nba_api.live.nba.endpoints import scoreboard
+from prediction_model import AdvancedPredictor, AVAILABILITY_IMPACT
+from dag import MATCHUP_DAG, DEFAULT_WORKERS, matchup_context
+from data_quality import summarize, print_summary
+from profiling import PhaseTimer, timings_enabled
 import time
 
+# Steps a comprehensive matchup analysis reads (see dag.py)
+COMPREHENSIVE_OUTPUTS = ('home_stats', 'away_stats', 'h2h', 'home_rest', 'away_rest', 'home_defense',
+                         'away_defense', 'home_efficiency', 'away_efficiency', 'players', 'prediction')
+
 class SuperPredictor(NBADataExtractor):
     """Ultimate predictor with all advanced features"""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, client=None, ratings=None, http=None, form=None, feature_store=None):
+        super().__init__(client, http, form, feature_store)
         self.predictor = AdvancedPredictor()
+        self.predictor.attach_dependencies(self.dependencies)
+        self.predictor.cache.on_evict = self._prediction_evicted
+        # Optional TeamRatings (see ratings.py) used as an extra prediction factor
+        self.ratings = ratings
+        # Wall/CPU time of each step of the last analysis
+        self.timings = PhaseTimer()
+        # Threads for independent analysis steps (1 runs them in order, with per-step memory)
+        self.workers = DEFAULT_WORKERS
+        # key_players_status each matchup was last analyzed with, so recompute_stale repeats it
+        self.matchup_status = {}
+    
+    def refresh_data(self):
+        """Refresh game data and drop memoized predictions built on the old data"""
+        super().refresh_data()
+        self.predictor.cache.invalidate()
+    
+    def recompute_stale(self):
+        """Re-run the matchup analyses invalidated since they ran (see refresh_changed)
+
+        Returns {(home, away): result}; matchups whose inputs did not change are not touched.
+        Each one is re-run with the player availability it was analyzed with. A matchup
+        that can no longer be analyzed (result None) is forgotten.
+        """
+        results = {}
+        for node in sorted(self.stale_matchups):
+            results[node[1:]] = self.comprehensive_matchup_analysis(*node[1:], self.matchup_status.get(node))
+            if results[node[1:]] is None:
+                self.forget_matchup(node)
+        return results
+    
+    def forget_matchup(self, node):
+        """Drop a matchup node along with the player availability it was analyzed with"""
+        super().forget_matchup(node)
+        self.matchup_status.pop(node, None)
+    
+    def _prediction_evicted(self, key):
+        """Prediction cache eviction: the entry's node goes, and so do the matchups built on it"""
+        node = ('prediction', key)
+        for matchup in self.dependencies.dependents(node, 'matchup'):
+            self.forget_matchup(matchup)
+        self.dependencies.forget(node)
+    
+    def get_team_rating_stats(self, team_name):
+        """Current Elo rating summary for a team, or None without ratings"""
+        team = self.get_team_by_name(team_name)
+        if not team:
+            return None
+        stored = self._stored_inputs(team, 'rating_stats')
+        if stored is not None:
+            return stored
+        if self.ratings is None:
+            return None
+        return self.ratings.rating_stats(team['id'])
     
     def comprehensive_matchup_analysis(self, home_team, away_team, key_players_status=None):
+        """Full matchup analysis; the prediction carries a data_quality block listing any fallbacks
+
+        The result also carries 'timings', the wall/CPU breakdown of each step.
+        """
+        self.timings = PhaseTimer()
+        result = self._comprehensive_matchup_analysis(home_team, away_team, key_players_status)
+        node = ('matchup', home_team, away_team)
+        self.stale_matchups.discard(node)
+        if key_players_status:
+            self.matchup_status[node] = key_players_status
+        else:
+            self.matchup_status.pop(node, None)
+        self.timings.stop()
+        if result:
+            result['prediction'] = {**result['prediction'], 'data_quality': summarize(result.pop('issues'))}
+            print_summary(result['prediction']['data_quality'])
+            result['timings'] = self.timings.summary()
+        if timings_enabled():
+            self.timings.print_breakdown('MATCHUP ANALYSIS')
+        return result
+    
+    def analyze_matchups(self, matchups, outputs=('prediction', 'insights'), workers=None):
+        """Run the analysis steps for several (home, away) matchups in one DAG run
+
+        Only the steps the outputs need run; a team appearing in several matchups is
+        fetched and summarized once. Returns {(home, away): {output: value, 'issues': [...]}}.
+        """
+        contexts = [matchup_context(home, away) for home, away in matchups]
+        results = MATCHUP_DAG.run(contexts, outputs, self, workers=workers or self.workers, timer=self.timings)
+        for context in contexts:
+            self.stale_matchups.discard(context['node'])
+            self.matchup_status.pop(context['node'], None)
+        return {(context['home'], context['away']): result for context, result in zip(contexts, results)}
+    
+    def _comprehensive_matchup_analysis(self, home_team, away_team, key_players_status=None):
         """
         Complete matchup analysis with ALL factors:
         - Recent team performance
@@ -31,149 +125,111 @@ class SuperPredictor(NBADataExtractor):
         - Rest days / fatigue
         - Defensive stats
         - Player availability
+
+        The inputs are gathered by the analysis DAG (dag.py), independent steps in parallel.
         """
         print("\n" + "="*80)
         print(f"🏀 COMPREHENSIVE MATCHUP ANALYSIS: {away_team} @ {home_team} 🏀".center(80))
         print("="*80)
         
-        # 1. Get basic team stats
+        context = matchup_context(home_team, away_team, key_players_status)
+        steps = MATCHUP_DAG.run([context], COMPREHENSIVE_OUTPUTS, self, workers=self.workers, timer=self.timings)[0]
+        home_stats, away_stats = steps['home_stats'], steps['away_stats']
+        home_defense, away_defense = steps['home_defense'], steps['away_defense']
+        home_rest, away_rest = steps['home_rest'], steps['away_rest']
+        home_efficiency, away_efficiency = steps['home_efficiency'], steps['away_efficiency']
+        h2h_stats, prediction = steps['h2h'], steps['prediction']
+        home_adjustment, away_adjustment = steps['players']['home'], steps['players']['away']
+        
+        # 1. Team stats
+        self.timings.start('report')
         print("\n" + "="*80)
         print("📊 STEP 1: TEAM PERFORMANCE ANALYSIS".center(80))
         print("="*80)
         
-        home_stats = self.get_team_recent_performance(home_team, last_n_games=10)
-        away_stats = self.get_team_recent_performance(away_team, last_n_games=10)
-        
         if not home_stats or not away_stats:
             print("❌ Unable to fetch team data.")
             return None
+        for stats in (home_stats, away_stats):
+            print(f"\n{stats['team_name']}: {stats['wins']}-{stats['losses']} in last {stats['games_played']} games "
+                  f"| {stats['avg_points_scored']:.1f} PPG")
         
-        # 2. Get head-to-head history
+        # 2. Head-to-head history
         print("\n" + "="*80)
         print("🔄 STEP 2: HEAD-TO-HEAD HISTORY".center(80))
         print("="*80)
         
-        h2h_stats = self.get_head_to_head_history(home_team, away_team, last_n_games=5)
+        if h2h_stats and h2h_stats.get('games_played', 0) > 0:
+            print(f"\n   Last {h2h_stats['games_played']} meetings: {h2h_stats['team1_wins']}-{h2h_stats['team2_wins']}")
+        else:
+            print("\n   No recent meetings")
         
-        # 3. Check rest days for both teams
+        # 3. Rest days for both teams
         print("\n" + "="*80)
         print("😴 STEP 3: REST & FATIGUE ANALYSIS".center(80))
         print("="*80)
         
-        print(f"\n{home_stats['team_name']}:")
-        home_rest = self.get_rest_days(home_team)
-        if home_rest:
-            print(f"   Rest Days: {home_rest['rest_days']}")
-            print(f"   Back-to-Back: {'YES ⚠️' if home_rest['is_back_to_back'] else 'NO ✅'}")
-            print(f"   Fatigue Factor: {home_rest['fatigue_factor']:+d}%")
-            if home_rest['fatigue_factor'] < 0:
-                print(f"   ⚠️  Team may be fatigued!")
-            elif home_rest['fatigue_factor'] > 0:
-                print(f"   ✅ Team is well-rested!")
-        
-        print(f"\n{away_stats['team_name']}:")
-        away_rest = self.get_rest_days(away_team)
-        if away_rest:
-            print(f"   Rest Days: {away_rest['rest_days']}")
-            print(f"   Back-to-Back: {'YES ⚠️' if away_rest['is_back_to_back'] else 'NO ✅'}")
-            print(f"   Fatigue Factor: {away_rest['fatigue_factor']:+d}%")
-            if away_rest['fatigue_factor'] < 0:
-                print(f"   ⚠️  Team may be fatigued!")
-            elif away_rest['fatigue_factor'] > 0:
-                print(f"   ✅ Team is well-rested!")
-        
-        # 4. Get defensive stats
+        for stats, rest in ((home_stats, home_rest), (away_stats, away_rest)):
+            print(f"\n{stats['team_name']}:")
+            if rest:
+                print(f"   Rest Days: {rest['rest_days']}")
+                print(f"   Back-to-Back: {'YES ⚠️' if rest['is_back_to_back'] else 'NO ✅'}")
+                print(f"   Fatigue Factor: {rest['fatigue_factor']:+d}%")
+                if rest['fatigue_factor'] < 0:
+                    print(f"   ⚠️  Team may be fatigued!")
+                elif rest['fatigue_factor'] > 0:
+                    print(f"   ✅ Team is well-rested!")
+        
+        # 4. Defensive stats
         print("\n" + "="*80)
         print("🛡️  STEP 4: DEFENSIVE ANALYSIS".center(80))
         print("="*80)
         
-        print(f"\n{home_stats['team_name']} Defense:")
-        home_defense = self.get_team_defensive_stats(home_team, last_n_games=10)
-        if home_defense:
-            print(f"   Points Allowed: {home_defense['avg_points_allowed']:.1f} PPG")
-            print(f"   Defensive Rating: {home_defense['defensive_rating']:.1f}")
-            print(f"   Point Differential: {home_defense['avg_point_differential']:+.1f}")
-        
-        print(f"\n{away_stats['team_name']} Defense:")
-        away_defense = self.get_team_defensive_stats(away_team, last_n_games=10)
-        if away_defense:
-            print(f"   Points Allowed: {away_defense['avg_points_allowed']:.1f} PPG")
-            print(f"   Defensive Rating: {away_defense['defensive_rating']:.1f}")
-            print(f"   Point Differential: {away_defense['avg_point_differential']:+.1f}")
+        for stats, defense in ((home_stats, home_defense), (away_stats, away_defense)):
+            print(f"\n{stats['team_name']} Defense:")
+            if defense:
+                print(f"   Points Allowed: {defense['avg_points_allowed']:.1f} PPG")
+                print(f"   Defensive Rating: {defense['defensive_rating']:.1f}")
+                print(f"   Point Differential: {defense['avg_point_differential']:+.1f}")
+        
+        # Pace-adjusted ratings (per 100 possessions) from the league-wide game table
+        if home_efficiency and away_efficiency:
+            print(f"\n⚡ Efficiency (per 100 possessions):")
+            for stats, efficiency in ((home_stats, home_efficiency), (away_stats, away_efficiency)):
+                print(f"   {stats['team_name']}: ORtg {efficiency['off_rating']:.1f} | "
+                      f"DRtg {efficiency['def_rating']:.1f} | Net {efficiency['net_rating']:+.1f} | "
+                      f"Pace {efficiency['pace']:.1f}")
         
         # 5. Player availability analysis
-        home_adjustment = 0
-        away_adjustment = 0
-        
         if key_players_status:
             print("\n" + "="*80)
             print("⭐ STEP 5: PLAYER AVAILABILITY ANALYSIS".center(80))
             print("="*80)
             
-            # Analyze home team players
-            if 'home' in key_players_status:
-                print(f"\n{home_stats['team_name']} Key Players:")
-                for player in key_players_status['home']:
+            for side, stats in (('home', home_stats), ('away', away_stats)):
+                if side not in key_players_status:
+                    continue
+                print(f"\n{stats['team_name']} Key Players:")
+                for player in key_players_status[side]:
                     status_icon = "✅" if player['playing'] else "❌"
                     status_text = "PLAYING" if player['playing'] else "OUT"
                     
                     print(f"  {status_icon} {player['name']}: {status_text}")
                     
                     if not player['playing']:
-                        impact_values = {'high': -10, 'medium': -5, 'low': -2}
-                        adjustment = impact_values.get(player.get('impact', 'medium'), -5)
-                        home_adjustment += adjustment
-                        print(f"     Impact: {player.get('impact', 'medium').upper()} "
-                              f"(Team strength {adjustment:+d}%)")
-            
-            # Analyze away team players
-            if 'away' in key_players_status:
-                print(f"\n{away_stats['team_name']} Key Players:")
-                for player in key_players_status['away']:
-                    status_icon = "✅" if player['playing'] else "❌"
-                    status_text = "PLAYING" if player['playing'] else "OUT"
-                    
-                    print(f"  {status_icon} {player['name']}: {status_text}")
-                    
-                    if not player['playing']:
-                        impact_values = {'high': -10, 'medium': -5, 'low': -2}
-                        adjustment = impact_values.get(player.get('impact', 'medium'), -5)
-                        away_adjustment += adjustment
+                        adjustment = AVAILABILITY_IMPACT.get(player.get('impact', 'medium'), -5)
                         print(f"     Impact: {player.get('impact', 'medium').upper()} "
                               f"(Team strength {adjustment:+d}%)")
         
-        # 6. Generate advanced prediction
+        # 6. Advanced prediction (computed by the prediction step with every factor)
         print("\n" + "="*80)
         print("🎯 STEP 6: ADVANCED PREDICTION CALCULATION".center(80))
         print("="*80)
         
-        # Get base prediction with all factors
-        prediction = self.predictor.predict_match_outcome(
-            home_stats, 
-            away_stats,
-            home_defensive_stats=home_defense,
-            away_defensive_stats=away_defense,
-            h2h_stats=h2h_stats,
-            home_rest_stats=home_rest,
-            away_rest_stats=away_rest
-        )
-        
-        # Apply player availability adjustments
         if home_adjustment != 0 or away_adjustment != 0:
-            print(f"\n📝 Adjusting for player availability...")
+            print(f"\n📝 Adjusted for player availability:")
             print(f"   {home_stats['team_name']}: {home_adjustment:+d}%")
             print(f"   {away_stats['team_name']}: {away_adjustment:+d}%")
-            
-            home_prob = prediction['home_win_probability'] + home_adjustment
-            away_prob = prediction['away_win_probability'] + away_adjustment
-            
-            total = home_prob + away_prob
-            home_prob = (home_prob / total) * 100
-            away_prob = (away_prob / total) * 100
-            
-            prediction['home_win_probability'] = round(home_prob, 2)
-            prediction['away_win_probability'] = round(away_prob, 2)
-            prediction['favored_team'] = home_stats['team_name'] if home_prob > away_prob else away_stats['team_name']
         
         # 7. Display final prediction
         print("\n" + "="*80)
@@ -250,7 +306,8 @@ class SuperPredictor(NBADataExtractor):
             'away_rest': away_rest,
             'home_defense': home_defense,
             'away_defense': away_defense,
-            'prediction': prediction
+            'prediction': prediction,
+            'issues': steps['issues']
         }
 
 
@@ -265,16 +322,23 @@ def main():
         python advanced_enhanced_predictor.py "Lakers" "Warriors"
         python advanced_enhanced_predictor.py "Bucks" "Celtics"
         python advanced_enhanced_predictor.py "Pacers" "Heat"
+        python advanced_enhanced_predictor.py "Lakers" "Warriors" --features   # saved feature store
     """
     import sys
+    from ratings import TeamRatings
+    from feature_store import FeatureStore
     
-    predictor = SuperPredictor()
+    argv = [arg for arg in sys.argv if arg != '--features']
+    # Saved Elo ratings (python -m src.ratings build) are used when present; with --features the
+    # team inputs come from the feature store, the same rows backtests read
+    feature_store = FeatureStore.load() if '--features' in sys.argv else None
+    predictor = SuperPredictor(ratings=TeamRatings.load(), feature_store=feature_store)
     
     # Check if command line arguments are provided
-    if len(sys.argv) >= 3:
+    if len(argv) >= 3:
         # User provided team names via command line
-        home_team = sys.argv[1]
-        away_team = sys.argv[2]
+        home_team = argv[1]
+        away_team = argv[2]
         
         print("\n" + "="*80)
         print(f"CUSTOM MATCHUP PREDICTION".center(80))
@@ -5,28 +5,41 @@ Run this to analyze specific matchups and players
 
 from .main import NBADataExtractor
 from .prediction_model import AdvancedPredictor, generate_betting_insights
+from .prefetch import REWARM_INTERVAL, SlatePrefetcher
+from .profiling import PhaseTimer, profile_main, timings_enabled
 import sys
 
-def analyze_matchup(home_team, away_team, key_players=None):
-    """Analyze a specific matchup with predictions"""
+def analyze_matchup(home_team, away_team, key_players=None, extractor=None, predictor=None, store=None,
+                    timer=None):
+    """Analyze a specific matchup with predictions
+    
+    Pass a shared extractor/predictor to reuse memoized predictions across queries,
+    and a ResultStore to append every prediction as it completes. Each step is
+    timed into timer (a PhaseTimer); the breakdown is printed with --timings.
+    """
+    timer = timer or PhaseTimer()
+    timer.start('setup')
     print("\n" + "="*70)
     print(f"NBA MATCH ANALYSIS: {away_team} @ {home_team}".center(70))
     print("="*70)
     
-    extractor = NBADataExtractor()
-    predictor = AdvancedPredictor()
+    extractor = extractor or NBADataExtractor()
+    predictor = predictor or AdvancedPredictor()
     
     # Get team stats
+    timer.start('team stats')
     home_stats = extractor.get_team_recent_performance(home_team, last_n_games=10)
     away_stats = extractor.get_team_recent_performance(away_team, last_n_games=10)
     
     if not home_stats or not away_stats:
+        timer.stop()
         print("❌ Unable to fetch team data. Check team names.")
         return
     
     # Get player stats if provided
     player_stats = []
     if key_players:
+        timer.start('key players')
         print(f"\n{'='*70}")
         print("KEY PLAYERS ANALYSIS".center(70))
         print("="*70)
@@ -39,6 +52,8 @@ def analyze_matchup(home_team, away_team, key_players=None):
                 # Player performance prediction
                 player_prediction = predictor.predict_player_performance(stats)
                 if player_prediction:
+                    if store:
+                        store.append_player(player_prediction, stats)
                     print(f"\n{player_prediction['player']}:")
                     print(f"  {player_prediction['prediction']}")
                     print(f"  Expected Points: {player_prediction['expected_points_range']}")
@@ -50,8 +65,13 @@ def analyze_matchup(home_team, away_team, key_players=None):
     print("ADVANCED MATCH PREDICTION".center(70))
     print("="*70)
     
+    timer.start('predict')
     prediction = predictor.predict_match_outcome(home_stats, away_stats, player_stats)
+    if store:
+        timer.start('store')
+        store.append_matchup(prediction, home_stats['team_name'], away_stats['team_name'])
     
+    timer.start('report')
     print(f"\n🏆 PREDICTED WINNER: {prediction['favored_team']}")
     print(f"   Confidence Level: {prediction['confidence']}")
     print(f"\n📊 WIN PROBABILITIES:")
@@ -74,16 +94,19 @@ def analyze_matchup(home_team, away_team, key_players=None):
     print(f"\n{'='*70}")
     print("ANALYSIS COMPLETE".center(70))
     print("="*70 + "\n")
+    timer.stop()
+    if timings_enabled():
+        timer.print_breakdown('MATCHUP ANALYSIS')
 
 
-def quick_player_analysis(player_name):
+def quick_player_analysis(player_name, extractor=None, predictor=None, store=None):
     """Quick analysis of a single player"""
     print("\n" + "="*70)
     print(f"PLAYER ANALYSIS: {player_name}".center(70))
     print("="*70)
     
-    extractor = NBADataExtractor()
-    predictor = AdvancedPredictor()
+    extractor = extractor or NBADataExtractor()
+    predictor = predictor or AdvancedPredictor()
     
     stats = extractor.get_player_recent_stats(player_name, last_n_games=10)
     
@@ -93,6 +116,8 @@ def quick_player_analysis(player_name):
     
     # Performance prediction
     prediction = predictor.predict_player_performance(stats)
+    if prediction and store:
+        store.append_player(prediction, stats)
     
     if prediction:
         print(f"\n{'='*70}")
@@ -122,13 +147,13 @@ def quick_player_analysis(player_name):
     print(f"\n{'='*70}\n")
 
 
-def show_todays_games():
+def show_todays_games(extractor=None):
     """Show all games scheduled for today"""
     print("\n" + "="*70)
     print("TODAY'S NBA GAMES".center(70))
     print("="*70)
     
-    extractor = NBADataExtractor()
+    extractor = extractor or NBADataExtractor()
     games = extractor.get_todays_games()
     
     if not games:
@@ -146,9 +171,19 @@ def interactive_mode():
     print("  1. Analyze matchup: matchup [home_team] vs [away_team]")
     print("  2. Analyze player: player [player_name]")
     print("  3. Show today's games: today")
-    print("  4. Exit: quit")
+    print("  4. Refresh game data: refresh")
+    print("  5. Exit: quit")
     print("="*70)
     
+    # One extractor/predictor for the whole session so repeat queries hit the cache
+    extractor = NBADataExtractor()
+    predictor = AdvancedPredictor()
+    
+    # Warm today's slate in the background while the user types
+    prefetcher = SlatePrefetcher(extractor)
+    prefetcher.start(interval=REWARM_INTERVAL)
+    print("\n🔥 Warming cache for today's games in the background...")
+    
     while True:
         user_input = input("\n> ").strip()
         
@@ -156,15 +191,21 @@ def interactive_mode():
             continue
         
         if user_input.lower() == 'quit' or user_input.lower() == 'exit':
+            prefetcher.stop(timeout=1)
             print("\n👋 Thanks for using NBA Prediction Tool!")
             break
         
         elif user_input.lower() == 'today':
-            show_todays_games()
+            show_todays_games(extractor)
+        
+        elif user_input.lower() == 'refresh':
+            extractor.refresh_data()
+            predictor.cache.invalidate()
+            print("🔄 Game data refreshed - cached predictions cleared")
         
         elif user_input.lower().startswith('player '):
             player_name = user_input[7:].strip()
-            quick_player_analysis(player_name)
+            quick_player_analysis(player_name, extractor, predictor)
         
         elif user_input.lower().startswith('matchup '):
             # Parse matchup command
@@ -177,7 +218,7 @@ def interactive_mode():
                 key_input = input("Enter key players to analyze (comma-separated, or press Enter to skip): ").strip()
                 key_players = [p.strip() for p in key_input.split(',')] if key_input else None
                 
-                analyze_matchup(home_team, away_team, key_players)
+                analyze_matchup(home_team, away_team, key_players, extractor, predictor)
             else:
                 print("❌ Invalid format. Use: matchup [away_team] vs [home_team]")
         
@@ -185,7 +226,8 @@ def interactive_mode():
             print("❌ Unknown command. Type 'quit' to exit or use one of the commands above.")
 
 
-if __name__ == "__main__":
+def main():
+    """Command line entry point (also used by quick_analyze.py)"""
     if len(sys.argv) > 1:
         command = sys.argv[1].lower()
         
@@ -196,6 +238,16 @@ if __name__ == "__main__":
             player_name = ' '.join(sys.argv[2:])
             quick_player_analysis(player_name)
         
+        elif command == 'batch' and len(sys.argv) > 2:
+            # Format: python analyze.py batch matchups.csv [--out results.csv] [--workers 4]
+            from .batch import main as batch_main
+            batch_main(sys.argv[2:])
+        
+        elif command == 'props':
+            # Format: python analyze.py props [--stat PTS] [--player "Jayson Tatum" --line 24.5]
+            from .props import main as props_main
+            props_main(sys.argv[2:])
+        
         elif command == 'matchup' and len(sys.argv) > 3:
             # Format: python analyze.py matchup "Lakers" "Warriors" "LeBron James,Stephen Curry"
             home_team = sys.argv[2]
@@ -209,7 +261,14 @@ if __name__ == "__main__":
             print("  python analyze.py today")
             print("  python analyze.py player 'LeBron James'")
             print("  python analyze.py matchup 'Lakers' 'Warriors' 'LeBron James,Stephen Curry'")
+            print("  python analyze.py batch matchups.csv --out results.csv")
+            print("  python analyze.py props --stat PTS --player 'Jayson Tatum' --line 24.5")
+            print("  add --timings for a phase breakdown, --profile or --profile=sample to profile")
     
     else:
         # Run interactive mode
         interactive_mode()
+
+
+if __name__ == "__main__":
+    profile_main(main)
@@ -0,0 +1,199 @@
+"""
+Batch matchup analysis from a CSV or JSON file
+Fetches every team frame the batch needs once (the union of all teams, in parallel
+through the shared rate limiter), runs the matchups through the streaming pipeline
+with parallel fetch and predict workers, and writes one combined result table.
+
+Input - CSV with columns home_team, away_team and optional home_out / away_out
+(players out, separated by ';', each optionally 'Name:impact'):
+    home_team,away_team,home_out,away_out
+    Celtics,Knicks,,Jalen Brunson:high
+    Nuggets,Lakers,Jamal Murray:medium;Aaron Gordon:low,
+
+or JSON - a list of {"home_team", "away_team", "key_players_status": {"home": [...], "away": [...]}}
+(or the same home_out / away_out lists). Each side may list names ('Name:impact'), dicts with
+at least a "name", or one ';'-separated string; missing "playing" / "impact" default to out / medium.
+
+Usage:
+    python predict.py --batch scenarios.csv --out data/results/scenarios.csv --workers 4
+    python -m src.batch scenarios.json
+"""
+
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+import pandas as pd
+sys.path.insert(0, os.path.dirname(__file__))
+from endpoints import CURRENT_SEASON, PREVIOUS_SEASON
+from pipeline import SlatePipeline
+from result_store import matchup_record, json_default
+
+DEFAULT_WORKERS = 4
+
+
+def _players_out(value):
+    """key-player entries from 'Name:impact;Name' (CSV) or a list of names / dicts (JSON)"""
+    if value is None or (isinstance(value, float) and pd.isna(value)) or value == '':
+        return []
+    items = value.split(';') if isinstance(value, str) else value
+    players = []
+    for item in items:
+        if isinstance(item, dict):
+            players.append({'playing': False, 'impact': 'medium', **item})
+            continue
+        name, _, impact = str(item).strip().partition(':')
+        if name:
+            players.append({'name': name.strip(), 'playing': False, 'impact': impact.strip() or 'medium'})
+    return players
+
+
+def load_matchups(path):
+    """Matchups from a .csv or .json file as pipeline game dicts"""
+    if path.lower().endswith('.json'):
+        with open(path) as f:
+            rows = json.load(f)
+    else:
+        rows = pd.read_csv(path, dtype=str, keep_default_na=False).to_dict('records')
+
+    games = []
+    for index, row in enumerate(rows):
+        if not row.get('home_team') or not row.get('away_team'):
+            raise ValueError(f"Row {index + 1}: home_team and away_team are required")
+        given = row.get('key_players_status') or {}
+        status = {side: _players_out(given.get(side, row.get(f'{side}_out'))) for side in ('home', 'away')}
+        games.append({
+            'game_id': str(index),
+            'home_team': row['home_team'].strip(),
+            'away_team': row['away_team'].strip(),
+            'key_players_status': status if status.get('home') or status.get('away') else None,
+        })
+    return games
+
+
+class BatchRunner:
+    """Run a list of matchups with the data fetched once and predictions in parallel"""
+
+    def __init__(self, predictor=None, workers=DEFAULT_WORKERS, store=None, quiet=True):
+        if predictor is None:
+            from advanced_enhanced_predictor import SuperPredictor
+            from ratings import TeamRatings
+            predictor = SuperPredictor(ratings=TeamRatings.load())
+        self.predictor = predictor
+        self.workers = workers
+        self.store = store
+        self.quiet = quiet
+        self.summary = {'matchups': 0, 'teams': 0, 'errors': 0, 'seconds': 0.0}
+
+    def prefetch(self, games):
+        """Fetch the frames for the union of teams in the batch (each team once)"""
+        client = self.predictor.client
+        teams = {}
+        for game in games:
+            for name in (game['home_team'], game['away_team']):
+                team = self.predictor.get_team_by_name(name)
+                if team:
+                    teams[team['id']] = team
+
+        def fetch(team_id):
+            try:
+                if client.league_game_finder(team_id, CURRENT_SEASON).empty:
+                    client.league_game_finder(team_id, PREVIOUS_SEASON)
+            except Exception:
+                pass  # the analysis reports the missing data for this team
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            futures = [pool.submit(fetch, team_id) for team_id in teams]
+            if hasattr(self.predictor, 'get_team_efficiency_stats'):
+                futures.append(pool.submit(client.league_games, CURRENT_SEASON, cache=True))
+            for future in futures:
+                future.exception()
+        self.summary['teams'] = len(teams)
+        return list(teams.values())
+
+    def run(self, games):
+        """Results for every game, in input order"""
+        started = time.time()
+        output = io.StringIO() if self.quiet else sys.stdout
+        with redirect_stdout(output):
+            self.prefetch(games)
+            pipeline = SlatePipeline(self.predictor, store=self.store, fetch_workers=self.workers,
+                                     predict_workers=self.workers, queue_size=max(2, self.workers))
+            results = list(pipeline.run(games))
+        order = {game['game_id']: index for index, game in enumerate(games)}
+        results.sort(key=lambda result: order.get(result.get('game_id', result.get('game', {}).get('game_id')), 0))
+        self.summary.update(matchups=len(results), errors=sum('error' in r for r in results),
+                            seconds=round(time.time() - started, 2))
+        return results
+
+
+def results_table(games, results):
+    """One row per matchup: the stored matchup record plus availability and errors
+
+    home_team / away_team are the names as given in the input on every row; the full
+    names they resolved to are in home_team_name / away_team_name (empty on error rows).
+    """
+    rows = []
+    for game, result in zip(games, results):
+        row = {'game_id': game['game_id'], 'home_team': game['home_team'], 'away_team': game['away_team'],
+               'home_team_name': '', 'away_team_name': ''}
+        if 'error' in result:
+            row['error'] = result['error']
+        else:
+            record = matchup_record(result['prediction'], result['home_team'], result['away_team'])
+            row.update(record, home_team=game['home_team'], away_team=game['away_team'],
+                       home_team_name=record['home_team'], away_team_name=record['away_team'])
+            row['players_out'] = '; '.join(
+                f"{side}: {player['name']}" for side, players in (game.get('key_players_status') or {}).items()
+                for player in players or [] if not player['playing'])
+            row['error'] = ''
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def write_results(table, path):
+    """Write the combined table as .csv or .json (by extension)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.lower().endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump(table.to_dict('records'), f, indent=2, default=json_default)
+    else:
+        table.to_csv(path, index=False)
+
+
+def main(argv=None):
+    """Batch command line (also reached through predict.py --batch)"""
+    argv = sys.argv[1:] if argv is None else argv
+    argv = [arg for arg in argv if arg != '--batch']
+    if not argv:
+        print("Usage: python predict.py --batch matchups.csv [--out results.csv] [--workers 4] [--verbose]")
+        return 1
+    path = argv[0]
+    out = argv[argv.index('--out') + 1] if '--out' in argv else \
+        os.path.join('data', 'results', os.path.splitext(os.path.basename(path))[0] + '_predictions.csv')
+    workers = int(argv[argv.index('--workers') + 1]) if '--workers' in argv else DEFAULT_WORKERS
+
+    games = load_matchups(path)
+    print(f"\n📋 {len(games)} matchups from {path}")
+    runner = BatchRunner(workers=workers, quiet='--verbose' not in argv)
+    results = runner.run(games)
+    table = results_table(games, results)
+    write_results(table, out)
+
+    for _, row in table.iterrows():
+        if row['error']:
+            print(f"   ⚠️  {row['away_team']} @ {row['home_team']}: {row['error']}")
+        else:
+            print(f"   🏀 {row['away_team']} @ {row['home_team']}: {row['favored_team']} "
+                  f"({row['home_win_probability']:.1f}% - {row['away_win_probability']:.1f}%)")
+    print(f"\n✅ {runner.summary['matchups']} matchups ({runner.summary['teams']} teams fetched once) "
+          f"in {runner.summary['seconds']}s -> {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Minimal columnar table format built on NumPy
+A table is a directory with one .npy file per column plus a _schema.json manifest.
+Columns keep explicit dtypes and can be memory-mapped, so readers only touch what they ask for.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_FILE = '_schema.json'
+
+
+def to_column(values, dtype=None):
+    """Convert a sequence into a column array that .npy can store without pickling"""
+    array = np.asarray(values, dtype=dtype)
+    if array.dtype == object:
+        # Strings (or mixed values) become fixed-width unicode; missing values become ''
+        array = np.asarray(['' if v is None or v is pd.NA or v != v else str(v) for v in values])
+    return array
+
+
+def _encode_column(values):
+    """(array, categories) - categoricals are stored as integer codes plus their categories"""
+    if isinstance(values, (pd.Series, pd.Categorical)) and isinstance(values.dtype, pd.CategoricalDtype):
+        categorical = values.array if isinstance(values, pd.Series) else values
+        codes = categorical.codes
+        codes = codes.astype(np.int16) if len(categorical.categories) < 32767 else codes.astype(np.int32)
+        return codes, [str(c) for c in categorical.categories]
+    if isinstance(values, pd.Series) and pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(), None
+    return to_column(values), None
+
+
+def _column_stats(array):
+    """Min/max of a column (used to skip tables during reads)"""
+    if len(array) == 0 or not (np.issubdtype(array.dtype, np.number)
+                               or np.issubdtype(array.dtype, np.datetime64)):
+        return None
+    if np.issubdtype(array.dtype, np.floating) and np.isnan(array).all():
+        return None
+    low, high = (np.nanmin(array), np.nanmax(array)) if np.issubdtype(array.dtype, np.floating) \
+        else (array.min(), array.max())
+    if np.issubdtype(array.dtype, np.datetime64):
+        return {'min': str(low), 'max': str(high)}
+    return {'min': low.item(), 'max': high.item()}
+
+
+def write_table(path, columns, metadata=None):
+    """Write a dict of name -> array as a columnar table directory"""
+    os.makedirs(path, exist_ok=True)
+    encoded = {name: _encode_column(values) for name, values in columns.items()}
+    arrays = {name: array for name, (array, _) in encoded.items()}
+    lengths = {len(a) for a in arrays.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+
+    schema = {
+        'rows': lengths.pop() if lengths else 0,
+        'columns': [],
+        'metadata': metadata or {}
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f'{name}.npy'), array, allow_pickle=False)
+        categories = encoded[name][1]
+        column = {'name': name, 'dtype': array.dtype.str,
+                  'stats': _column_stats(array) if categories is None else None}
+        if categories is not None:
+            column['categories'] = categories
+        schema['columns'].append(column)
+
+    # Manifest is written last so a half-written table is never picked up
+    tmp_path = os.path.join(path, SCHEMA_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(schema, f)
+    os.replace(tmp_path, os.path.join(path, SCHEMA_FILE))
+    return schema
+
+
+def read_schema(path):
+    """Return the manifest of a table, or None if the directory is not a complete table"""
+    try:
+        with open(os.path.join(path, SCHEMA_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def read_table(path, columns=None, mmap=True):
+    """Read some or all columns of a table as a dict of arrays (memory-mapped by default)"""
+    schema = read_schema(path)
+    if schema is None:
+        raise FileNotFoundError(f"No columnar table at {path}")
+    names = columns or [c['name'] for c in schema['columns']]
+    return {
+        name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r' if mmap else None,
+                      allow_pickle=False)
+        for name in names
+    }
+
+
+def read_frame(path, columns=None, mmap=True):
+    """Read a table as a DataFrame, rebuilding categorical columns from their codes"""
+    schema = read_schema(path)
+    if schema is None:
+        raise FileNotFoundError(f"No columnar table at {path}")
+    arrays = read_table(path, columns, mmap=mmap)
+    categories = {c['name']: c['categories'] for c in schema['columns'] if 'categories' in c}
+    data = {}
+    for name, array in arrays.items():
+        if name in categories:
+            data[name] = pd.Categorical.from_codes(np.asarray(array), categories[name])
+        else:
+            data[name] = array
+    return pd.DataFrame(data, copy=False)
+
+
+def column_range(schema, name):
+    """(min, max) recorded for a column, or None when unknown"""
+    for column in schema['columns']:
+        if column['name'] == name and column.get('stats'):
+            return column['stats']['min'], column['stats']['max']
+    return None
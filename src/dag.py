@@ -0,0 +1,301 @@
+"""
+Declarative analysis steps and a small DAG executor
+A matchup analysis is a set of named steps with explicit inputs (team stats, H2H, rest,
+defense, efficiency, ratings, players, prediction, insights). The executor:
+
+- runs only the steps the requested outputs need
+- runs independent steps concurrently on a thread pool
+- memoizes shared steps across the matchups of one run (a team playing twice in the
+  batch is fetched and summarized once), keyed by Step.key
+
+Steps report data-quality issues as usual; each result carries the issues of every step
+it was built from. What steps print on pool threads is held per step and replayed in
+declaration order once the run is done, so the log reads the same as a sequential run. With a DependencyGraph every step is tracked as a ('step', ...) node
+while the run lasts; afterwards the step nodes are forgotten and each context's node
+depends on the steps' inputs directly.
+
+Usage:
+    from src.dag import MATCHUP_DAG, matchup_context
+    results = MATCHUP_DAG.run([matchup_context('Lakers', 'Warriors')], outputs=('prediction',),
+                              analyzer=SuperPredictor())
+"""
+
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import ExitStack, contextmanager
+
+sys.path.insert(0, os.path.dirname(__file__))
+from prediction_model import generate_betting_insights, availability_adjustment, apply_availability
+
+DEFAULT_WORKERS = 4
+
+
+class _StepOutput:
+    """sys.stdout stand-in while steps run on pool threads
+
+    Threads inside capture() write to their own buffer; every other thread writes
+    through. One instance is shared by overlapping runs and removed after the last.
+    """
+
+    _lock = threading.Lock()
+    _active = None
+    _users = 0
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    @classmethod
+    @contextmanager
+    def installed(cls):
+        with cls._lock:
+            if cls._users == 0:
+                cls._active = cls(sys.stdout)
+                sys.stdout = cls._active
+            cls._users += 1
+            output = cls._active
+        try:
+            yield output
+        finally:
+            with cls._lock:
+                cls._users -= 1
+                if cls._users == 0 and sys.stdout is output:
+                    sys.stdout = output.stream
+
+    @contextmanager
+    def capture(self):
+        self._local.buffer = io.StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            self._local.buffer = None
+
+    def write(self, text):
+        return (getattr(self._local, 'buffer', None) or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class Step:
+    """One analysis step: run(analyzer, context, inputs) -> value
+
+    key(context) names a result shared between contexts (e.g. one team's stats); without
+    a key the step is computed once per context.
+    """
+
+    __slots__ = ('name', 'inputs', 'run', 'key')
+
+    def __init__(self, name, inputs, run, key=None):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.run = run
+        self.key = key
+
+    def task_key(self, context):
+        if self.key is not None:
+            return self.key(context)
+        return (self.name,) + tuple(context.get('key', ()))
+
+
+class AnalysisDAG:
+    """Named steps with explicit inputs; run() executes what the outputs need"""
+
+    def __init__(self, steps):
+        self.steps = {}
+        for step in steps:
+            missing = [name for name in step.inputs if name not in self.steps]
+            if missing:
+                raise ValueError(f"Step {step.name} needs undeclared steps: {missing}")
+            self.steps[step.name] = step
+
+    def replace(self, *steps):
+        """A copy with some steps swapped for other implementations (same names)"""
+        replaced = {step.name: step for step in steps}
+        return AnalysisDAG([replaced.get(name, step) for name, step in self.steps.items()])
+
+    def required(self, outputs):
+        """Names of the steps outputs depend on, in declaration (topological) order"""
+        needed = set()
+        pending = list(outputs)
+        while pending:
+            name = pending.pop()
+            if name not in self.steps:
+                raise KeyError(f"Unknown step: {name}")
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.steps[name].inputs)
+        return [name for name in self.steps if name in needed]
+
+    def run(self, contexts, outputs, analyzer, workers=DEFAULT_WORKERS, timer=None):
+        """Run the steps the outputs need for every context
+
+        Returns one dict per context: {output: value, 'issues': [data-quality issues]}.
+        analyzer (an NBADataExtractor) is passed to every step; its data_quality log and
+        dependencies graph are used when present. workers=1 runs everything in the
+        calling thread in declaration order (timer phases then include memory).
+        """
+        names = self.required(outputs)
+        tasks = {}       # task key -> (step, context, input task keys)
+        per_context = []
+        for context in contexts:
+            keys = {}
+            for name in names:
+                step = self.steps[name]
+                key = step.task_key(context)
+                keys[name] = key
+                if key not in tasks:
+                    tasks[key] = (step, context, [keys[i] for i in step.inputs])
+            per_context.append(keys)
+
+        results, issues = {}, {}
+        if workers <= 1:
+            for key in tasks:
+                results[key], issues[key] = self._execute(tasks[key], results, analyzer, timer, sequential=True)
+        else:
+            self._run_parallel(tasks, results, issues, analyzer, workers, timer)
+
+        graph = getattr(analyzer, 'dependencies', None)
+        outcome = []
+        for context, keys in zip(contexts, per_context):
+            if graph is not None and context.get('node') is not None:
+                with graph.track(context['node']):
+                    for name in outputs:
+                        graph.touch(('step',) + keys[name])
+            seen, collected = set(), []
+            for name in names:
+                if keys[name] not in seen:
+                    seen.add(keys[name])
+                    collected.extend(issues[keys[name]])
+            outcome.append({**{name: results[keys[name]] for name in outputs}, 'issues': collected})
+        if graph is not None:
+            for key in tasks:
+                graph.forget(('step',) + key)
+        return outcome
+
+    def _run_parallel(self, tasks, results, issues, analyzer, workers, timer):
+        waiting = {key: len(set(inputs)) for key, (_, _, inputs) in tasks.items()}
+        dependents = {}
+        for key, (_, _, inputs) in tasks.items():
+            for input_key in set(inputs):
+                dependents.setdefault(input_key, []).append(key)
+        printed = {}
+
+        def execute(key):
+            with output.capture() as buffer:
+                try:
+                    return self._execute(tasks[key], results, analyzer, timer)
+                finally:
+                    printed[key] = buffer.getvalue()
+
+        try:
+            with _StepOutput.installed() as output, ThreadPoolExecutor(workers) as pool:
+                running = {pool.submit(execute, key): key for key, count in waiting.items() if count == 0}
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        key = running.pop(future)
+                        results[key], issues[key] = future.result()
+                        for dependent in dependents.get(key, ()):
+                            waiting[dependent] -= 1
+                            if waiting[dependent] == 0:
+                                running[pool.submit(execute, dependent)] = dependent
+        finally:
+            # Replayed on the calling thread (so an enclosing capture still applies)
+            for key in tasks:
+                if printed.get(key):
+                    sys.stdout.write(printed[key])
+
+    @staticmethod
+    def _execute(task, results, analyzer, timer, sequential=False):
+        """Run one step with its inputs; returns (value, data-quality issues)"""
+        step, context, input_keys = task
+        inputs = {name: results[key] for name, key in zip(step.inputs, input_keys)}
+        quality = getattr(analyzer, 'data_quality', None)
+        graph = getattr(analyzer, 'dependencies', None)
+        collected = []
+        with ExitStack() as stack:
+            if quality is not None:
+                collected = stack.enter_context(quality.collect())
+            if graph is not None:
+                stack.enter_context(graph.track(('step',) + step.task_key(context)))
+                for key in input_keys:
+                    graph.touch(('step',) + key)
+            if timer is not None and sequential:
+                stack.enter_context(timer.phase(step.name))
+            wall, cpu = time.perf_counter(), time.thread_time()
+            value = step.run(analyzer, context, inputs)
+            if timer is not None and not sequential:
+                timer.record(step.name, time.perf_counter() - wall, time.thread_time() - cpu)
+        return value, list(collected)
+
+
+def matchup_context(home_team, away_team, key_players_status=None):
+    """Context for one matchup (tracked as the ('matchup', home, away) dependency node)"""
+    return {'home': home_team, 'away': away_team, 'key_players_status': key_players_status,
+            'key': (home_team, away_team), 'node': ('matchup', home_team, away_team)}
+
+
+def _team_step(name, side, method, **kwargs):
+    """Per-team step shared by every matchup the team appears in"""
+    def run(analyzer, context, inputs):
+        if not hasattr(analyzer, method):
+            return None
+        return getattr(analyzer, method)(context[side], **kwargs)
+    return Step(name, (), run, key=lambda context: (method, context[side]))
+
+
+def _availability(analyzer, context, inputs):
+    status = context.get('key_players_status') or {}
+    return {'home': availability_adjustment(status.get('home')), 'away': availability_adjustment(status.get('away'))}
+
+
+def _prediction(analyzer, context, inputs):
+    home_stats, away_stats = inputs['home_stats'], inputs['away_stats']
+    if not home_stats or not away_stats:
+        return None
+    prediction = analyzer.predictor.predict_match_outcome(
+        home_stats, away_stats,
+        home_defensive_stats=inputs['home_defense'], away_defensive_stats=inputs['away_defense'],
+        h2h_stats=inputs['h2h'],
+        home_rest_stats=inputs['home_rest'], away_rest_stats=inputs['away_rest'],
+        home_rating_stats=inputs['home_rating'], away_rating_stats=inputs['away_rating'],
+        home_efficiency_stats=inputs['home_efficiency'], away_efficiency_stats=inputs['away_efficiency'],
+    )
+    players = inputs['players']
+    return apply_availability(prediction, players['home'], players['away'],
+                              home_stats['team_name'], away_stats['team_name'])
+
+
+def _insights(analyzer, context, inputs):
+    return generate_betting_insights(inputs['prediction']) if inputs['prediction'] else []
+
+
+# The steps of a full matchup analysis (SuperPredictor.comprehensive_matchup_analysis)
+MATCHUP_DAG = AnalysisDAG([
+    _team_step('home_stats', 'home', 'get_team_recent_performance', last_n_games=10),
+    _team_step('away_stats', 'away', 'get_team_recent_performance', last_n_games=10),
+    Step('h2h', (), lambda analyzer, context, inputs: analyzer.get_head_to_head_history(
+        context['home'], context['away'], last_n_games=5),
+        key=lambda context: ('get_head_to_head_history', context['home'], context['away'])),
+    _team_step('home_rest', 'home', 'get_rest_days'),
+    _team_step('away_rest', 'away', 'get_rest_days'),
+    _team_step('home_defense', 'home', 'get_team_defensive_stats', last_n_games=10),
+    _team_step('away_defense', 'away', 'get_team_defensive_stats', last_n_games=10),
+    _team_step('home_efficiency', 'home', 'get_team_efficiency_stats'),
+    _team_step('away_efficiency', 'away', 'get_team_efficiency_stats'),
+    _team_step('home_rating', 'home', 'get_team_rating_stats'),
+    _team_step('away_rating', 'away', 'get_team_rating_stats'),
+    Step('players', (), _availability),
+    Step('prediction', ('home_stats', 'away_stats', 'h2h', 'home_rest', 'away_rest', 'home_defense',
+                        'away_defense', 'home_efficiency', 'away_efficiency', 'home_rating', 'away_rating',
+                        'players'), _prediction),
+    Step('insights', ('prediction',), _insights),
+])
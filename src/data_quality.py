@@ -0,0 +1,54 @@
+"""
+Record of every fallback or missing input behind a prediction
+Fetchers report problems here instead of silently degrading, and the analysis
+that collected them attaches the summary to its result.
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class DataQualityLog:
+    """Per-thread collection of data issues while one analysis is assembled"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @contextmanager
+    def collect(self):
+        """Collect the issues recorded by this thread inside the with-block"""
+        outer = getattr(self._local, 'issues', None)
+        issues = self._local.issues = []
+        try:
+            yield issues
+        finally:
+            self._local.issues = outer
+            if outer is not None:
+                outer.extend(issues)
+
+    def record(self, field, status, team=None, detail=''):
+        """Note an input that fell back ('fallback', 'previous_season', 'default') or is 'missing'"""
+        issues = getattr(self._local, 'issues', None)
+        if issues is not None:
+            issues.append({'field': field, 'status': status, 'team': team, 'detail': str(detail)[:120]})
+
+
+def summarize(issues):
+    """Data-quality block stored on a prediction result"""
+    return {
+        'complete': not issues,
+        'fallbacks': sum(1 for issue in issues if issue['status'] != 'missing'),
+        'missing': sum(1 for issue in issues if issue['status'] == 'missing'),
+        'issues': list(issues),
+    }
+
+
+def print_summary(quality):
+    """Console report of a data-quality block (silent when everything was live data)"""
+    if quality['complete']:
+        return
+    print(f"\n⚠️  DATA QUALITY: {quality['fallbacks']} fallback(s), {quality['missing']} missing input(s)")
+    for issue in quality['issues']:
+        team = f" ({issue['team']})" if issue['team'] else ''
+        detail = f" - {issue['detail']}" if issue['detail'] else ''
+        print(f"   • {issue['field']}{team}: {issue['status']}{detail}")
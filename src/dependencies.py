@@ -0,0 +1,200 @@
+"""
+Dependency tracking between cached data and the predictions built from it
+Every derived value records what it was computed from, so new data only invalidates
+the predictions that actually used it instead of the whole slate:
+
+    ('frame', 'leaguegamefinder', team_id, season, type)   cached game-log frame (EndpointClient)
+    ('partition', 'leaguegames', season, team_id)           one team's rows of a league-wide frame
+    ('feature_row', team_id)                                feature store rows (feature_store.py)
+    ('date', '2025-03-01')                                  the day a feature was computed on (rest days)
+    ('feature', method, *args)                              NBADataExtractor feature method call
+    ('weights', fingerprint)                                AdvancedPredictor weight version
+    ('prediction', cache key)                               memoized AdvancedPredictor output
+    ('matchup', home, away)                                 a full matchup analysis / slate entry
+
+Dependencies are recorded implicitly: code runs inside graph.track(node), and every
+node touched while it runs (frames read from the client, nested features) becomes one
+of its dependencies. invalidate() walks the reverse edges and calls the handler
+registered for each affected node kind (drop the frame, drop the cache entry, mark
+the matchup stale), then forgets the invalidated nodes. Nodes whose value is gone for
+another reason (an evicted cache entry) are dropped with forget(), so the graph stays
+as large as the data it describes.
+"""
+
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+
+class DependencyGraph:
+    """Node -> the nodes it was computed from, with a per-thread tracking stack"""
+
+    def __init__(self):
+        self._dependencies = {}  # node -> set of nodes it was computed from
+        self._dependents = {}    # node -> set of nodes computed from it
+        self._handlers = {}      # node kind -> [callback(node)] run when a node is invalidated
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(set(self._dependencies) | set(self._dependents))
+
+    def on_invalidate(self, kind, handler):
+        """Call handler(node) for every invalidated node of this kind"""
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def track(self, node, reset=True):
+        """Record everything touched in the block as a dependency of node
+
+        The enclosing tracked node (if any) depends on node. reset=False continues a
+        node tracked earlier (e.g. the predict stage of a game fetched on another thread).
+        """
+        stack = self._stack()
+        if stack:
+            self.record(stack[-1], [node])
+        if reset:
+            self._forget(node)
+        stack.append(node)
+        try:
+            yield node
+        finally:
+            stack.pop()
+
+    def touch(self, node):
+        """Mark node as an input of whatever is being tracked on this thread"""
+        stack = self._stack()
+        if stack:
+            self.record(stack[-1], [node])
+
+    def current(self):
+        """Node being tracked on this thread, or None"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def record(self, node, depends_on):
+        """Add edges: node was computed from each of depends_on"""
+        with self._lock:
+            dependencies = self._dependencies.setdefault(node, set())
+            for dependency in depends_on:
+                if dependency == node:
+                    continue
+                dependencies.add(dependency)
+                self._dependents.setdefault(dependency, set()).add(node)
+
+    def dependencies(self, node, kind=None):
+        """Direct inputs of node (optionally only one kind)"""
+        with self._lock:
+            nodes = set(self._dependencies.get(node, ()))
+        return {n for n in nodes if kind is None or n[0] == kind}
+
+    def dependents(self, node, kind=None):
+        """Nodes computed directly from node (optionally only one kind)"""
+        with self._lock:
+            nodes = set(self._dependents.get(node, ()))
+        return {n for n in nodes if kind is None or n[0] == kind}
+
+    def affected(self, nodes):
+        """Every node computed (directly or transitively) from any of nodes"""
+        seen = set()
+        with self._lock:
+            queue = deque(nodes)
+            while queue:
+                for dependent in self._dependents.get(queue.popleft(), ()):
+                    if dependent not in seen:
+                        seen.add(dependent)
+                        queue.append(dependent)
+        return seen
+
+    def invalidate(self, nodes):
+        """Invalidate nodes and everything built from them; returns the affected nodes
+
+        Handlers run for the given nodes too (so a frame node drops the frame itself).
+        Every invalidated node is then forgotten - it is recorded again when recomputed.
+        """
+        nodes = set(nodes)
+        affected = self.affected(nodes)
+        for node in nodes | affected:
+            for handler in self._handlers.get(node[0], ()):
+                handler(node)
+        for node in nodes | affected:
+            self.forget(node)
+        return affected
+
+    def nodes(self, kind=None):
+        """Known nodes, optionally of one kind"""
+        with self._lock:
+            nodes = set(self._dependencies) | set(self._dependents)
+        return {n for n in nodes if kind is None or n[0] == kind}
+
+    def stats(self):
+        """Node count per kind and edge count"""
+        with self._lock:
+            nodes = set(self._dependencies) | set(self._dependents)
+            edges = sum(len(d) for d in self._dependencies.values())
+        counts = {}
+        for node in nodes:
+            counts[node[0]] = counts.get(node[0], 0) + 1
+        return {'nodes': counts, 'edges': edges}
+
+    def forget(self, node):
+        """Remove node and its edges (e.g. its cache entry was evicted)
+
+        Its dependents inherit its inputs, so invalidating those still reaches them.
+        """
+        with self._lock:
+            dependencies = self._dependencies.pop(node, set())
+            dependents = self._dependents.pop(node, set())
+            for dependency in dependencies:
+                linked = self._dependents[dependency]
+                linked.discard(node)
+                linked |= dependents - {dependency}
+                if not linked:
+                    del self._dependents[dependency]
+            for dependent in dependents:
+                linked = self._dependencies[dependent]
+                linked.discard(node)
+                linked |= dependencies - {dependent}
+
+    def _forget(self, node):
+        """Drop node's recorded inputs (it is about to be recomputed)"""
+        with self._lock:
+            for dependency in self._dependencies.pop(node, ()):
+                dependents = self._dependents.get(dependency)
+                if dependents is not None:
+                    dependents.discard(node)
+                    if not dependents:
+                        del self._dependents[dependency]
+
+
+def tracked(name):
+    """Method decorator: track the call as ('feature', name, *args) on self.dependencies"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            graph = getattr(self, 'dependencies', None)
+            if graph is None:
+                return method(self, *args, **kwargs)
+            with graph.track(('feature', name) + args + tuple(sorted(kwargs.items()))):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def changed_teams(old, new):
+    """Team ids whose games differ between two league-wide game frames"""
+    if old is None or old.empty:
+        return set(new['TEAM_ID'].unique().tolist()) if new is not None and not new.empty else set()
+    if new is None or new.empty:
+        return set(old['TEAM_ID'].unique().tolist())
+    old_games = old.groupby('TEAM_ID', observed=True)['GAME_ID'].agg(frozenset)
+    new_games = new.groupby('TEAM_ID', observed=True)['GAME_ID'].agg(frozenset)
+    teams = set(old_games.index.tolist()) | set(new_games.index.tolist())
+    return {int(t) for t in teams if old_games.get(t) != new_games.get(t)}
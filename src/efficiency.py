@@ -0,0 +1,138 @@
+"""
+Possession-based team efficiency from game-log tables
+Possessions are estimated from box-score columns (FGA + 0.44*FTA - OREB + TOV) and
+averaged with the opponent's estimate, so ratings are per 100 possessions and do
+not reward or punish pace. Everything is computed column-wise for all teams at once.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Box-score columns the possession estimate needs, for a team and its opponent
+POSSESSION_COLUMNS = ('FGA', 'FTA', 'OREB', 'TOV')
+
+# Regulation team minutes (5 players x 48), used for pace
+REGULATION_MINUTES = 240
+
+
+def estimate_possessions(fga, fta, oreb, tov):
+    """Possessions used by one side of a game (arrays or scalars)"""
+    return np.asarray(fga, dtype='float64') + 0.44 * np.asarray(fta, dtype='float64') \
+        - np.asarray(oreb, dtype='float64') + np.asarray(tov, dtype='float64')
+
+
+def attach_opponents(games):
+    """Add OPP_* columns by pairing each row with the other team in the same game
+
+    Works on a league-wide table (both teams present). When a game only has one
+    row (e.g. a single team's LeagueGameFinder frame) the opponent box score is
+    unknown: OPP_PTS falls back to PTS - PLUS_MINUS and the rest stays NaN.
+    """
+    columns = ['GAME_ID', 'TEAM_ID', 'PTS'] + [c for c in POSSESSION_COLUMNS if c in games.columns]
+    opponents = games[columns].rename(columns={c: f'OPP_{c}' for c in columns if c != 'GAME_ID'})
+    rows = games.reset_index(drop=True).assign(_ROW=lambda df: np.arange(len(df)))
+    paired = rows.merge(opponents, on='GAME_ID', how='left')
+    paired = paired[(paired['OPP_TEAM_ID'] != paired['TEAM_ID']).to_numpy()]
+
+    # Rows whose game had no second team come back without opponent data
+    out = rows.merge(paired[['_ROW'] + [c for c in opponents.columns if c != 'GAME_ID']], on='_ROW', how='left')
+    for name in opponents.columns:
+        if name != 'GAME_ID':
+            out[name] = out[name].astype('float64')
+    if 'PLUS_MINUS' in out.columns:
+        out['OPP_PTS'] = out['OPP_PTS'].fillna(out['PTS'].astype('float64') - out['PLUS_MINUS'].astype('float64'))
+    return out.drop(columns='_ROW')
+
+
+def game_efficiency(games):
+    """Per-game possessions, offensive/defensive/net rating and pace for every row"""
+    games = attach_opponents(games)
+    team_poss = estimate_possessions(games['FGA'], games['FTA'], games['OREB'], games['TOV'])
+    if all(f'OPP_{c}' in games.columns for c in POSSESSION_COLUMNS):
+        opp_poss = estimate_possessions(games['OPP_FGA'], games['OPP_FTA'], games['OPP_OREB'], games['OPP_TOV'])
+        # Both sides have (nearly) the same possessions - average the two estimates when we can
+        poss = np.where(np.isnan(opp_poss), team_poss, (team_poss + opp_poss) / 2)
+    else:
+        poss = team_poss
+    minutes = games['MIN'].to_numpy(dtype='float64') if 'MIN' in games.columns else REGULATION_MINUTES
+    minutes = np.where(np.asarray(minutes) > 0, minutes, REGULATION_MINUTES)
+
+    games['POSS'] = poss
+    games['OFF_RTG'] = 100 * games['PTS'].to_numpy(dtype='float64') / poss
+    games['DEF_RTG'] = 100 * games['OPP_PTS'].to_numpy(dtype='float64') / poss
+    games['NET_RTG'] = games['OFF_RTG'] - games['DEF_RTG']
+    games['PACE'] = 48 * poss / (minutes / 5)
+    return games
+
+
+def rolling_efficiency(games, windows=(5, 10, 20)):
+    """Ratings over each team's trailing windows, for every game and window in one pass
+
+    Window ratings are possession-weighted (sum of points / sum of possessions), using
+    grouped cumulative sums so the cost does not grow with the window length.
+    Returns one row per team game with OFF_RTG_<w>, DEF_RTG_<w>, NET_RTG_<w>, PACE_<w>.
+    """
+    games = game_efficiency(games).sort_values(['TEAM_ID', 'GAME_DATE'], kind='stable').reset_index(drop=True)
+    minutes = games['MIN'].to_numpy(dtype='float64') if 'MIN' in games.columns \
+        else np.full(len(games), float(REGULATION_MINUTES))
+    sums = pd.DataFrame({
+        'PTS': games['PTS'].to_numpy(dtype='float64'),
+        'OPP_PTS': games['OPP_PTS'].to_numpy(dtype='float64'),
+        'POSS': games['POSS'].to_numpy(dtype='float64'),
+        'MIN': minutes,
+    })
+    by_team = sums.groupby(games['TEAM_ID'].to_numpy())
+    cumulative = by_team.cumsum()
+    position = by_team.cumcount().to_numpy()
+
+    result = games[['TEAM_ID', 'GAME_ID', 'GAME_DATE']].copy()
+    for window in windows:
+        # Sum over the last `window` games = cumsum minus cumsum `window` games earlier
+        earlier = cumulative.groupby(games['TEAM_ID'].to_numpy()).shift(window, fill_value=0)
+        totals = cumulative - earlier
+        result[f'GAMES_{window}'] = np.minimum(position + 1, window)
+        result[f'OFF_RTG_{window}'] = 100 * totals['PTS'] / totals['POSS']
+        result[f'DEF_RTG_{window}'] = 100 * totals['OPP_PTS'] / totals['POSS']
+        result[f'NET_RTG_{window}'] = result[f'OFF_RTG_{window}'] - result[f'DEF_RTG_{window}']
+        result[f'PACE_{window}'] = 48 * totals['POSS'] / (totals['MIN'] / 5)
+    return result
+
+
+def team_efficiency(games, window=10, as_of=None):
+    """Efficiency over each team's last `window` games before as_of, keyed by TEAM_ID
+
+    The values are the efficiency_stats AdvancedPredictor.calculate_team_score accepts;
+    league_rating (points per 100 possessions across the same games) is included so
+    ratings can be judged against the league of that era.
+    """
+    if as_of is not None:
+        games = games[games['GAME_DATE'] < pd.Timestamp(as_of)]
+    if games.empty:
+        return {}
+    games = game_efficiency(games).sort_values(['TEAM_ID', 'GAME_DATE'], kind='stable')
+    recent = games.groupby('TEAM_ID', sort=False).tail(window)
+    minutes = recent['MIN'].astype('float64') if 'MIN' in recent.columns \
+        else pd.Series(float(REGULATION_MINUTES), index=recent.index)
+    totals = pd.DataFrame({
+        'PTS': recent['PTS'].astype('float64'),
+        'OPP_PTS': recent['OPP_PTS'].astype('float64'),
+        'POSS': recent['POSS'],
+        'MIN': minutes,
+        'GAMES': 1,
+    }).groupby(recent['TEAM_ID'].to_numpy()).sum()
+    league_rating = 100 * totals['PTS'].sum() / totals['POSS'].sum()
+
+    off_rating = 100 * totals['PTS'] / totals['POSS']
+    def_rating = 100 * totals['OPP_PTS'] / totals['POSS']
+    pace = 48 * totals['POSS'] / (totals['MIN'] / 5)
+    return {
+        int(team_id): {
+            'off_rating': round(float(off_rating[team_id]), 2),
+            'def_rating': round(float(def_rating[team_id]), 2),
+            'net_rating': round(float(off_rating[team_id] - def_rating[team_id]), 2),
+            'pace': round(float(pace[team_id]), 2),
+            'games': int(totals['GAMES'][team_id]),
+            'league_rating': round(float(league_rating), 2),
+        }
+        for team_id in totals.index
+    }
@@ -0,0 +1,256 @@
+"""
+Wrapper around the nba_api endpoints used by the project
+Every network call goes through EndpointClient so fetched frames can be kept warm
+"""
+
+import sys
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+from nba_api.live.nba.endpoints import scoreboard
+from nba_api.stats.endpoints import leaguegamefinder, playergamelog, playergamelogs, commonteamroster
+sys.path.insert(0, os.path.dirname(__file__))
+from frames import normalize_game_frame
+from http_session import default_http
+from retry import RetryPolicy
+
+# Seconds between NBA stats requests (the API throttles aggressive clients)
+REQUEST_DELAY = 0.6
+
+# Seasons the live analysis reads from
+CURRENT_SEASON = '2024-25'
+PREVIOUS_SEASON = '2023-24'
+
+
+def season_string(start_year):
+    """NBA season label for the season starting in start_year (2015 -> '2015-16')"""
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+
+def recent_seasons(count, last=CURRENT_SEASON):
+    """The count seasons ending with last, oldest first"""
+    last_year = int(last[:4])
+    return [season_string(year) for year in range(last_year - count + 1, last_year + 1)]
+
+
+class RateLimiter:
+    """Spaces NBA stats requests at least min_interval seconds apart, across threads"""
+
+    def __init__(self, min_interval=REQUEST_DELAY, clock=time.monotonic, sleep=time.sleep):
+        self.min_interval = min_interval
+        self.total_wait = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until this caller's request slot comes up"""
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+            delay = slot - now
+            self.total_wait += delay
+        if delay > 0:
+            self._sleep(delay)
+
+    def defer(self, seconds):
+        """Push the next free slot back (a retry backoff slows every thread down, not just one)"""
+        with self._lock:
+            self._next_slot = max(self._next_slot, self._clock() + seconds)
+
+
+class EndpointClient:
+    """Fetch NBA API frames and keep them in a TTL cache
+
+    Game-log frames are normalized to the slim schema in frames.py at ingest.
+    Concurrent calls for the same key share one in-flight request (single-flight).
+    Requests go through a pooled keep-alive session (see http_session.py) and transient
+    failures are retried with backoff through the rate limiter (see retry.py).
+    http= installs its session process-wide (nba_api has one session per process);
+    without it the client uses the shared default pool and leaves the installed session alone.
+    Cached frames are shared between callers - treat them as read-only.
+    Team logs, player logs and rosters take ttl= (keep this frame longer than cache_ttl)
+    and refresh=True (fetch even if a fresh frame is held) - the slate prefetcher uses both.
+    """
+
+    def __init__(self, cache_ttl=900, scoreboard_ttl=60, request_delay=REQUEST_DELAY, rate_limiter=None,
+                 http=None, retry_policy=None, clock=time.time):
+        self.cache_ttl = cache_ttl
+        self._clock = clock
+        self.scoreboard_ttl = scoreboard_ttl
+        # Shared by every thread using this client (foreground queries and prefetch)
+        self.rate_limiter = rate_limiter or RateLimiter(request_delay)
+        # nba_api keeps its session on class attributes: only an explicit http= replaces it
+        self.http = http.install() if http is not None else default_http()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.request_count = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.retries = 0
+        self._frames = {}    # key -> (expires_at, data)
+        self._inflight = {}  # key -> Future of the request being made for it
+        self._lock = threading.Lock()
+        # Optional DependencyGraph: every frame read is recorded as an input of the tracked node
+        self.dependencies = None
+
+    def league_game_finder(self, team_id, season, season_type='Regular Season', ttl=None, refresh=False):
+        """Team game log for one season (LeagueGameFinder)"""
+        def fetch():
+            gamefinder = leaguegamefinder.LeagueGameFinder(
+                team_id_nullable=team_id,
+                season_nullable=season,
+                season_type_nullable=season_type,
+                headers=self.http.stats_headers(),
+                timeout=self.http.timeout
+            )
+            return normalize_game_frame(gamefinder.get_data_frames()[0])
+
+        return self._cached(('leaguegamefinder', team_id, season, season_type), fetch, ttl=ttl, refresh=refresh)
+
+    def player_game_log(self, player_id, season, season_type='Regular Season', ttl=None, refresh=False):
+        """Player game log for one season (PlayerGameLog)"""
+        def fetch():
+            gamelog = playergamelog.PlayerGameLog(
+                player_id=player_id,
+                season=season,
+                season_type_all_star=season_type,
+                headers=self.http.stats_headers(),
+                timeout=self.http.timeout
+            )
+            return normalize_game_frame(gamelog.get_data_frames()[0])
+
+        return self._cached(('playergamelog', player_id, season, season_type), fetch, ttl=ttl, refresh=refresh)
+
+    def league_games(self, season, season_type='Regular Season', cache=False):
+        """Every team's game log for one season in a single LeagueGameFinder call"""
+        def fetch():
+            gamefinder = leaguegamefinder.LeagueGameFinder(
+                player_or_team_abbreviation='T',
+                league_id_nullable='00',
+                season_nullable=season,
+                season_type_nullable=season_type,
+                headers=self.http.stats_headers(),
+                timeout=self.http.timeout
+            )
+            return normalize_game_frame(gamefinder.get_data_frames()[0])
+
+        return self._cached(('leaguegames', season, season_type), fetch, store=cache)
+
+    def league_player_logs(self, season, season_type='Regular Season', cache=False):
+        """Every player's game log for one season (PlayerGameLogs)"""
+        def fetch():
+            gamelogs = playergamelogs.PlayerGameLogs(
+                league_id_nullable='00',
+                season_nullable=season,
+                season_type_nullable=season_type,
+                headers=self.http.stats_headers(),
+                timeout=self.http.timeout
+            )
+            return normalize_game_frame(gamelogs.get_data_frames()[0])
+
+        return self._cached(('playergamelogs', season, season_type), fetch, store=cache)
+
+    def team_roster(self, team_id, season=CURRENT_SEASON, ttl=None, refresh=False):
+        """Current roster for a team (CommonTeamRoster)"""
+        def fetch():
+            roster = commonteamroster.CommonTeamRoster(team_id=team_id, season=season,
+                                                       headers=self.http.stats_headers(),
+                                                       timeout=self.http.timeout)
+            return roster.get_data_frames()[0]
+
+        return self._cached(('commonteamroster', team_id, season), fetch, ttl=ttl, refresh=refresh)
+
+    def scoreboard_games(self):
+        """Today's games from the live scoreboard (list of game dicts)"""
+        def fetch():
+            board = scoreboard.ScoreBoard(headers=self.http.live_headers(), timeout=self.http.timeout)
+            return board.games.get_dict()
+
+        return self._cached(('scoreboard',), fetch, ttl=self.scoreboard_ttl, throttle=False)
+
+    def is_cached(self, key):
+        """True if a fresh frame is held for key"""
+        with self._lock:
+            entry = self._frames.get(key)
+        return entry is not None and entry[0] > self._clock()
+
+    def cached(self, key):
+        """The fresh frame held for key, or None (never fetches)"""
+        with self._lock:
+            entry = self._frames.get(key)
+        return entry[1] if entry is not None and entry[0] > self._clock() else None
+
+    def put(self, key, data, ttl=None):
+        """Replace the frame held for key"""
+        with self._lock:
+            self._frames[key] = (self._clock() + (ttl or self.cache_ttl), data)
+
+    def invalidate(self, key):
+        """Drop one cached frame"""
+        with self._lock:
+            self._frames.pop(key, None)
+
+    def clear(self):
+        """Drop every cached frame"""
+        with self._lock:
+            self._frames.clear()
+
+    def stats(self):
+        """Return cache size and request counters"""
+        with self._lock:
+            return {'frames': len(self._frames), 'requests': self.request_count,
+                    'cache_hits': self.cache_hits, 'coalesced': self.coalesced, 'retries': self.retries,
+                    'in_flight': len(self._inflight)}
+
+    def _count_retry(self, attempt, error, delay):
+        with self._lock:
+            self.retries += 1
+
+    def _cached(self, key, fetch, ttl=None, throttle=True, store=True, refresh=False):
+        """Return the cached value for key or fetch it from the API
+
+        store=False skips keeping the result (league-wide frames are large and read once);
+        refresh=True fetches even when a fresh frame is held (readers keep it until then)
+        """
+        if self.dependencies is not None:
+            self.dependencies.touch(('frame',) + key)
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None and entry[0] > self._clock() and not refresh:
+                self.cache_hits += 1
+                return entry[1]
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            # Someone is already fetching this key - share their result (or error)
+            return pending.result()
+
+        try:
+            data = self.retry_policy.call(
+                fetch,
+                before_attempt=self.rate_limiter.wait if throttle else None,
+                # Backoff goes through the limiter: the retry waits for its slot like any request
+                backoff=self.rate_limiter.defer if throttle else None,
+                on_retry=self._count_retry
+            )
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            self.request_count += 1
+            if store:
+                self._frames[key] = (self._clock() + (ttl or self.cache_ttl), data)
+            self._inflight.pop(key, None)
+        pending.set_result(data)
+        return data
@@ -5,15 +5,29 @@ Checks if key players are playing and adjusts predictions accordingly
 
 from .main import NBADataExtractor
 from .prediction_model import AdvancedPredictor, generate_betting_insights
-from nba_api.live.nba.endpoints import scoreboard
+from .data_quality import summarize, print_summary
+from .dag import MATCHUP_DAG, DEFAULT_WORKERS, Step, matchup_context
 import time
 
+# The injury analysis predicts from team form only and applies its own availability adjustment
+INJURY_DAG = MATCHUP_DAG.replace(
+    Step('prediction', ('home_stats', 'away_stats'), lambda analyzer, context, inputs: (
+        analyzer.predictor.predict_match_outcome(inputs['home_stats'], inputs['away_stats'])
+        if inputs['home_stats'] and inputs['away_stats'] else None)),
+)
+
 class EnhancedPredictor(NBADataExtractor):
     """Enhanced predictor that considers player availability"""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, client=None, http=None):
+        super().__init__(client, http)
         self.predictor = AdvancedPredictor()
+        self.workers = DEFAULT_WORKERS
+    
+    def refresh_data(self):
+        """Refresh game data and drop memoized predictions built on the old data"""
+        super().refresh_data()
+        self.predictor.cache.invalidate()
     
     def get_todays_matchups(self):
         """Get actual matchups happening today with player rosters"""
@@ -22,8 +36,7 @@ class EnhancedPredictor(NBADataExtractor):
         print("="*70)
         
         try:
-            board = scoreboard.ScoreBoard()
-            games = board.games.get_dict()
+            games = self.client.scoreboard_games()
             
             if not games:
                 print("\n⚠️  No games scheduled for today.")
@@ -68,9 +81,10 @@ class EnhancedPredictor(NBADataExtractor):
         print(f"ENHANCED MATCH ANALYSIS: {away_team} @ {home_team}".center(70))
         print("="*70)
         
-        # Get team stats
-        home_stats = self.get_team_recent_performance(home_team, last_n_games=10)
-        away_stats = self.get_team_recent_performance(away_team, last_n_games=10)
+        # Team stats and base prediction (fallbacks are attached to the prediction as data_quality)
+        steps = INJURY_DAG.run([matchup_context(home_team, away_team)], ('home_stats', 'away_stats', 'prediction'),
+                               self, workers=self.workers)[0]
+        home_stats, away_stats, prediction = steps['home_stats'], steps['away_stats'], steps['prediction']
         
         if not home_stats or not away_stats:
             print("❌ Unable to fetch team data.")
@@ -118,8 +132,7 @@ class EnhancedPredictor(NBADataExtractor):
                         print(f"     Impact: {player.get('impact', 'medium').upper()} "
                               f"(Team strength {adjustment:+d}%)")
         
-        # Get base prediction
-        prediction = self.predictor.predict_match_outcome(home_stats, away_stats)
+        prediction = {**prediction, 'data_quality': summarize(steps['issues'])}
         
         # Adjust for player availability
         if home_adjustment != 0 or away_adjustment != 0:
@@ -169,6 +182,8 @@ class EnhancedPredictor(NBADataExtractor):
         print(f"   {away_stats['team_name']}: {prediction['predicted_away_score']}")
         print(f"   Expected Point Spread: {prediction['point_spread']:.1f}")
         
+        print_summary(prediction['data_quality'])
+        
         # Betting insights
         insights = generate_betting_insights(prediction)
         if insights:
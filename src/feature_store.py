@@ -0,0 +1,339 @@
+"""
+Point-in-time feature store shared by live prediction and backtesting
+One row per team game holds the team's form, offense, shooting, defense, efficiency
+and rating *after* that game, keyed by the date it becomes valid (the next day).
+A lookup for (team, as-of date) is a binary search, and only ever sees games played
+before that date, so backtests and live predictions read exactly the same features.
+
+Usage:
+    python -m src.feature_store build      # from the warehouse (see warehouse.py)
+    python -m src.feature_store update     # only games newer than the stored ones
+"""
+
+import os
+import sys
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+from nba_api.stats.static import teams
+sys.path.insert(0, os.path.dirname(__file__))
+from columnar import write_table, read_schema, read_frame
+from efficiency import game_efficiency
+from ratings import TeamRatings
+
+DEFAULT_FEATURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'data', 'features')
+
+# Trailing window (games) for form/offense/shooting/defense, and meetings for H2H
+FORM_WINDOW = 10
+H2H_WINDOW = 5
+
+# Per-game columns kept so later updates can extend the rolling windows
+BASE_COLUMNS = ['TEAM_ID', 'GAME_ID', 'GAME_DATE', 'OPPONENT_ID', 'WIN', 'PTS', 'OPP_PTS',
+                'FG_PCT', 'FG3_PCT', 'POSS', 'MIN', 'PLUS_MINUS']
+
+
+def _days(dates):
+    """Days since epoch for datetime-like values"""
+    return np.asarray(pd.to_datetime(dates), dtype='datetime64[D]').astype(np.int64)
+
+
+def game_base(games):
+    """Per-team-game base columns (result, points both ways, possessions) from a league table"""
+    rated = game_efficiency(games)
+    return pd.DataFrame({
+        'TEAM_ID': rated['TEAM_ID'].astype(np.int64).to_numpy(),
+        'GAME_ID': rated['GAME_ID'].astype(str).to_numpy(),
+        'GAME_DATE': pd.to_datetime(rated['GAME_DATE']).to_numpy(dtype='datetime64[ns]'),
+        # -1 when the game's other row is not in the table
+        'OPPONENT_ID': rated['OPP_TEAM_ID'].fillna(-1).astype(np.int64).to_numpy(),
+        'WIN': (rated['WL'].astype(str) == 'W').to_numpy(dtype=np.int8),
+        'PTS': rated['PTS'].to_numpy(dtype='float64'),
+        'OPP_PTS': rated['OPP_PTS'].to_numpy(dtype='float64'),
+        'FG_PCT': rated['FG_PCT'].to_numpy(dtype='float64'),
+        'FG3_PCT': rated['FG3_PCT'].to_numpy(dtype='float64'),
+        'POSS': rated['POSS'].to_numpy(dtype='float64'),
+        'MIN': rated['MIN'].to_numpy(dtype='float64') if 'MIN' in rated.columns else 240.0,
+        'PLUS_MINUS': rated['PLUS_MINUS'].to_numpy(dtype='float64'),
+    })
+
+
+def rolling_features(base, window=FORM_WINDOW):
+    """Trailing-window features after each game, for every team at once (base sorted by team, date)"""
+    team = base['TEAM_ID'].to_numpy()
+    sums = base[['WIN', 'PTS', 'OPP_PTS', 'FG_PCT', 'FG3_PCT', 'POSS', 'MIN']].astype('float64')
+    cumulative = sums.groupby(team).cumsum()
+    totals = cumulative - cumulative.groupby(team).shift(window, fill_value=0)
+    games = np.minimum(base.groupby(team).cumcount().to_numpy() + 1, window)
+
+    dates = base['GAME_DATE'].to_numpy(dtype='datetime64[D]')
+    gap = (base['GAME_DATE'] - base.groupby(team)['GAME_DATE'].shift(1)).dt.days.to_numpy(dtype='float64')
+
+    features = base.copy()
+    features['VALID_FROM'] = dates + np.timedelta64(1, 'D')
+    features['GAMES'] = games
+    features['WINS'] = totals['WIN'].to_numpy()
+    features['WIN_PCT'] = 100 * totals['WIN'].to_numpy() / games
+    features['AVG_PTS'] = totals['PTS'].to_numpy() / games
+    features['AVG_PTS_ALLOWED'] = totals['OPP_PTS'].to_numpy() / games
+    features['AVG_FG_PCT'] = 100 * totals['FG_PCT'].to_numpy() / games
+    features['AVG_FG3_PCT'] = 100 * totals['FG3_PCT'].to_numpy() / games
+    features['OFF_RTG'] = 100 * totals['PTS'].to_numpy() / totals['POSS'].to_numpy()
+    features['DEF_RTG'] = 100 * totals['OPP_PTS'].to_numpy() / totals['POSS'].to_numpy()
+    features['PACE'] = 48 * totals['POSS'].to_numpy() / (totals['MIN'].to_numpy() / 5)
+    features['PREV_GAP'] = np.where(np.isnan(gap), 3.0, gap)
+    return features
+
+
+def fatigue_factor(rest_days):
+    """Same scale as NBADataExtractor.get_rest_days"""
+    if rest_days == 0:
+        return -8
+    if rest_days == 1:
+        return -3
+    if rest_days == 2:
+        return 0
+    return 2
+
+
+class FeatureStore:
+    """Materialized (team, as-of date) features with incremental updates"""
+
+    def __init__(self, root=DEFAULT_FEATURES_DIR, ratings=None, window=FORM_WINDOW):
+        self.root = root
+        self.window = window
+        self.ratings = ratings or TeamRatings()
+        self.table = None
+        self._index = {}  # team_id -> (valid_from days, row positions)
+        self._names = {t['id']: t['full_name'] for t in teams.get_teams()}
+        # Optional DependencyGraph: lookups are recorded as ('feature_row', team_id) inputs
+        self.dependencies = None
+
+    def build(self, games):
+        """Compute the whole store from a team-level league game table"""
+        self.table = None
+        self.ratings = TeamRatings(self.ratings.k, self.ratings.home_advantage, self.ratings.initial,
+                                   self.ratings.season_carryover)
+        return self.update(games)
+
+    def update(self, games):
+        """Add rows for games not yet in the store; returns the number of new rows
+
+        Only teams with new games are recomputed, using their last `window` stored
+        games as context for the rolling windows.
+        """
+        base = game_base(games)
+        if self.table is not None and len(self.table):
+            base = base[~base['GAME_ID'].isin(set(self.table['GAME_ID']))]
+        if base.empty:
+            return 0
+
+        self.ratings.update_from_frame(games)
+        context = None
+        if self.table is not None and len(self.table):
+            stored = self.table[self.table['TEAM_ID'].isin(base['TEAM_ID'].unique())]
+            context = stored.groupby('TEAM_ID', sort=False).tail(self.window)[BASE_COLUMNS]
+        combined = pd.concat([context, base], ignore_index=True) if context is not None else base
+        combined = combined.sort_values(['TEAM_ID', 'GAME_DATE', 'GAME_ID'], kind='stable').reset_index(drop=True)
+
+        features = rolling_features(combined, self.window)
+        features = features[features['GAME_ID'].isin(set(base['GAME_ID'])).to_numpy()]
+        features['RATING'] = [self.ratings.rating(team_id, as_of=valid_from)
+                              for team_id, valid_from in zip(features['TEAM_ID'].tolist(),
+                                                             features['VALID_FROM'].tolist())]
+
+        table = pd.concat([self.table, features], ignore_index=True) if self.table is not None else features
+        self.table = table.sort_values(['TEAM_ID', 'VALID_FROM', 'GAME_ID'], kind='stable').reset_index(drop=True)
+        self._build_index()
+        if self.dependencies is not None:
+            self.dependencies.invalidate({('feature_row', int(t)) for t in features['TEAM_ID'].unique()})
+        return len(features)
+
+    def lookup(self, team_id, as_of):
+        """Feature row (dict) valid on as_of - built only from games before that date - or None"""
+        if self.dependencies is not None:
+            self.dependencies.touch(('feature_row', int(team_id)))
+        entry = self._index.get(int(team_id))
+        if entry is None:
+            return None
+        days, rows = entry
+        position = bisect_right(days, int(_days([as_of])[0])) - 1
+        if position < 0:
+            return None
+        return self.table.iloc[rows[position]].to_dict()
+
+    def head_to_head(self, team_id, opponent_id, as_of, last_n_games=H2H_WINDOW):
+        """H2H stats from the team's stored games against opponent before as_of"""
+        entry = self._index.get(int(team_id))
+        if entry is None:
+            return {'games_played': 0, 'team1_wins': 0, 'team2_wins': 0, 'avg_point_diff': 0}
+        days, rows = entry
+        rows = rows[:bisect_right(days, int(_days([as_of])[0]))]
+        games = self.table.iloc[rows]
+        games = games[games['OPPONENT_ID'].to_numpy() == int(opponent_id)].tail(last_n_games)
+        if games.empty:
+            return {'games_played': 0, 'team1_wins': 0, 'team2_wins': 0, 'avg_point_diff': 0}
+        wins = int(games['WIN'].sum())
+        return {
+            'games_played': len(games),
+            'team1_wins': wins,
+            'team2_wins': len(games) - wins,
+            'team1_win_pct': 100 * wins / len(games),
+            'avg_point_diff': float(games['PLUS_MINUS'].mean()),
+        }
+
+    def team_inputs(self, team_id, as_of):
+        """One team's side of prediction_inputs, as of a date, or None
+
+        Keys are team_stats, defensive_stats, rest_stats, rating_stats and efficiency_stats
+        (the NBADataExtractor methods of the live path return the same dicts from here).
+        """
+        row = self.lookup(team_id, as_of)
+        if row is None:
+            return None
+        return {
+            'team_stats': self._team_stats(team_id, row),
+            'defensive_stats': self._defensive_stats(row),
+            'rest_stats': self._rest_stats(row, as_of),
+            'rating_stats': {'rating': round(row['RATING'], 1), 'games_rated': row['GAMES']},
+            'efficiency_stats': self._efficiency_stats(row),
+        }
+
+    def prediction_inputs(self, home_id, away_id, as_of):
+        """Keyword arguments for AdvancedPredictor.predict_match_outcome, as of a date"""
+        home = self.team_inputs(home_id, as_of)
+        away = self.team_inputs(away_id, as_of)
+        if home is None or away is None:
+            return None
+        inputs = {f'{side}_{name}': value for side, team in (('home', home), ('away', away))
+                  for name, value in team.items()}
+        inputs['h2h_stats'] = self.head_to_head(home_id, away_id, as_of)
+        return inputs
+
+    def save(self):
+        """Persist the table (and the ratings it was built with)"""
+        if self.table is None:
+            return
+        columns = {name: self.table[name] for name in self.table.columns}
+        write_table(self.root, columns, metadata={'window': self.window, 'rows': len(self.table)})
+        self.ratings.save(os.path.join(self.root, 'ratings'))
+
+    @classmethod
+    def load(cls, root=DEFAULT_FEATURES_DIR):
+        """Open a saved store, or None if nothing was saved"""
+        schema = read_schema(root)
+        if schema is None:
+            return None
+        table = read_frame(root, mmap=False)
+        for name in ('GAME_DATE', 'VALID_FROM'):
+            table[name] = table[name].astype('datetime64[ns]')
+        return cls.from_table(table, window=schema['metadata']['window'], root=root,
+                              ratings=TeamRatings.load(os.path.join(root, 'ratings')))
+
+    @classmethod
+    def from_table(cls, table, window=FORM_WINDOW, root=DEFAULT_FEATURES_DIR, ratings=None):
+        """Store over an already materialized table (e.g. one attached from shared memory)"""
+        store = cls(root, ratings=ratings, window=window)
+        store.table = table
+        store._build_index()
+        return store
+
+    def _build_index(self):
+        valid_from = _days(self.table['VALID_FROM'])
+        team_ids = self.table['TEAM_ID'].to_numpy()
+        self._index = {}
+        # Table is sorted by team, then date: each team is one contiguous block
+        starts = np.flatnonzero(np.r_[True, team_ids[1:] != team_ids[:-1]])
+        ends = np.r_[starts[1:], len(team_ids)]
+        for start, end in zip(starts, ends):
+            self._index[int(team_ids[start])] = (valid_from[start:end].tolist(), list(range(start, end)))
+
+    def _team_stats(self, team_id, row):
+        wins = int(row['WINS'])
+        return {
+            'team_name': self._names.get(int(team_id), str(team_id)),
+            'games_played': int(row['GAMES']),
+            'wins': wins,
+            'losses': int(row['GAMES']) - wins,
+            'win_percentage': row['WIN_PCT'],
+            'avg_points_scored': row['AVG_PTS'],
+            'avg_points_allowed': row['AVG_PTS_ALLOWED'],
+            'avg_fg_pct': row['AVG_FG_PCT'],
+            'avg_fg3_pct': row['AVG_FG3_PCT'],
+            'data_source': 'feature_store',
+        }
+
+    def _defensive_stats(self, row):
+        return {
+            'avg_points_allowed': row['AVG_PTS_ALLOWED'],
+            'defensive_rating': row['AVG_PTS_ALLOWED'],
+            'avg_point_differential': row['AVG_PTS'] - row['AVG_PTS_ALLOWED'],
+            'games_analyzed': int(row['GAMES']),
+        }
+
+    def _efficiency_stats(self, row):
+        return {
+            'off_rating': round(row['OFF_RTG'], 2),
+            'def_rating': round(row['DEF_RTG'], 2),
+            'net_rating': round(row['OFF_RTG'] - row['DEF_RTG'], 2),
+            'pace': round(row['PACE'], 2),
+            'games': int(row['GAMES']),
+        }
+
+    def _rest_stats(self, row, as_of):
+        rest_days = int(_days([as_of])[0] - _days([row['GAME_DATE']])[0])
+        return {
+            'rest_days': rest_days,
+            'is_back_to_back': row['PREV_GAP'] <= 1,
+            'fatigue_factor': fatigue_factor(rest_days),
+            'last_game_date': pd.Timestamp(row['GAME_DATE']).strftime('%Y-%m-%d'),
+            'days_between_last_two': int(row['PREV_GAP']),
+        }
+
+
+def backtest(store, predictor, games):
+    """Yield (game, prediction, home_won) for every paired game, using features as of game day"""
+    from ratings import pair_games
+    for game in pair_games(games).itertuples(index=False):
+        inputs = store.prediction_inputs(game.HOME_ID, game.AWAY_ID, game.GAME_DATE)
+        if inputs is None:
+            continue
+        yield game, predictor.predict_match_outcome(**inputs), game.HOME_PTS > game.AWAY_PTS
+
+
+def main(argv=None):
+    """Feature store command line"""
+    argv = sys.argv[1:] if argv is None else argv
+    from warehouse import HistoricalWarehouse
+    command = argv[0] if argv else 'info'
+    games = None
+    if command in ('build', 'update'):
+        games = HistoricalWarehouse().load('team_games')
+        if games.empty:
+            print("🧮 Warehouse is empty - run: python -m src.warehouse ingest")
+            return
+
+    if command == 'build':
+        store = FeatureStore()
+        rows = store.build(games)
+        store.save()
+        print(f"🧮 Built {rows} feature rows at {store.root}")
+    elif command == 'update':
+        store = FeatureStore.load() or FeatureStore()
+        rows = store.update(games)
+        store.save()
+        print(f"🧮 Added {rows} feature rows")
+    elif command == 'info':
+        store = FeatureStore.load()
+        if store is None:
+            print("🧮 No feature store yet - run: python -m src.feature_store build")
+            return
+        print(f"🧮 {len(store.table)} rows for {len(store._index)} teams, "
+              f"{store.table['GAME_DATE'].min():%Y-%m-%d} to {store.table['GAME_DATE'].max():%Y-%m-%d}")
+    else:
+        print("Usage: python -m src.feature_store [build | update | info]")
+
+
+if __name__ == "__main__":
+    main()
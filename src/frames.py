@@ -0,0 +1,75 @@
+"""
+Slim, consistent schema for the game-log frames returned by nba_api
+Every frame is normalized once at ingest (see EndpointClient) so downstream code
+always sees the same dtypes: categoricals for repeated strings, datetime64 dates,
+int16/int32 counts and float32 percentages.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Repeated strings -> category
+CATEGORY_COLUMNS = ('SEASON_ID', 'SEASON_YEAR', 'TEAM_ABBREVIATION', 'TEAM_NAME', 'MATCHUP', 'WL',
+                    'PLAYER_NAME', 'NICKNAME')
+
+# Identifiers -> int32
+ID_COLUMNS = ('TEAM_ID', 'PLAYER_ID', 'Player_ID')
+
+# Box-score counts -> int16 (float32 when a game has missing values)
+COUNT_COLUMNS = ('MIN', 'PTS', 'FGM', 'FGA', 'FG3M', 'FG3A', 'FTM', 'FTA', 'OREB', 'DREB',
+                 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'VIDEO_AVAILABLE')
+
+# Rates and signed margins -> float32
+FLOAT_COLUMNS = ('FG_PCT', 'FG3_PCT', 'FT_PCT', 'PLUS_MINUS')
+
+DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%b %d, %Y')
+
+
+def parse_game_dates(values):
+    """Parse GAME_DATE from any endpoint ('2024-03-01', '2024-03-01T00:00:00' or 'MAR 01, 2024')"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    for date_format in DATE_FORMATS:
+        try:
+            return pd.to_datetime(values, format=date_format)
+        except (ValueError, TypeError):
+            continue
+    return pd.to_datetime(values, format='mixed')
+
+
+def _slim_counts(values):
+    """int16 when every value is a whole number in range, float32 otherwise"""
+    numeric = pd.to_numeric(values, errors='coerce')
+    array = numeric.to_numpy(dtype='float64')
+    info = np.iinfo(np.int16)
+    if np.isfinite(array).all() and np.array_equal(array, np.round(array)) and \
+            (len(array) == 0 or (array.min() >= info.min and array.max() <= info.max)):
+        return numeric.astype(np.int16)
+    return numeric.astype(np.float32)
+
+
+def normalize_game_frame(df):
+    """Return a copy of a LeagueGameFinder/PlayerGameLog frame with the slim schema"""
+    if df is None or df.empty:
+        return df
+    columns = {}
+    for name in df.columns:
+        values = df[name]
+        if name == 'GAME_DATE':
+            columns[name] = parse_game_dates(values)
+        elif name in CATEGORY_COLUMNS:
+            columns[name] = values.astype('category')
+        elif name in ID_COLUMNS:
+            columns[name] = pd.to_numeric(values, errors='coerce').astype(np.int32)
+        elif name in COUNT_COLUMNS:
+            columns[name] = _slim_counts(values)
+        elif name in FLOAT_COLUMNS:
+            columns[name] = pd.to_numeric(values, errors='coerce').astype(np.float32)
+        else:
+            columns[name] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+def column_mean(df, column):
+    """Mean of a (possibly float32/int16) column, accumulated in float64"""
+    return float(np.nanmean(df[column].to_numpy(dtype='float64'))) if len(df) else float('nan')
@@ -0,0 +1,84 @@
+"""
+Shared, pooled HTTP session for every nba_api request
+nba_api opens connections through a requests.Session held on its HTTP classes;
+installing one pooled session there keeps TCP/TLS connections alive between calls.
+Timeouts and extra headers are set here once and passed to every endpoint.
+
+The installed session is global to the process (nba_api has no per-request session):
+the default pool is installed once, when it is first created, and PooledHTTP.install()
+replaces it for every client - EndpointClient only calls it when given http= explicitly.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from nba_api.stats.library.http import NBAStatsHTTP, STATS_HEADERS
+from nba_api.live.nba.library.http import NBALiveHTTP, STATS_HEADERS as LIVE_HEADERS
+
+# (connect, read) seconds - fail fast on a dead connection, allow slow stats queries
+DEFAULT_TIMEOUT = (5, 30)
+
+try:
+    import brotli  # noqa: F401 - only advertise br when responses can be decoded
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+
+def build_session(pool_size=10):
+    """requests.Session with a keep-alive connection pool sized for concurrent fetches"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class PooledHTTP:
+    """One pooled session plus the timeout/headers every endpoint call should use
+
+    Pass session= to point nba_api at a stand-in (e.g. a Session with a custom adapter).
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, headers=None, pool_size=10, session=None):
+        self.timeout = timeout
+        self.headers = {'Accept-Encoding': ACCEPT_ENCODING, 'Connection': 'keep-alive', **(headers or {})}
+        self.session = session or build_session(pool_size)
+
+    def stats_headers(self):
+        """Headers for stats.nba.com endpoints"""
+        return {**STATS_HEADERS, **self.headers}
+
+    def live_headers(self):
+        """Headers for the cdn.nba.com live endpoints"""
+        return {**LIVE_HEADERS, **self.headers}
+
+    def install(self):
+        """Route nba_api's stats and live requests through this session
+
+        Global: nba_api keeps the session on class attributes, so every client in the
+        process (and any direct nba_api call) uses it until another one is installed.
+        """
+        NBAStatsHTTP.set_session(self.session)
+        NBALiveHTTP.set_session(self.session)
+        return self
+
+    def close(self):
+        self.session.close()
+
+
+_default_http = None
+_default_lock = threading.Lock()
+
+
+def default_http():
+    """The process-wide pooled session shared by every EndpointClient that is not given one
+
+    Installed into nba_api once, on first use; later calls do not re-install it.
+    """
+    global _default_http
+    with _default_lock:
+        if _default_http is None:
+            _default_http = PooledHTTP().install()
+        return _default_http
@@ -1,8 +1,6 @@
-from nba_api.live.nba.endpoints import scoreboard
-from nba_api.stats.endpoints import leaguegamefinder, playergamelog, commonplayerinfo, teamgamelog
 from nba_api.stats.static import players, teams
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import json
 import time
 import numpy as np
@@ -10,13 +8,144 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(__file__))
 from team_fallback_data import get_team_fallback_stats
+from endpoints import EndpointClient, CURRENT_SEASON, PREVIOUS_SEASON
+from records import GameRecords
+from frames import column_mean
+from efficiency import team_efficiency
+from result_store import ResultStore, json_default
+from data_quality import DataQualityLog
+from prediction_model import AdvancedPredictor
+from rolling_stats import FormTracker
+from dependencies import DependencyGraph, tracked, changed_teams
 
 class NBADataExtractor:
     """Extract and analyze NBA game and player data for predictions"""
     
-    def __init__(self):
+    def __init__(self, client=None, http=None, form=None, feature_store=None):
         self.all_players = players.get_players()
         self.all_teams = teams.get_teams()
+        # All API calls go through the client so fetched frames stay warm;
+        # http (a PooledHTTP) replaces nba_api's process-wide session, e.g. for a local stand-in
+        self.client = client or EndpointClient(http=http)
+        # Bumped whenever the underlying game data is refreshed
+        self.data_version = 0
+        # Fallbacks and missing inputs, collected per analysis (see data_quality.py)
+        self.data_quality = DataQualityLog()
+        # Rolling player form, updated with each new box score (kept across refresh_data);
+        # starts empty - the service passes in the tracker it saved (see FormTracker.load)
+        self.form = form if form is not None else FormTracker()
+        # What every feature, prediction and matchup was computed from (see dependencies.py)
+        self.dependencies = DependencyGraph()
+        self.stale_matchups = set()
+        self.dependencies.on_invalidate('frame', self._drop_frame)
+        self.dependencies.on_invalidate('matchup', self.stale_matchups.add)
+        self.client.dependencies = self.dependencies
+        # Optional FeatureStore: team inputs come from its rows as of today (see _stored_inputs)
+        self.feature_store = feature_store
+        if feature_store is not None:
+            feature_store.dependencies = self.dependencies
+        # (league frame, window, ratings by team) - see get_team_efficiency_stats
+        self._efficiency_table = None
+    
+    def refresh_data(self):
+        """Reload reference data, drop cached frames and mark derived results as stale"""
+        self.all_players = players.get_players()
+        self.all_teams = teams.get_teams()
+        self.client.clear()
+        self._efficiency_table = None
+        self.data_version += 1
+        # Every frame was dropped: everything computed from them is stale
+        graph = self.dependencies
+        graph.invalidate(graph.nodes('frame') | graph.nodes('partition') | graph.nodes('date'))
+    
+    def refresh_changed(self, season=CURRENT_SEASON, season_type='Regular Season'):
+        """Pick up new games, invalidating only what depended on the teams that played
+
+        One league-wide request is compared with the cached frames; teams whose games
+        changed lose their frames and their players' game logs, and the features,
+        predictions and matchups built on them are invalidated (the matchups land in
+        stale_matchups). Features computed on an earlier day (rest days) are invalidated
+        too. Returns a summary dict.
+        """
+        key = ('leaguegames', season, season_type)
+        old = self.client.cached(key)
+        self.client.invalidate(key)
+        self._efficiency_table = None
+        new = self.client.league_games(season, season_type, cache=True)
+        teams = changed_teams(old, new) if old is not None else set()
+        new_games = new.groupby('TEAM_ID', observed=True)['GAME_ID'].agg(frozenset) \
+            if new is not None and not new.empty else {}
+        graph = self.dependencies
+        for node in graph.nodes('frame'):
+            if node[1] == 'leaguegamefinder' and node[3] == season and node[4] == season_type:
+                frame = self.client.cached(node[1:])
+                if frame is None or frozenset(frame['GAME_ID']) != new_games.get(node[2], frozenset()):
+                    teams.add(node[2])
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        nodes = {('frame', 'leaguegamefinder', team_id, season, season_type) for team_id in teams}
+        nodes |= {('partition', 'leaguegames', season, team_id) for team_id in teams}
+        nodes |= {('frame', 'playergamelog', player_id, season, season_type)
+                  for player_id in self._players_of(teams, season, season_type)}
+        nodes |= {node for node in graph.nodes('date') if node[1] != today}
+        affected = graph.invalidate(nodes)
+        self.data_version += 1
+        kinds = {}
+        for node in affected:
+            kinds[node[0]] = kinds.get(node[0], 0) + 1
+        return {'changed_teams': sorted(teams), 'invalidated': kinds,
+                'stale_matchups': sorted(node[1:] for node in self.stale_matchups)}
+    
+    def _players_of(self, team_ids, season, season_type):
+        """Ids of the players on these teams that have a cached game log
+
+        A player's team comes from the team's cached roster, or else from the
+        abbreviation in the latest MATCHUP of the player's own log.
+        """
+        players = set()
+        for team_id in team_ids:
+            roster = self.client.cached(('commonteamroster', team_id, season))
+            if roster is not None and 'PLAYER_ID' in roster:
+                players.update(int(player_id) for player_id in roster['PLAYER_ID'])
+        abbreviations = {t['abbreviation'] for t in self.all_teams if t['id'] in team_ids}
+        for node in self.dependencies.nodes('frame'):
+            if node[1] != 'playergamelog' or node[3] != season or node[4] != season_type or node[2] in players:
+                continue
+            log = self.client.cached(node[1:])
+            if log is not None and not log.empty and 'MATCHUP' in log:
+                latest = log.sort_values('GAME_DATE', kind='stable')['MATCHUP'].iloc[-1]
+                if str(latest).split(' ')[0] in abbreviations:
+                    players.add(node[2])
+        return players
+
+    def _stored_inputs(self, team, kind=None, last_n_games=None):
+        """A team's input from the feature store as of today, or None to compute it live
+
+        kind is a FeatureStore.team_inputs key (all of them when None). Windowed inputs
+        are only read from the store when last_n_games is the store's window.
+        """
+        store = self.feature_store
+        if store is None or (last_n_games is not None and last_n_games != store.window):
+            return None
+        today = date.today()
+        inputs = store.team_inputs(team['id'], today)
+        if inputs is None:
+            return None
+        # The row valid today (and its rest days) changes with the date
+        self.dependencies.touch(('date', today.strftime('%Y-%m-%d')))
+        return inputs if kind is None else inputs[kind]
+
+    def forget_matchup(self, node):
+        """Drop a ('matchup', home, away) node that will not be recomputed"""
+        self.stale_matchups.discard(node)
+        self.dependencies.forget(node)
+
+    def _drop_frame(self, node):
+        """Invalidation handler: drop a frame from the client cache"""
+        if hasattr(self.client, 'invalidate'):
+            self.client.invalidate(node[1:])
+        if node[1] == 'leaguegames':
+            self._efficiency_table = None
         
     def get_todays_games(self):
         """Get all games scheduled for today"""
@@ -25,8 +154,7 @@ class NBADataExtractor:
         print("="*60)
         
         try:
-            board = scoreboard.ScoreBoard()
-            games_data = board.games.get_dict()
+            games_data = self.client.scoreboard_games()
             
             if not games_data:
                 print("No games scheduled for today.")
@@ -66,6 +194,7 @@ class NBADataExtractor:
                 or team_name.lower() in t['nickname'].lower()]
         return team[0] if team else None
     
+    @tracked('player_stats')
     def get_player_recent_stats(self, player_name, last_n_games=10):
         """Get player's recent performance stats using REAL current season data"""
         print(f"\n{'='*60}")
@@ -80,57 +209,53 @@ class NBADataExtractor:
         print(f"   📊 Fetching REAL current season data for {player['full_name']}...")
         
         try:
-            time.sleep(0.6)  # Rate limiting
-            
             # Try current season first
-            gamelog = playergamelog.PlayerGameLog(
-                player_id=player['id'],
-                season='2024-25',
-                season_type_all_star='Regular Season'
-            )
-            df = gamelog.get_data_frames()[0]
+            df = self.client.player_game_log(player['id'], CURRENT_SEASON)
             
             if df.empty:
-                print(f"   ⚠️  No current season data, trying 2023-24...")
-                time.sleep(0.6)
-                gamelog = playergamelog.PlayerGameLog(
-                    player_id=player['id'],
-                    season='2023-24',
-                    season_type_all_star='Regular Season'
-                )
-                df = gamelog.get_data_frames()[0]
-                season_used = "2023-24"
+                print(f"   ⚠️  No current season data, trying {PREVIOUS_SEASON}...")
+                df = self.client.player_game_log(player['id'], PREVIOUS_SEASON)
+                season_used = PREVIOUS_SEASON
+                self.data_quality.record('player_stats', 'previous_season', player['full_name'], PREVIOUS_SEASON)
             else:
-                season_used = "2024-25"
+                season_used = CURRENT_SEASON
             
             if df.empty:
                 print(f"❌ No recent games found for {player['full_name']}")
+                self.data_quality.record('player_stats', 'missing', player['full_name'], 'no games')
                 return None
             
+            # Rolling accumulators take only the new games; other window sizes are averaged directly
+            form = self.form.update(player['id'], season_used, df) if last_n_games == self.form.window else None
+            
             # Get most recent games
             df = df.head(last_n_games)
             print(f"   ✅ Found {len(df)} recent games in season {season_used}")
             
         except Exception as e:
             print(f"   ❌ API Error: {str(e)[:80]}")
+            self.data_quality.record('player_stats', 'missing', player['full_name'], e)
             return None
         
         # Calculate averages
         try:
-            stats = {
-                'player_name': player['full_name'],
-                'games_played': len(df),
-                'avg_points': df['PTS'].mean(),
-                'avg_rebounds': df['REB'].mean(),
-                'avg_assists': df['AST'].mean(),
-                'avg_steals': df['STL'].mean(),
-                'avg_blocks': df['BLK'].mean(),
-                'avg_fg_pct': df['FG_PCT'].mean() * 100,
-                'avg_fg3_pct': df['FG3_PCT'].mean() * 100,
-                'avg_ft_pct': df['FT_PCT'].mean() * 100,
-                'avg_plus_minus': df['PLUS_MINUS'].mean(),
-                'recent_games': df[['GAME_DATE', 'MATCHUP', 'PTS', 'REB', 'AST', 'FG_PCT', 'PLUS_MINUS']].to_dict('records')
-            }
+            if form is not None:
+                stats = {'player_name': player['full_name'], **form.stats()}
+            else:
+                stats = {
+                    'player_name': player['full_name'],
+                    'games_played': len(df),
+                    'avg_points': column_mean(df, 'PTS'),
+                    'avg_rebounds': column_mean(df, 'REB'),
+                    'avg_assists': column_mean(df, 'AST'),
+                    'avg_steals': column_mean(df, 'STL'),
+                    'avg_blocks': column_mean(df, 'BLK'),
+                    'avg_fg_pct': column_mean(df, 'FG_PCT') * 100,
+                    'avg_fg3_pct': column_mean(df, 'FG3_PCT') * 100,
+                    'avg_ft_pct': column_mean(df, 'FT_PCT') * 100,
+                    'avg_plus_minus': column_mean(df, 'PLUS_MINUS'),
+                }
+            stats['recent_games'] = GameRecords.from_frame(df, ['GAME_DATE', 'MATCHUP', 'PTS', 'REB', 'AST', 'FG_PCT', 'PLUS_MINUS'])
             
             print(f"\n📊 {stats['player_name']} - Last {stats['games_played']} Games (Season {season_used}):")
             print(f"   Points: {stats['avg_points']:.1f} | Rebounds: {stats['avg_rebounds']:.1f} | Assists: {stats['avg_assists']:.1f}")
@@ -140,8 +265,10 @@ class NBADataExtractor:
             return stats
         except Exception as e:
             print(f"Error processing player stats: {e}")
+            self.data_quality.record('player_stats', 'missing', player['full_name'], e)
             return None
     
+    @tracked('team_performance')
     def get_team_recent_performance(self, team_name, last_n_games=10):
         """Get team's recent performance using REAL current season data"""
         print(f"\n{'='*60}")
@@ -154,38 +281,30 @@ class NBADataExtractor:
             print(f"Available teams include: Lakers, Warriors, Celtics, Heat, Bucks, etc.")
             return None
         
+        stored = self._stored_inputs(team, 'team_stats', last_n_games)
+        if stored is not None:
+            print(f"   🧮 Using feature store rows for {team['full_name']}")
+            return stored
+        
         # Use LeagueGameFinder - this works for current season!
         print(f"   📊 Fetching REAL current season data for {team['full_name']}...")
         
         try:
-            time.sleep(0.6)  # Rate limiting
-            
-            # LeagueGameFinder works for 2024-25 season
-            gamefinder = leaguegamefinder.LeagueGameFinder(
-                team_id_nullable=team['id'],
-                season_nullable='2024-25',
-                season_type_nullable='Regular Season'
-            )
-            
-            games_df = gamefinder.get_data_frames()[0]
+            # LeagueGameFinder works for the current season
+            games_df = self.client.league_game_finder(team['id'], CURRENT_SEASON)
             
             if games_df.empty:
                 print(f"   ⚠️  No games found for current season, trying last season...")
-                time.sleep(0.6)
-                gamefinder = leaguegamefinder.LeagueGameFinder(
-                    team_id_nullable=team['id'],
-                    season_nullable='2023-24',
-                    season_type_nullable='Regular Season'
-                )
-                games_df = gamefinder.get_data_frames()[0]
-                season_used = "2023-24"
+                games_df = self.client.league_game_finder(team['id'], PREVIOUS_SEASON)
+                season_used = PREVIOUS_SEASON
+                self.data_quality.record('team_stats', 'previous_season', team['full_name'], PREVIOUS_SEASON)
             else:
-                season_used = "2024-25"
+                season_used = CURRENT_SEASON
             
             if games_df.empty:
                 print(f"⚠️  No recent games found for {team['full_name']}")
                 print(f"   Using historical/fallback data...")
-                return get_team_fallback_stats(team_name)
+                return self._fallback_team_stats(team_name, team['full_name'], 'no games found')
             
             # Get most recent games
             df = games_df.head(last_n_games)
@@ -193,9 +312,10 @@ class NBADataExtractor:
             print(f"   📈 Analyzing last {len(df)} games")
             
         except Exception as e:
+            # Transient errors were already retried by the client - this one is final
             print(f"   ❌ API Error: {str(e)[:80]}")
             print(f"   Using fallback data...")
-            return get_team_fallback_stats(team_name)
+            return self._fallback_team_stats(team_name, team['full_name'], e)
         
         # Process the data
         try:
@@ -208,13 +328,14 @@ class NBADataExtractor:
                 'wins': wins,
                 'losses': losses,
                 'win_percentage': (wins / len(df)) * 100 if len(df) > 0 else 0,
-                'avg_points_scored': df['PTS'].mean(),
-                'avg_points_allowed': df['PTS'].mean(),  # Note: would need opponent data for accurate allowed points
-                'avg_fg_pct': df['FG_PCT'].mean() * 100,
-                'avg_fg3_pct': df['FG3_PCT'].mean() * 100,
-                'avg_rebounds': df['REB'].mean(),
-                'avg_assists': df['AST'].mean(),
-                'recent_games': df[['GAME_DATE', 'MATCHUP', 'WL', 'PTS', 'FG_PCT', 'FG3_PCT', 'PLUS_MINUS']].to_dict('records')
+                'avg_points_scored': column_mean(df, 'PTS'),
+                'avg_points_allowed': column_mean(df, 'PTS'),  # Note: would need opponent data for accurate allowed points
+                'avg_fg_pct': column_mean(df, 'FG_PCT') * 100,
+                'avg_fg3_pct': column_mean(df, 'FG3_PCT') * 100,
+                'avg_rebounds': column_mean(df, 'REB'),
+                'avg_assists': column_mean(df, 'AST'),
+                'recent_games': GameRecords.from_frame(df, ['GAME_DATE', 'MATCHUP', 'WL', 'PTS', 'FG_PCT', 'FG3_PCT', 'PLUS_MINUS']),
+                'data_source': 'live'
             }
             
             print(f"\n🏆 {stats['team_name']} - Last {stats['games_played']} Games (Season {season_used}):")
@@ -226,8 +347,17 @@ class NBADataExtractor:
             return stats
         except Exception as e:
             print(f"Error processing team stats: {e}")
+            self.data_quality.record('team_stats', 'missing', team['full_name'], e)
             return None
     
+    def _fallback_team_stats(self, team_name, full_name, reason):
+        """Historical averages for a team, marked as fallback data"""
+        self.data_quality.record('team_stats', 'fallback', full_name, reason)
+        stats = get_team_fallback_stats(team_name)
+        stats['data_source'] = 'fallback'
+        return stats
+    
+    @tracked('head_to_head')
     def get_head_to_head_history(self, team1_name, team2_name, last_n_games=5):
         """
         Get head-to-head matchup history between two teams
@@ -244,27 +374,17 @@ class NBADataExtractor:
             print(f"❌ Could not find one or both teams")
             return None
         
+        if self._stored_inputs(team1) is not None and self._stored_inputs(team2) is not None:
+            return self.feature_store.head_to_head(team1['id'], team2['id'], date.today(), last_n_games)
+        
         try:
-            time.sleep(0.6)
-            
             # Get all games for team1 in recent seasons
-            gamefinder = leaguegamefinder.LeagueGameFinder(
-                team_id_nullable=team1['id'],
-                season_nullable='2024-25',
-                season_type_nullable='Regular Season'
-            )
-            
-            games_df = gamefinder.get_data_frames()[0]
+            games_df = self.client.league_game_finder(team1['id'], CURRENT_SEASON)
             
             if games_df.empty:
-                print(f"   ⚠️  No current season data, checking 2023-24...")
-                time.sleep(0.6)
-                gamefinder = leaguegamefinder.LeagueGameFinder(
-                    team_id_nullable=team1['id'],
-                    season_nullable='2023-24',
-                    season_type_nullable='Regular Season'
-                )
-                games_df = gamefinder.get_data_frames()[0]
+                print(f"   ⚠️  No current season data, checking {PREVIOUS_SEASON}...")
+                games_df = self.client.league_game_finder(team1['id'], PREVIOUS_SEASON)
+                self.data_quality.record('h2h_stats', 'previous_season', team1['full_name'], PREVIOUS_SEASON)
             
             # Filter for games against team2
             team2_abbreviations = [team2['abbreviation']]
@@ -288,8 +408,8 @@ class NBADataExtractor:
             team2_wins = len(h2h_games[h2h_games['WL'] == 'L'])
             
             # Calculate average point differential (positive = team1 winning by more)
-            h2h_games['POINT_DIFF'] = h2h_games['PLUS_MINUS']
-            avg_point_diff = h2h_games['POINT_DIFF'].mean()
+            # (read straight from PLUS_MINUS - adding a column to the slice would copy it)
+            avg_point_diff = column_mean(h2h_games, 'PLUS_MINUS')
             
             stats = {
                 'games_played': len(h2h_games),
@@ -297,7 +417,7 @@ class NBADataExtractor:
                 'team2_wins': team2_wins,
                 'team1_win_pct': (team1_wins / len(h2h_games) * 100) if len(h2h_games) > 0 else 0,
                 'avg_point_diff': avg_point_diff,
-                'recent_games': h2h_games[['GAME_DATE', 'MATCHUP', 'WL', 'PTS', 'PLUS_MINUS']].to_dict('records')
+                'recent_games': GameRecords.from_frame(h2h_games, ['GAME_DATE', 'MATCHUP', 'WL', 'PTS', 'PLUS_MINUS'])
             }
             
             print(f"   📊 Last {len(h2h_games)} meetings:")
@@ -318,8 +438,10 @@ class NBADataExtractor:
             
         except Exception as e:
             print(f"   ❌ Error fetching head-to-head data: {str(e)[:80]}")
+            self.data_quality.record('h2h_stats', 'missing', team1['full_name'], e)
             return None
     
+    @tracked('rest')
     def get_rest_days(self, team_name):
         """
         Calculate days of rest since last game
@@ -329,18 +451,15 @@ class NBADataExtractor:
         if not team:
             return None
         
+        stored = self._stored_inputs(team, 'rest_stats')
+        if stored is not None:
+            return stored
+        
         try:
-            time.sleep(0.6)
-            
-            gamefinder = leaguegamefinder.LeagueGameFinder(
-                team_id_nullable=team['id'],
-                season_nullable='2024-25',
-                season_type_nullable='Regular Season'
-            )
-            
-            games_df = gamefinder.get_data_frames()[0]
+            games_df = self.client.league_game_finder(team['id'], CURRENT_SEASON)
             
             if games_df.empty or len(games_df) < 2:
+                self.data_quality.record('rest_stats', 'default', team['full_name'], 'fewer than 2 games')
                 return {
                     'rest_days': 3,
                     'is_back_to_back': False,
@@ -349,14 +468,13 @@ class NBADataExtractor:
                 }
             
             # Get last 2 games
-            games_df['GAME_DATE'] = pd.to_datetime(games_df['GAME_DATE'])
-            games_df = games_df.sort_values('GAME_DATE', ascending=False)
-            
-            last_game = games_df.iloc[0]['GAME_DATE']
-            second_last_game = games_df.iloc[1]['GAME_DATE']
+            # Only the date column is parsed - copying the shared cached frame is not needed
+            last_game, second_last_game = pd.to_datetime(games_df['GAME_DATE']).nlargest(2)
             
-            # Calculate days between games
-            days_since_last = (datetime.now() - last_game).days
+            # Calculate days between games (the result changes with the date, not just the data)
+            now = datetime.now()
+            self.dependencies.touch(('date', now.strftime('%Y-%m-%d')))
+            days_since_last = (now - last_game).days
             days_between_last_two = (last_game - second_last_game).days
             
             is_back_to_back = days_between_last_two <= 1
@@ -382,8 +500,10 @@ class NBADataExtractor:
             
         except Exception as e:
             print(f"   ⚠️  Error calculating rest days: {str(e)[:80]}")
+            self.data_quality.record('rest_stats', 'missing', team['full_name'], e)
             return None
     
+    @tracked('defense')
     def get_team_defensive_stats(self, team_name, last_n_games=10):
         """
         Get defensive statistics for a team
@@ -393,18 +513,15 @@ class NBADataExtractor:
         if not team:
             return None
         
+        stored = self._stored_inputs(team, 'defensive_stats', last_n_games)
+        if stored is not None:
+            return stored
+        
         try:
-            time.sleep(0.6)
-            
-            gamefinder = leaguegamefinder.LeagueGameFinder(
-                team_id_nullable=team['id'],
-                season_nullable='2024-25',
-                season_type_nullable='Regular Season'
-            )
-            
-            games_df = gamefinder.get_data_frames()[0]
+            games_df = self.client.league_game_finder(team['id'], CURRENT_SEASON)
             
             if games_df.empty:
+                self.data_quality.record('defensive_stats', 'missing', team['full_name'], 'no games')
                 return None
             
             # Get recent games
@@ -413,12 +530,12 @@ class NBADataExtractor:
             # Calculate defensive stats
             # Note: LeagueGameFinder doesn't directly give opponent stats
             # We approximate by using PLUS_MINUS and own PTS
-            avg_points_scored = df['PTS'].mean()
-            avg_plus_minus = df['PLUS_MINUS'].mean()
+            avg_points_scored = column_mean(df, 'PTS')
+            avg_plus_minus = column_mean(df, 'PLUS_MINUS')
             
-            # Approximate opponent points (team PTS - PLUS_MINUS = opponent PTS)
-            df['OPP_PTS'] = df['PTS'] - df['PLUS_MINUS']
-            avg_points_allowed = df['OPP_PTS'].mean()
+            # Approximate opponent points (team PTS - PLUS_MINUS = opponent PTS), without
+            # writing a column onto the slice of the shared cached frame
+            avg_points_allowed = avg_points_scored - avg_plus_minus
             
             # Defensive efficiency (lower is better)
             defensive_rating = avg_points_allowed
@@ -434,6 +551,42 @@ class NBADataExtractor:
             
         except Exception as e:
             print(f"   ⚠️  Error calculating defensive stats: {str(e)[:80]}")
+            self.data_quality.record('defensive_stats', 'missing', team['full_name'], e)
+            return None
+    
+    @tracked('efficiency')
+    def get_team_efficiency_stats(self, team_name, last_n_games=10):
+        """
+        Pace-adjusted offensive/defensive/net rating over a team's recent games
+        One league-wide request covers every team (see efficiency.py)
+        """
+        team = self.get_team_by_name(team_name)
+        if not team:
+            return None
+        
+        stored = self._stored_inputs(team, 'efficiency_stats', last_n_games)
+        if stored is not None:
+            return stored
+        
+        try:
+            league_df = self.client.league_games(CURRENT_SEASON, cache=True)
+            if league_df is None or league_df.empty:
+                self.data_quality.record('efficiency_stats', 'missing', team['full_name'], 'no league games')
+                return None
+            
+            # Computed once per fetched league frame and window, for all teams together;
+            # the frame itself is kept so a refetched frame never matches a recycled id()
+            cached = self._efficiency_table
+            if cached is None or cached[0] is not league_df or cached[1] != last_n_games:
+                cached = (league_df, last_n_games, team_efficiency(league_df, window=last_n_games))
+                self._efficiency_table = cached
+            # Only this team's rows of the league frame feed its ratings
+            self.dependencies.touch(('partition', 'leaguegames', CURRENT_SEASON, team['id']))
+            return cached[2].get(team['id'])
+            
+        except Exception as e:
+            print(f"   ⚠️  Error calculating efficiency stats: {str(e)[:80]}")
+            self.data_quality.record('efficiency_stats', 'missing', team['full_name'], e)
             return None
     
     def generate_match_prediction_insights(self, home_team, away_team, key_players=None):
@@ -522,10 +675,10 @@ class NBADataExtractor:
         return insights
     
     def save_analysis_to_file(self, data, filename):
-        """Save analysis data to JSON file"""
+        """Save analysis data to JSON file (a snapshot - use ResultStore to keep history)"""
         try:
             with open(filename, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+                json.dump(data, f, indent=2, default=json_default)
             print(f"\n✅ Analysis saved to {filename}")
         except Exception as e:
             print(f"Error saving analysis: {e}")
@@ -534,6 +687,9 @@ class NBADataExtractor:
 def main():
     """Main execution function"""
     extractor = NBADataExtractor()
+    # Results are appended as they complete instead of overwriting one JSON file
+    store = ResultStore()
+    predictor = AdvancedPredictor()
     
     # 1. Get today's games
     todays_games = extractor.get_todays_games()
@@ -551,6 +707,7 @@ def main():
         stats = extractor.get_player_recent_stats(player_name, last_n_games=5)
         if stats:
             player_stats.append(stats)
+            store.append_player(predictor.predict_player_performance(stats), stats)
     
     # 3. Example: Predict a specific matchup
     # Change these team names to teams that will play soon
@@ -562,7 +719,9 @@ def main():
     
     # 4. Save analysis
     if prediction:
-        extractor.save_analysis_to_file(prediction, 'match_analysis.json')
+        store.append_matchup(prediction['prediction'], prediction['home_team']['team_name'],
+                             prediction['away_team']['team_name'])
+        print(f"\n✅ Analysis appended to {store.root}")
     
     print("\n" + "="*60)
     print("ANALYSIS COMPLETE!")
@@ -0,0 +1,145 @@
+"""
+Memory benchmark for long-running analysis sessions
+Runs hundreds of matchups through one SuperPredictor (as interactive_mode and the
+prediction service do) under tracemalloc and reports peak and retained memory per
+analysis step, growth per matchup after warm-up, and the allocation sites that grew.
+Budgets turn a memory regression into a failing run.
+
+The command line runs against the NBA API (each team's frames are fetched once and then
+served from the cache). tests/test_memory_budget.py runs the same benchmark offline on the
+synthetic backend in tests/fakes.py, so the budgets there measure our own code only.
+
+Usage:
+    python -m src.memory_benchmark                    # 300 matchups, default budgets
+    python -m src.memory_benchmark --matchups 1000 --top 20
+"""
+
+import gc
+import io
+import os
+import sys
+import tracemalloc
+from contextlib import redirect_stdout
+from itertools import cycle
+
+from nba_api.stats.static import teams
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Budgets a default run must stay within
+DEFAULT_BUDGETS = {
+    'peak_mb': 16.0,                # highest traced memory above the starting point
+    'growth_per_matchup_kb': 16.0,  # retained growth per matchup once caches are warm
+}
+
+# Matchups run before the steady-state baseline is taken (fills the frame and prediction caches)
+WARMUP_MATCHUPS = 30
+
+
+def matchups(count, distinct=None):
+    """count (home, away) nickname pairs cycling through distinct pairings (default 124)"""
+    names = sorted(t['nickname'] for t in teams.get_teams())
+    pairs = [(home, away) for home in names for away in names if home != away][::7]
+    pairs = cycle(pairs[:distinct] if distinct else pairs)
+    return [next(pairs) for _ in range(count)]
+
+
+def run_benchmark(count, predictor, warmup=WARMUP_MATCHUPS, top=10, distinct=None):
+    """Run count matchups through predictor under tracemalloc and return the memory report (dict)
+
+    With distinct pairings fewer than warmup, every cache is full before the baseline,
+    so any growth after it is retained memory that a long session would keep adding.
+    Set predictor.workers = 1 so each phase's peak memory is its own.
+    """
+    warmup = min(warmup, max(count - 1, 0))
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(1)
+    try:
+        gc.collect()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        phases = {}
+        peak = start_memory
+        warm_memory, warm_snapshot = start_memory, None
+
+        for i, (home, away) in enumerate(matchups(count, distinct)):
+            with redirect_stdout(io.StringIO()):
+                result = predictor.comprehensive_matchup_analysis(home, away)
+            peak = max(peak, predictor.timings.peak_traced)
+            for phase in (result or {}).get('timings', []):
+                total = phases.setdefault(phase['phase'], {'phase': phase['phase'], 'runs': 0,
+                                                           'peak_kb': 0.0, 'retained_kb': 0.0})
+                total['runs'] += 1
+                total['peak_kb'] = max(total['peak_kb'], phase.get('peak_kb', 0.0))
+                total['retained_kb'] += phase.get('retained_kb', 0.0)
+            del result
+            if i + 1 == warmup:
+                gc.collect()
+                warm_memory = tracemalloc.get_traced_memory()[0]
+                warm_snapshot = tracemalloc.take_snapshot()
+
+        gc.collect()
+        end_memory = tracemalloc.get_traced_memory()[0]
+        end_snapshot = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    growth_sites = end_snapshot.filter_traces(filters).compare_to(warm_snapshot.filter_traces(filters), 'lineno') \
+        if warm_snapshot is not None else []
+    steady = max(count - warmup, 1)
+    return {
+        'matchups': count,
+        'peak_mb': round((peak - start_memory) / 2 ** 20, 2),
+        'retained_mb': round((end_memory - start_memory) / 2 ** 20, 2),
+        'growth_per_matchup_kb': round((end_memory - warm_memory) / 1024 / steady, 2),
+        'phases': [{**p, 'peak_kb': round(p['peak_kb'], 1),
+                    'retained_kb': round(p['retained_kb'] / max(p['runs'], 1), 2)} for p in phases.values()],
+        'top_sites': [{'site': str(stat.traceback[0]), 'size_kb': round(stat.size_diff / 1024, 1),
+                       'count': stat.count_diff} for stat in growth_sites[:top]],
+    }
+
+
+def check_budgets(report, budgets=None):
+    """Budget violations in a report, as readable strings (empty when within budget)"""
+    budgets = DEFAULT_BUDGETS if budgets is None else budgets
+    return [f"{name}: {report[name]} > {limit}" for name, limit in budgets.items() if report[name] > limit]
+
+
+def print_report(report):
+    """Console report of run_benchmark()"""
+    print(f"\n🧠 MEMORY: {report['matchups']} matchups")
+    print(f"   Peak: {report['peak_mb']:.2f} MB | Retained: {report['retained_mb']:.2f} MB | "
+          f"Growth after warm-up: {report['growth_per_matchup_kb']:.2f} KB/matchup")
+    print(f"\n   {'phase':<24} {'peak KB':>10} {'retained KB/run':>16}")
+    for phase in report['phases']:
+        print(f"   {phase['phase']:<24} {phase['peak_kb']:>10.1f} {phase['retained_kb']:>16.2f}")
+    if report['top_sites']:
+        print("\n   Top growing allocation sites:")
+        for site in report['top_sites']:
+            print(f"   {site['size_kb']:>+9.1f} KB  {site['count']:>+6d}  {site['site']}")
+
+
+def main(argv=None):
+    """Run the benchmark and exit non-zero when a budget is exceeded"""
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[argv.index('--matchups') + 1]) if '--matchups' in argv else 300
+    top = int(argv[argv.index('--top') + 1]) if '--top' in argv else 10
+    from advanced_enhanced_predictor import SuperPredictor
+    predictor = SuperPredictor()
+    # Steps in order on this thread, so each phase's peak memory is its own
+    predictor.workers = 1
+
+    report = run_benchmark(count, predictor, top=top)
+    print_report(report)
+    violations = check_budgets(report)
+    for violation in violations:
+        print(f"   ❌ Over budget - {violation}")
+    if not violations:
+        print("\n   ✅ Within memory budgets")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+Streaming slate pipeline: scoreboard -> fetch -> features/predict -> write
+Each game moves through the stages on its own, with small bounded queues between
+them, so the first prediction is ready as soon as its own inputs are fetched and
+memory stays flat however long the slate is. The fetch and predict stages can each
+run several workers; results then arrive in completion order.
+
+Usage:
+    python -m src.pipeline                  # stream today's slate
+    python -m src.pipeline --save output/   # also write one JSON snapshot per game
+    python -m src.pipeline --features       # read team inputs from the feature store
+"""
+
+import contextlib
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(__file__))
+from main import NBADataExtractor
+from prediction_model import AdvancedPredictor, generate_betting_insights, availability_adjustment, apply_availability
+from result_store import ResultStore
+from data_quality import summarize
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+
+class SlatePipeline:
+    """Stream games through fetch, predict and write stages running in their own threads"""
+
+    def __init__(self, extractor=None, predictor=None, store=None, output_dir=None,
+                 queue_size=2, fetch_workers=1, feature_store=None, predict_workers=1):
+        self.extractor = extractor or NBADataExtractor()
+        self.predictor = predictor or getattr(self.extractor, 'predictor', None) or AdvancedPredictor()
+        self.store = store
+        self.output_dir = output_dir
+        self.queue_size = queue_size
+        self.fetch_workers = fetch_workers
+        self.predict_workers = predict_workers
+        self.feature_store = feature_store
+        self.summary = {'games': 0, 'errors': 0, 'first_result_seconds': None, 'seconds': 0.0}
+        self._stop = threading.Event()
+        # Each game is tracked as a ('matchup', home, away) node across the fetch and predict threads
+        self.dependencies = getattr(self.extractor, 'dependencies', None)
+        if self.dependencies is not None:
+            if getattr(self.predictor, 'dependencies', False) is None:
+                self.predictor.attach_dependencies(self.dependencies)
+            if feature_store is not None:
+                feature_store.dependencies = self.dependencies
+
+    def run(self, games=None):
+        """Yield one result dict per game as soon as it has been predicted and written
+
+        games defaults to today's scoreboard (get_todays_games). Closing the generator
+        early stops the stages after the game each one is working on.
+        """
+        started = time.time()
+        self._stop.clear()
+        self.summary = {'games': 0, 'errors': 0, 'first_result_seconds': None, 'seconds': 0.0}
+        games_q = queue.Queue(self.queue_size)
+        fetched_q = queue.Queue(self.queue_size)
+        predicted_q = queue.Queue(self.queue_size)
+        results_q = queue.Queue(self.queue_size)
+
+        threads = [threading.Thread(target=self._source, args=(games, games_q), daemon=True)]
+        stages = [(self._fetch, games_q, fetched_q, self.fetch_workers, self.predict_workers),
+                  (self._predict, fetched_q, predicted_q, self.predict_workers, 1),
+                  (self._write, predicted_q, results_q, 1, 1)]
+        for work, in_q, out_q, workers, downstream in stages:
+            group = _WorkerGroup(workers, downstream)
+            threads += [threading.Thread(target=self._stage, args=(work, in_q, out_q, group), daemon=True)
+                        for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                result = results_q.get()
+                if result is _DONE:
+                    break
+                self.summary['games'] += 1
+                self.summary['errors'] += 'error' in result
+                if self.summary['first_result_seconds'] is None:
+                    self.summary['first_result_seconds'] = round(time.time() - started, 2)
+                yield result
+        finally:
+            self._stop.set()
+            # Unblock any stage waiting to hand a game downstream
+            for q in (games_q, fetched_q, predicted_q, results_q):
+                self._drain(q)
+            self.summary['seconds'] = round(time.time() - started, 2)
+            if self.store is not None:
+                self.store.flush()
+
+    def _source(self, games, out_q):
+        """Stage 0: feed games from the scoreboard (or the list given to run)"""
+        try:
+            for game in (self.extractor.get_todays_games() if games is None else games):
+                if not self._put(out_q, game):
+                    return
+        finally:
+            # One end marker per fetch worker, so each of them finishes
+            for _ in range(self.fetch_workers):
+                self._put(out_q, _DONE, force=True)
+
+    def _stage(self, work, in_q, out_q, group):
+        """One worker of a stage: run work on every item until its end marker arrives
+
+        The upstream stage sends one end marker per worker; the last worker of this
+        stage to finish sends one per downstream worker.
+        """
+        while True:
+            try:
+                item = in_q.get(timeout=0.1)
+            except queue.Empty:
+                # A stopped upstream may not have been able to pass on its end marker
+                if self._stop.is_set():
+                    return
+                continue
+            if item is _DONE:
+                break
+            if self._stop.is_set():
+                continue
+            if 'error' not in item:
+                try:
+                    item = work(item)
+                except Exception as e:
+                    item = {'game': item.get('game', item), 'error': str(e)}
+            if not self._put(out_q, item):
+                break
+        if group.finish():
+            for _ in range(group.downstream):
+                self._put(out_q, _DONE, force=True)
+
+    def _fetch(self, game):
+        """Stage 1: every input one game's prediction needs (shared frames come from the client cache)"""
+        home, away = game['home_team'], game['away_team']
+        quality_log = getattr(self.extractor, 'data_quality', None)
+        with self._tracked(game):
+            if quality_log is None:
+                return {'game': game, 'inputs': self._fetch_inputs(home, away), 'issues': []}
+            with quality_log.collect() as issues:
+                inputs = self._fetch_inputs(home, away)
+        return {'game': game, 'inputs': inputs, 'issues': issues}
+
+    def _tracked(self, game, reset=True):
+        """Dependency tracking for one game (a no-op without a graph)"""
+        if self.dependencies is None:
+            return contextlib.nullcontext()
+        return self.dependencies.track(('matchup', game['home_team'], game['away_team']), reset=reset)
+
+    def _fetch_inputs(self, home, away):
+        if self.feature_store is not None:
+            # Same rows the backtests read; teams the store does not know are fetched live
+            from warehouse import resolve_team_id
+            try:
+                inputs = self.feature_store.prediction_inputs(resolve_team_id(home), resolve_team_id(away),
+                                                              date.today())
+            except ValueError:
+                inputs = None
+            if inputs is not None:
+                return inputs
+        home_stats = self.extractor.get_team_recent_performance(home)
+        away_stats = self.extractor.get_team_recent_performance(away)
+        if not home_stats or not away_stats:
+            raise LookupError('missing team data')
+        inputs = {
+            'home_team_stats': home_stats,
+            'away_team_stats': away_stats,
+            'h2h_stats': self.extractor.get_head_to_head_history(home, away, last_n_games=5),
+            'home_rest_stats': self.extractor.get_rest_days(home),
+            'away_rest_stats': self.extractor.get_rest_days(away),
+            'home_defensive_stats': self.extractor.get_team_defensive_stats(home),
+            'away_defensive_stats': self.extractor.get_team_defensive_stats(away),
+        }
+        if hasattr(self.extractor, 'get_team_efficiency_stats'):
+            inputs['home_efficiency_stats'] = self.extractor.get_team_efficiency_stats(home)
+            inputs['away_efficiency_stats'] = self.extractor.get_team_efficiency_stats(away)
+        if hasattr(self.extractor, 'get_team_rating_stats'):
+            inputs['home_rating_stats'] = self.extractor.get_team_rating_stats(home)
+            inputs['away_rating_stats'] = self.extractor.get_team_rating_stats(away)
+        return inputs
+
+    def _predict(self, item):
+        """Stage 2: prediction and betting insights from the fetched inputs
+
+        A game carrying key_players_status ({'home': [...], 'away': [...]}) gets the
+        same availability adjustment as SuperPredictor.comprehensive_matchup_analysis.
+        """
+        with self._tracked(item['game'], reset=False):
+            prediction = self.predictor.predict_match_outcome(**item['inputs'])
+        status = item['game'].get('key_players_status')
+        if status:
+            prediction = apply_availability(prediction, availability_adjustment(status.get('home')),
+                                            availability_adjustment(status.get('away')),
+                                            item['inputs']['home_team_stats']['team_name'],
+                                            item['inputs']['away_team_stats']['team_name'])
+        insights = generate_betting_insights(prediction)
+        prediction = {**prediction, 'data_quality': summarize(item['issues'])}
+        return {**item, 'prediction': prediction, 'insights': insights}
+
+    def _write(self, item):
+        """Stage 3: persist the result, then hand back a slim record (the raw inputs are dropped)"""
+        game = item['game']
+        inputs = item['inputs']
+        result = {
+            'game_id': game.get('game_id'),
+            'home_team': inputs['home_team_stats']['team_name'],
+            'away_team': inputs['away_team_stats']['team_name'],
+            'prediction': item['prediction'],
+            'insights': item['insights'],
+        }
+        if self.store is not None:
+            self.store.append_matchup(item['prediction'], result['home_team'], result['away_team'])
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            filename = os.path.join(self.output_dir, f"{result['game_id'] or len(os.listdir(self.output_dir))}.json")
+            self.extractor.save_analysis_to_file({**result, **inputs}, filename)
+        return result
+
+    def _put(self, q, item, force=False):
+        """Put with back-pressure; gives up (returns False) once the pipeline is stopped"""
+        while True:
+            if self._stop.is_set() and not force:
+                return False
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if self._stop.is_set():
+                    return False
+
+    @staticmethod
+    def _drain(q):
+        while True:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                return
+
+
+class _WorkerGroup:
+    """Counts the running workers of one stage"""
+
+    def __init__(self, workers, downstream):
+        self.running = workers
+        self.downstream = downstream
+        self._lock = threading.Lock()
+
+    def finish(self):
+        """Mark one worker finished; True for the last one"""
+        with self._lock:
+            self.running -= 1
+            return self.running == 0
+
+
+def stream_slate(extractor=None, predictor=None, store=None, games=None, **options):
+    """Generator of slate predictions (see SlatePipeline)"""
+    return SlatePipeline(extractor, predictor, store, **options).run(games)
+
+
+def main(argv=None):
+    """Stream today's slate, printing each prediction as soon as it is ready"""
+    argv = sys.argv[1:] if argv is None else argv
+    output_dir = argv[argv.index('--save') + 1] if '--save' in argv else None
+    from advanced_enhanced_predictor import SuperPredictor
+    from ratings import TeamRatings
+    from feature_store import FeatureStore
+
+    feature_store = FeatureStore.load() if '--features' in argv else None
+    pipeline = SlatePipeline(SuperPredictor(ratings=TeamRatings.load()), store=ResultStore(),
+                             output_dir=output_dir, feature_store=feature_store)
+    for result in pipeline.run():
+        if 'error' in result:
+            game = result['game']
+            print(f"\n⚠️  {game['away_team']} @ {game['home_team']}: {result['error']}")
+            continue
+        prediction = result['prediction']
+        print(f"\n🏀 {result['away_team']} @ {result['home_team']}: {prediction['favored_team']} "
+              f"({prediction['home_win_probability']:.1f}% - {prediction['away_win_probability']:.1f}%, "
+              f"{prediction['confidence']} confidence)")
+    print(f"\n✅ {pipeline.summary['games']} games in {pipeline.summary['seconds']}s "
+          f"(first result after {pipeline.summary['first_result_seconds']}s)")
+
+
+if __name__ == "__main__":
+    main()
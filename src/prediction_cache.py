@@ -0,0 +1,139 @@
+"""
+Prediction cache for repeated matchup and player queries
+Results are memoized on a stable fingerprint of the input stats and model weights.
+Values are frozen once when stored (dicts become FrozenDict, lists tuples) and every
+hit returns that same object - callers that adjust a prediction build a new dict.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+def json_default(value):
+    """JSON fallback that keeps numpy/pandas scalars typed instead of stringifying them
+
+    Used for fingerprints here and for every JSON the results, batch and service write.
+    """
+    if hasattr(value, 'item') and getattr(value, 'ndim', 0) == 0:
+        return value.item()
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'to_dict'):
+        # records.GameRow (a row of recent_games) serializes as the dict it stands for
+        return value.to_dict()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def stable_fingerprint(*parts):
+    """
+    Build a stable hash from any mix of dicts, lists and scalars
+    Dict ordering does not matter, numpy scalars hash like Python numbers
+    """
+    payload = json.dumps(parts, sort_keys=True, default=json_default, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class FrozenDict(dict):
+    """Read-only dict: reads, JSON and {**d} copies work as usual, mutation raises TypeError"""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("cached predictions are shared and read-only - copy with {**value} to change them")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def freeze(value):
+    """Read-only version of a nested dict/list value (shared between cache hits)"""
+    if isinstance(value, dict):
+        return value if isinstance(value, FrozenDict) else FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class PredictionCache:
+    """Thread-safe LRU cache for prediction results"""
+
+    def __init__(self, maxsize=256, on_evict=None):
+        self.maxsize = maxsize
+        # Optional callback(key) for entries pushed out by the LRU limit (not for invalidate)
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached (frozen, shared) value"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value):
+        """Store a frozen copy of value, evicting the least recently used entry when full
+
+        Returns the frozen value.
+        """
+        value = freeze(value)
+        evicted = []
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                evicted.append(self._entries.popitem(last=False)[0])
+        if self.on_evict is not None:
+            for old_key in evicted:
+                self.on_evict(old_key)
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        value = compute()
+        if value is not None:
+            value = self.put(key, value)
+        return value
+
+    def invalidate(self, key=None):
+        """Drop one entry, or everything when no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop all entries and reset hit/miss counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return cache size and hit/miss counters"""
+        with self._lock:
+            return {'size': len(self._entries), 'maxsize': self.maxsize,
+                    'hits': self.hits, 'misses': self.misses}
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
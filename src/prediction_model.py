@@ -4,12 +4,21 @@ Analyzes multiple factors to predict match outcomes and player performance
 """
 
 import json
+import sys
+import os
+import warnings
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.dirname(__file__))
+from prediction_cache import PredictionCache, stable_fingerprint
+from frames import parse_game_dates
+
 class AdvancedPredictor:
     """Enhanced prediction model with multiple factors"""
     
-    def __init__(self):
+    def __init__(self, cache=None):
         self.weights = {
             'recent_form': 0.25,           # Team's recent win/loss record
             'offensive_power': 0.18,        # Points per game
@@ -18,20 +27,68 @@ class AdvancedPredictor:
             'home_court': 0.12,             # Home court advantage
             'head_to_head': 0.10,           # Historical matchup performance
             'rest_advantage': 0.05,         # Fatigue / back-to-back factor
-            'player_impact': 0.05           # Key player performance
+            'player_impact': 0.05,          # Key player performance
+            'team_rating': 0.10             # Elo rating (only applied when ratings are supplied)
         }
+        # Memoized results keyed by input stats + weights
+        self.cache = cache if cache is not None else PredictionCache()
+        # Optional DependencyGraph (see dependencies.py), set with attach_dependencies
+        self.dependencies = None
+    
+    def attach_dependencies(self, graph):
+        """Record every prediction in graph and drop cache entries it invalidates
+
+        Entries evicted from the cache are forgotten by the graph.
+        """
+        self.dependencies = graph
+        graph.on_invalidate('prediction', lambda node: self.cache.invalidate(node[1]))
+        self.cache.on_evict = lambda key: graph.forget(('prediction', key))
+    
+    def update_weights(self, **weights):
+        """Change model weights; predictions made with the old weights are invalidated"""
+        old = ('weights', stable_fingerprint(self.weights))
+        self.weights = {**self.weights, **weights}
+        return self.dependencies.invalidate([old]) if self.dependencies is not None else set()
+    
+    def _track_prediction(self, key):
+        """Record a prediction as built from the weights and the inputs of the tracked node"""
+        graph = self.dependencies
+        if graph is None:
+            return
+        node = ('prediction', key)
+        inputs = {('weights', stable_fingerprint(self.weights))}
+        current = graph.current()
+        if current is not None:
+            inputs |= {n for n in graph.dependencies(current) if n[0] not in ('prediction', 'matchup')}
+        graph.record(node, inputs)
+        graph.touch(node)
+    
+    @staticmethod
+    def _is_rated(rating_stats):
+        return bool(rating_stats) and rating_stats.get('games_rated', 0) > 0
     
-    def calculate_team_score(self, team_stats, defensive_stats=None, h2h_stats=None, rest_stats=None):
-        """Calculate overall team score based on multiple factors"""
+    def calculate_team_score(self, team_stats, defensive_stats=None, h2h_stats=None, rest_stats=None,
+                             rating_stats=None, efficiency_stats=None):
+        """Calculate overall team score based on multiple factors
+
+        efficiency_stats (see efficiency.team_efficiency) replaces the raw PPG and
+        points-allowed ranges with pace-adjusted ratings when provided.
+        """
         score = 0
         
         # Recent form score (0-100)
         form_score = team_stats.get('win_percentage', 50)
         score += form_score * self.weights['recent_form']
         
-        # Offensive power (normalized to 0-100, assuming 90-120 PPG range)
-        ppg = team_stats.get('avg_points_scored', 105)
-        offensive_score = min(100, max(0, (ppg - 90) / 30 * 100))
+        # Offensive power
+        if efficiency_stats:
+            # Points per 100 possessions vs league average: +/-10 -> 100/0
+            league_rating = efficiency_stats.get('league_rating', 112)
+            offensive_score = min(100, max(0, 50 + (efficiency_stats['off_rating'] - league_rating) * 5))
+        else:
+            # Normalized to 0-100, assuming 90-120 PPG range
+            ppg = team_stats.get('avg_points_scored', 105)
+            offensive_score = min(100, max(0, (ppg - 90) / 30 * 100))
         score += offensive_score * self.weights['offensive_power']
         
         # Shooting efficiency (already in percentage)
@@ -41,7 +98,12 @@ class AdvancedPredictor:
         score += shooting_score * self.weights['shooting_efficiency']
         
         # Defensive strength (inverse - lower points allowed is better)
-        if defensive_stats:
+        if efficiency_stats:
+            # Points allowed per 100 possessions vs league average: -10 -> 100, +10 -> 0
+            league_rating = efficiency_stats.get('league_rating', 112)
+            defensive_score = min(100, max(0, 50 + (league_rating - efficiency_stats['def_rating']) * 5))
+            score += defensive_score * self.weights['defensive_strength']
+        elif defensive_stats:
             points_allowed = defensive_stats.get('avg_points_allowed', 110)
             # Normalize: 95-115 range, inverted (95 = best = 100 points, 115 = worst = 0 points)
             defensive_score = min(100, max(0, (115 - points_allowed) / 20 * 100))
@@ -69,19 +131,53 @@ class AdvancedPredictor:
             # Neutral rest
             score += 50 * self.weights['rest_advantage']
         
+        # Long-run team strength (see ratings.py) - skipped entirely without ratings
+        if self._is_rated(rating_stats):
+            # 1300-1700 Elo range -> 0 to 100 scale
+            rating_score = min(100, max(0, (rating_stats['rating'] - 1300) / 4))
+            score += rating_score * self.weights['team_rating']
+        
         return score
     
     def predict_match_outcome(self, home_team_stats, away_team_stats, key_players_stats=None, 
                             home_defensive_stats=None, away_defensive_stats=None,
-                            h2h_stats=None, home_rest_stats=None, away_rest_stats=None):
-        """Predict match outcome with confidence levels and advanced factors"""
+                            h2h_stats=None, home_rest_stats=None, away_rest_stats=None,
+                            home_rating_stats=None, away_rating_stats=None,
+                            home_efficiency_stats=None, away_efficiency_stats=None):
+        """Predict match outcome with confidence levels and advanced factors (memoized)"""
+        key = stable_fingerprint(
+            'match', self.weights, home_team_stats, away_team_stats, key_players_stats,
+            home_defensive_stats, away_defensive_stats, h2h_stats, home_rest_stats, away_rest_stats,
+            home_rating_stats, away_rating_stats, home_efficiency_stats, away_efficiency_stats
+        )
+        self._track_prediction(key)
+        return self.cache.get_or_compute(key, lambda: self._predict_match_outcome(
+            home_team_stats, away_team_stats, key_players_stats,
+            home_defensive_stats, away_defensive_stats,
+            h2h_stats, home_rest_stats, away_rest_stats,
+            home_rating_stats, away_rating_stats,
+            home_efficiency_stats, away_efficiency_stats
+        ))
+    
+    def _predict_match_outcome(self, home_team_stats, away_team_stats, key_players_stats=None, 
+                               home_defensive_stats=None, away_defensive_stats=None,
+                               h2h_stats=None, home_rest_stats=None, away_rest_stats=None,
+                               home_rating_stats=None, away_rating_stats=None,
+                               home_efficiency_stats=None, away_efficiency_stats=None):
+        """Uncached match prediction"""
+        
+        # The rating factor compares two rated teams; added for one side only it would skew the ratio
+        if not (self._is_rated(home_rating_stats) and self._is_rated(away_rating_stats)):
+            home_rating_stats = away_rating_stats = None
         
         # Calculate base scores with new factors
         home_score = self.calculate_team_score(
             home_team_stats, 
             defensive_stats=home_defensive_stats,
             h2h_stats=h2h_stats,
-            rest_stats=home_rest_stats
+            rest_stats=home_rest_stats,
+            rating_stats=home_rating_stats,
+            efficiency_stats=home_efficiency_stats
         )
         
         # For away team, invert H2H stats
@@ -96,7 +192,9 @@ class AdvancedPredictor:
             away_team_stats,
             defensive_stats=away_defensive_stats,
             h2h_stats=away_h2h_stats,
-            rest_stats=away_rest_stats
+            rest_stats=away_rest_stats,
+            rating_stats=away_rating_stats,
+            efficiency_stats=away_efficiency_stats
         )
         
         # Add home court advantage
@@ -201,17 +299,25 @@ class AdvancedPredictor:
         return round(base_score + adjustment)
     
     def predict_player_performance(self, player_stats):
-        """Predict if a player will have a good/great/poor game"""
+        """Predict if a player will have a good/great/poor game (memoized)"""
         if not player_stats:
             return None
         
+        key = stable_fingerprint('player', self.weights, player_stats)
+        self._track_prediction(key)
+        return self.cache.get_or_compute(key, lambda: self._predict_player_performance(player_stats))
+    
+    def _predict_player_performance(self, player_stats):
+        """Uncached player performance prediction"""
         avg_points = player_stats.get('avg_points', 0)
         avg_fg_pct = player_stats.get('avg_fg_pct', 0)
         avg_plus_minus = player_stats.get('avg_plus_minus', 0)
         
-        # Calculate consistency score from recent games
+        # Consistency score: from the rolling form when available, else from recent games
         recent_games = player_stats.get('recent_games', [])
-        if recent_games and len(recent_games) > 2:
+        if player_stats.get('consistency') is not None:
+            consistency = player_stats['consistency']
+        elif recent_games and len(recent_games) > 2:
             recent_points = [game.get('PTS', 0) for game in recent_games[:5]]
             consistency = 100 - (max(recent_points) - min(recent_points)) / max(recent_points) * 100 if max(recent_points) > 0 else 0
         else:
@@ -246,10 +352,133 @@ class AdvancedPredictor:
             'expected_points_range': f"{max(0, avg_points-5):.0f}-{avg_points+5:.0f}",
             'consistency_rating': f"{consistency:.0f}%"
         }
+    
+    def predict_player_performance_batch(self, recent_points, recent_fg_pct, recent_plus_minus,
+                                         player_names=None, spread_window=3):
+        """
+        Vectorized predict_player_performance for whole rosters
+        
+        Each recent_* argument is an (n_players, n_games) matrix, most recent game first,
+        padded with NaN for players with fewer games (see game_matrices).
+        FG% is a fraction as returned by the game logs.
+        Returns a dict of arrays, one entry per player.
+        """
+        points = np.asarray(recent_points, dtype=float)
+        fg_pct = np.asarray(recent_fg_pct, dtype=float)
+        plus_minus = np.asarray(recent_plus_minus, dtype=float)
+        games_played = np.sum(~np.isnan(points), axis=1)
+        
+        with warnings.catch_warnings():
+            # Players without games produce all-NaN rows
+            warnings.simplefilter('ignore', RuntimeWarning)
+            avg_points = np.nan_to_num(np.nanmean(points, axis=1))
+            avg_fg_pct = np.nan_to_num(np.nanmean(fg_pct, axis=1) * 100)
+            avg_plus_minus = np.nan_to_num(np.nanmean(plus_minus, axis=1))
+            
+            # Consistency from the last 5 games (same formula as the single-player version)
+            recent_high = np.nanmax(points[:, :5], axis=1)
+            recent_low = np.nanmin(points[:, :5], axis=1)
+            
+            # Rolling spread: average std of points over sliding windows
+            if points.shape[1] >= spread_window:
+                windows = np.lib.stride_tricks.sliding_window_view(points, spread_window, axis=1)
+                rolling_spread = np.nanmean(np.nanstd(windows, axis=2), axis=1)
+            else:
+                rolling_spread = np.full(len(points), np.nan)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            consistency = np.where(recent_high > 0, 100 - (recent_high - recent_low) / recent_high * 100, 0)
+        consistency = np.where(games_played > 2, consistency, 50)
+        
+        performance_score = (
+            (avg_points / 30 * 40) +
+            avg_fg_pct +
+            (consistency * 0.20) +
+            ((avg_plus_minus + 10) / 20 * 20)
+        )
+        
+        tiers = [performance_score > 70, performance_score > 50, performance_score > 30]
+        prediction = np.select(tiers, ["🔥 GREAT GAME Expected", "✅ GOOD GAME Expected",
+                                       "⚠️ AVERAGE GAME Expected"], "❌ POOR GAME Expected")
+        confidence = np.select(tiers, ["High", "Medium", "Medium"], "Low")
+        
+        return {
+            'player': np.asarray(player_names) if player_names is not None else None,
+            'games_played': games_played,
+            'avg_points': avg_points,
+            'avg_fg_pct': avg_fg_pct,
+            'avg_plus_minus': avg_plus_minus,
+            'prediction': prediction,
+            'confidence': confidence,
+            'performance_score': np.round(performance_score, 2),
+            'expected_points_low': np.maximum(0, avg_points - 5),
+            'expected_points_high': avg_points + 5,
+            'consistency': consistency,
+            'rolling_spread': rolling_spread
+        }
+
+
+def game_matrices(games_df, columns=('PTS', 'FG_PCT', 'PLUS_MINUS'), id_column='Player_ID',
+                  date_column='GAME_DATE', last_n_games=10):
+    """
+    Pivot a long game-log table into per-player matrices for predict_player_performance_batch
+    Returns (ids, {column: (n_players, last_n_games) matrix}), most recent game first
+    """
+    dates = parse_game_dates(games_df[date_column])
+    order = np.lexsort((-dates.to_numpy().astype('int64'), games_df[id_column].to_numpy()))
+    ids_sorted = games_df[id_column].to_numpy()[order]
+    
+    # Position of each game inside its player's history (0 = most recent)
+    ids, starts, inverse = np.unique(ids_sorted, return_index=True, return_inverse=True)
+    slot = np.arange(len(ids_sorted)) - starts[inverse]
+    keep = slot < last_n_games
+    
+    matrices = {}
+    for column in columns:
+        matrix = np.full((len(ids), last_n_games), np.nan)
+        matrix[inverse[keep], slot[keep]] = games_df[column].to_numpy(dtype=float)[order][keep]
+        matrices[column] = matrix
+    return ids, matrices
+
+
+# Team strength change (%) for a key player who is out, by impact
+AVAILABILITY_IMPACT = {'high': -10, 'medium': -5, 'low': -2}
+
+
+def availability_adjustment(players):
+    """Total strength adjustment (%) for one side's key players ({'name', 'playing', 'impact'})"""
+    return sum(AVAILABILITY_IMPACT.get(player.get('impact', 'medium'), -5)
+               for player in players or [] if not player['playing'])
+
+
+def apply_availability(prediction, home_adjustment, away_adjustment, home_name, away_name):
+    """Shift win probabilities by the availability adjustments and renormalize
+
+    Returns a new dict (the prediction itself is a shared cache entry).
+    """
+    if home_adjustment == 0 and away_adjustment == 0:
+        return prediction
+    home_prob = prediction['home_win_probability'] + home_adjustment
+    away_prob = prediction['away_win_probability'] + away_adjustment
+    total = home_prob + away_prob
+    home_prob = (home_prob / total) * 100
+    away_prob = (away_prob / total) * 100
+    return {**prediction, 'home_win_probability': round(home_prob, 2), 'away_win_probability': round(away_prob, 2),
+            'favored_team': home_name if home_prob > away_prob else away_name}
+
+
+# Insights only depend on the prediction dict, so one shared cache is enough
+_insights_cache = PredictionCache(maxsize=512)
 
 
 def generate_betting_insights(prediction_data):
-    """Generate insights for betting/fantasy purposes"""
+    """Generate insights for betting/fantasy purposes (memoized on the prediction)"""
+    key = stable_fingerprint('insights', prediction_data)
+    return _insights_cache.get_or_compute(key, lambda: _build_betting_insights(prediction_data))
+
+
+def _build_betting_insights(prediction_data):
+    """Uncached betting insights"""
     insights = []
     
     prob_diff = abs(prediction_data['home_win_probability'] - prediction_data['away_win_probability'])
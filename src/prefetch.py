@@ -0,0 +1,145 @@
+"""
+Cache warmer for today's slate
+Fetches team logs (used for form, H2H, rest and defense) and player logs for every
+team on today's scoreboard, paced by the shared rate limiter.
+
+Warmed frames are kept for PREFETCH_TTL (longer than the client's default cache_ttl),
+and start(interval=...) re-fetches the slate before they expire - the service and
+interactive mode re-warm every REWARM_INTERVAL.
+
+Usage (e.g. from cron before analysts start):
+    python -m src.prefetch               # warms a running prediction service
+    python -m src.prefetch --no-players
+
+The frames are cached inside the service (see service.py); without a running service
+there is nothing to warm, so the command exits non-zero with a hint.
+"""
+
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from endpoints import CURRENT_SEASON, PREVIOUS_SEASON
+
+# How long prefetched frames stay cached (the client default is 15 minutes)
+PREFETCH_TTL = 3 * 60 * 60
+# Re-warm interval for long-running sessions, shorter than PREFETCH_TTL so frames never lapse
+REWARM_INTERVAL = 2 * 60 * 60
+
+
+class SlatePrefetcher:
+    """Warm an extractor's frame cache for every team playing today
+
+    Every pass re-fetches the slate's frames (refresh=True) and keeps them for ttl seconds.
+    """
+
+    def __init__(self, extractor, include_players=True, verbose=False, ttl=PREFETCH_TTL):
+        self.extractor = extractor
+        self.include_players = include_players
+        self.verbose = verbose
+        self.ttl = ttl
+        self.summary = {'teams': 0, 'frames': 0, 'errors': 0, 'seconds': 0.0}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def todays_teams(self):
+        """Team dicts for every team on today's scoreboard"""
+        teams = []
+        for game in self.extractor.client.scoreboard_games() or []:
+            for side in ('homeTeam', 'awayTeam'):
+                team = self.extractor.get_team_by_name(game[side]['teamName'])
+                if team and team not in teams:
+                    teams.append(team)
+        return teams
+
+    def run(self):
+        """Fetch everything for today's slate (blocking); returns a summary dict"""
+        client = self.extractor.client
+        started = time.time()
+        teams = self.todays_teams()
+        self._log(f"🔥 Warming cache for {len(teams)} teams on today's slate...")
+
+        for team in teams:
+            if self._stop.is_set():
+                break
+            # One team frame feeds recent form, H2H, rest days and defense
+            warm = {'ttl': self.ttl, 'refresh': True}
+            games_df = self._fetch(lambda: client.league_game_finder(team['id'], CURRENT_SEASON, **warm))
+            if games_df is not None and games_df.empty:
+                self._fetch(lambda: client.league_game_finder(team['id'], PREVIOUS_SEASON, **warm))
+
+            if self.include_players:
+                roster = self._fetch(lambda: client.team_roster(team['id'], CURRENT_SEASON, **warm))
+                player_ids = roster['PLAYER_ID'].tolist() if roster is not None else []
+                for player_id in player_ids:
+                    if self._stop.is_set():
+                        break
+                    self._fetch(lambda: client.player_game_log(player_id, CURRENT_SEASON, **warm))
+
+            self.summary['teams'] += 1
+            self._log(f"   ✅ {team['full_name']} ready")
+
+        self.summary['seconds'] = round(time.time() - started, 1)
+        self._log(f"🔥 Cache warm: {self.summary['frames']} frames for {self.summary['teams']} teams "
+                  f"in {self.summary['seconds']}s ({self.summary['errors']} errors)")
+        return self.summary
+
+    def start(self, interval=None):
+        """Run the prefetch in a background daemon thread, again every interval seconds if given"""
+        def loop():
+            while not self._stop.is_set():
+                self.run()
+                if interval is None or self._stop.wait(interval):
+                    break
+
+        self._thread = threading.Thread(target=loop, name='slate-prefetch', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=None):
+        """Ask a background prefetch to stop after the current request"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def is_running(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    def _fetch(self, fetch):
+        try:
+            frame = fetch()
+            self.summary['frames'] += 1
+            return frame
+        except Exception as e:
+            self.summary['errors'] += 1
+            self._log(f"   ⚠️  Prefetch error: {str(e)[:80]}")
+            return None
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+
+def main(argv=None):
+    """Prefetch today's slate once (cron-able)"""
+    argv = sys.argv[1:] if argv is None else argv
+    include_players = '--no-players' not in argv
+
+    from service import ServiceClient
+    import urllib.error
+    client = ServiceClient()
+    try:
+        reply = client.prefetch(include_players)
+        print(f"🔥 Prediction service at {client.base_url} is warming today's slate: {reply.get('result')}")
+        return
+    except urllib.error.URLError:
+        # A cache warmed in this process would be discarded as soon as it exits
+        print(f"❌ No prediction service at {client.base_url} - nothing to warm")
+        print("   Start it with: python -m src.service serve")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Profiling hooks for the command line entry points
+- PhaseTimer: always-on wall/CPU breakdown of each analysis step (printed with --timings),
+  plus peak/retained memory per step while tracemalloc is tracing (see memory_benchmark.py)
+- --profile: run the command under cProfile (deterministic) and save a .prof file
+- --profile=sample: sample every thread's stack and save collapsed stacks (.folded)
+
+Both profilers report wall time next to CPU time: a large gap means the command is
+waiting (network, rate-limit sleeps, locks) rather than computing. .prof files open in
+snakeviz/flameprof; .folded files go straight into flamegraph.pl or speedscope.
+
+Usage:
+    python predict.py Lakers Warriors --profile
+    python quick_analyze.py today --profile=sample --profile-out data/profiles/today
+    python -m src.analyze matchup Lakers Warriors --timings
+"""
+
+import cProfile
+import importlib
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   'data', 'profiles')
+
+# Environment switch the --timings flag sets, so nested analyses print their breakdown too
+TIMINGS_ENV = 'NBA_TIMINGS'
+
+# Built-ins that mean "waiting", summed separately in cProfile reports
+WAIT_FUNCTIONS = ('sleep', 'recv', 'recv_into', 'acquire', 'wait', 'select', 'poll', 'connect')
+
+
+def timings_enabled():
+    """True when phase breakdowns should be printed"""
+    return os.environ.get(TIMINGS_ENV, '') not in ('', '0')
+
+
+class PhaseTimer:
+    """Wall and CPU time per named phase; start() ends the previous phase
+
+    While tracemalloc is tracing, each phase also records the peak memory allocated
+    above its starting point and what it left allocated (retained) when it ended.
+    """
+
+    def __init__(self):
+        self.phases = []
+        self.peak_traced = 0  # highest traced memory (bytes) seen during any phase
+        self._current = None
+
+    def start(self, name):
+        """Begin a phase (closing the one in progress)"""
+        self.stop()
+        memory = None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            memory = tracemalloc.get_traced_memory()[0]
+        self._current = (name, time.perf_counter(), time.process_time(), memory)
+
+    def stop(self):
+        """Close the phase in progress, if any"""
+        if self._current is None:
+            return
+        name, wall, cpu, memory = self._current
+        entry = {'phase': name, 'wall': time.perf_counter() - wall, 'cpu': time.process_time() - cpu}
+        if memory is not None and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            entry['peak_kb'] = max(peak - memory, 0) / 1024
+            entry['retained_kb'] = (current - memory) / 1024
+            self.peak_traced = max(self.peak_traced, peak)
+        self.phases.append(entry)
+        self._current = None
+
+    def record(self, name, wall, cpu):
+        """Add a phase measured elsewhere (e.g. a step run on a worker thread)"""
+        self.phases.append({'phase': name, 'wall': wall, 'cpu': cpu})
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block as one phase"""
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def summary(self):
+        """[{phase, wall, cpu}] in seconds, rounded, phases with the same name merged
+
+        Memory-traced phases add peak_kb (largest) and retained_kb (total).
+        """
+        self.stop()
+        merged = {}
+        for entry in self.phases:
+            total = merged.setdefault(entry['phase'], {'phase': entry['phase'], 'wall': 0.0, 'cpu': 0.0})
+            total['wall'] += entry['wall']
+            total['cpu'] += entry['cpu']
+            if 'peak_kb' in entry:
+                total['peak_kb'] = max(total.get('peak_kb', 0.0), entry['peak_kb'])
+                total['retained_kb'] = total.get('retained_kb', 0.0) + entry['retained_kb']
+        return [{name: round(value, 4) if isinstance(value, float) else value for name, value in p.items()}
+                for p in merged.values()]
+
+    def print_breakdown(self, title='PHASE BREAKDOWN'):
+        """Print the phases with their share of the total wall time"""
+        phases = self.summary()
+        total = sum(p['wall'] for p in phases) or 1e-9
+        print(f"\n⏱️  {title}")
+        for p in phases:
+            print(f"   {p['phase']:<28} {p['wall']:>8.3f}s wall  {p['cpu']:>8.3f}s cpu  "
+                  f"{100 * p['wall'] / total:>5.1f}%")
+
+
+class SamplingProfiler:
+    """Samples every thread's Python stack at a fixed interval (wall-clock sampling)"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def write_folded(self, path):
+        """Collapsed stacks, one 'frame;frame;frame count' line each"""
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def top_frames(self, limit=15):
+        """Innermost frames by sample count"""
+        leaves = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        return leaves.most_common(limit)
+
+
+def wait_time(stats):
+    """Seconds spent inside built-in waiting calls (sleeps, socket reads, locks)"""
+    total = 0.0
+    for (filename, _, name), (_, _, tottime, _, _) in stats.stats.items():
+        if filename == '~' and any(word in name for word in WAIT_FUNCTIONS):
+            total += tottime
+    return total
+
+
+def parse_profile_args(argv):
+    """Remove profiling flags from argv; returns (mode, output path or None, timings)"""
+    mode, output, timings = None, None, False
+    remaining = []
+    args = iter(argv)
+    for arg in args:
+        if arg == '--profile':
+            mode = 'cprofile'
+        elif arg.startswith('--profile='):
+            mode = arg.split('=', 1)[1] or 'cprofile'
+        elif arg == '--profile-out':
+            output = next(args, None)
+        elif arg == '--timings':
+            timings = True
+        else:
+            remaining.append(arg)
+    argv[:] = remaining
+    if mode not in (None, 'cprofile', 'sample'):
+        raise ValueError(f"Unknown profiler: {mode} (use --profile or --profile=sample)")
+    return mode, output, timings
+
+
+def run_profiled(func, mode='cprofile', output=None, name='profile'):
+    """Run func() under a profiler, print a wall/CPU summary and write the report files"""
+    if output is None:
+        os.makedirs(DEFAULT_PROFILE_DIR, exist_ok=True)
+        output = os.path.join(DEFAULT_PROFILE_DIR, f"{name}-{datetime.now():%Y%m%d-%H%M%S}")
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    profiler = cProfile.Profile() if mode == 'cprofile' else SamplingProfiler()
+    wall, cpu = time.perf_counter(), time.process_time()
+    if mode == 'cprofile':
+        profiler.enable()
+    else:
+        profiler.start()
+    try:
+        return func()
+    finally:
+        if mode == 'cprofile':
+            profiler.disable()
+        else:
+            profiler.stop()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        print(f"\n🔬 PROFILE ({mode}): {wall:.3f}s wall, {cpu:.3f}s cpu, "
+              f"{max(wall - cpu, 0):.3f}s waiting (network, sleeps, locks)")
+        if mode == 'cprofile':
+            stats = pstats.Stats(profiler, stream=io.StringIO())
+            stats.dump_stats(output + '.prof')
+            print(f"   in wait calls (main thread): {wait_time(stats):.3f}s")
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(15)
+            print(report.getvalue())
+            print(f"   📄 {output}.prof")
+        else:
+            profiler.write_folded(output + '.folded')
+            total = sum(profiler.samples.values()) or 1
+            for frame, count in profiler.top_frames():
+                print(f"   {100 * count / total:>5.1f}%  {frame}")
+            print(f"   📄 {output}.folded")
+
+
+def profile_main(entry_point, argv=None):
+    """Run an entry point honouring --profile[=sample], --profile-out and --timings
+
+    entry_point is a callable or a 'module:function' string; strings are imported
+    inside the profiled run so import time shows up in the report.
+    """
+    argv = sys.argv if argv is None else argv
+    mode, output, timings = parse_profile_args(argv)
+    if timings:
+        os.environ[TIMINGS_ENV] = '1'
+
+    timer = PhaseTimer()
+
+    def run():
+        func = entry_point
+        if isinstance(entry_point, str):
+            with timer.phase('import'):
+                module, _, attribute = entry_point.partition(':')
+                func = getattr(importlib.import_module(module), attribute or 'main')
+        with timer.phase('run'):
+            return func()
+
+    try:
+        if mode is None:
+            return run()
+        name = entry_point if isinstance(entry_point, str) else entry_point.__name__
+        return run_profiled(run, mode, output, name=name.replace(':', '-').replace('.', '-'))
+    finally:
+        if timings_enabled():
+            timer.print_breakdown('ENTRY POINT')
@@ -0,0 +1,280 @@
+"""
+Player prop projections for a whole slate
+Every rostered player's PTS, REB, AST and 3PM come out as a full distribution instead
+of a single label. It is a vectorized Monte Carlo over the bulk player-log matrix (one
+PlayerGameLogs call for the season):
+
+- minutes: normal around the player's recent average (override for injuries/rotations)
+- per-minute rates from the same recent games, scaled by the opponent's allowance of
+  that stat (totals conceded per game vs the league, shrunk toward average)
+- counts: gamma-Poisson (negative binomial) with per-player overdispersion, so streaky
+  scorers get wider tails than steady ones
+
+All players are simulated at once as (players x simulations) arrays, so a full slate of
+~300 players takes about a second. Percentiles and over/under probabilities at any line
+are read off the simulations.
+
+Usage:
+    python -m src.props                          # today's slate, median projections
+    python -m src.props --stat PTS --line 24.5 --player "Jayson Tatum"
+"""
+
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.dirname(__file__))
+from prediction_model import game_matrices
+
+PROP_STATS = ('PTS', 'REB', 'AST', 'FG3M')
+
+DEFAULT_WINDOW = 15         # recent games behind rates and minutes
+DEFAULT_SIMULATIONS = 5000
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+# Games of league-average defense blended into each team's allowance
+ALLOWANCE_PRIOR_GAMES = 10
+
+# Bounds on the negative binomial shape (small = wide tails, large = Poisson)
+MIN_DISPERSION, MAX_DISPERSION = 2.0, 100.0
+
+MAX_MINUTES = 48.0
+MIN_MINUTES_SD = 2.0
+
+
+def opponent_ids(logs):
+    """Opponent team id of every log row, from MATCHUP ('BOS vs. NYK' / 'BOS @ NYK')"""
+    abbreviations = logs[['TEAM_ABBREVIATION', 'TEAM_ID']].drop_duplicates()
+    lookup = dict(zip(abbreviations['TEAM_ABBREVIATION'].astype(str), abbreviations['TEAM_ID']))
+    opponents = logs['MATCHUP'].astype(str).str.split().str[-1].map(lookup)
+    return opponents.fillna(-1).astype('int64').to_numpy()
+
+
+def opponent_allowance(logs, window=DEFAULT_WINDOW, stats=PROP_STATS, prior_games=ALLOWANCE_PRIOR_GAMES):
+    """Per team, stat totals conceded per game relative to the league (1.0 = average)
+
+    Uses each team's last window games, shrunk toward 1.0 by prior_games of average defense.
+    """
+    conceded = logs[['GAME_ID', 'GAME_DATE'] + list(stats)].assign(DEFENSE_ID=opponent_ids(logs))
+    conceded = conceded[conceded['DEFENSE_ID'] >= 0]
+    per_game = conceded.groupby(['DEFENSE_ID', 'GAME_ID'], observed=True).agg(
+        {'GAME_DATE': 'first', **{stat: 'sum' for stat in stats}}).reset_index()
+    per_game = per_game.sort_values('GAME_DATE', ascending=False)
+    recent = per_game.groupby('DEFENSE_ID').head(window)
+    league = recent[list(stats)].mean()
+    totals = recent.groupby('DEFENSE_ID')[list(stats)].agg(['sum', 'count'])
+    allowance = pd.DataFrame(index=totals.index)
+    for stat in stats:
+        games = totals[(stat, 'count')]
+        blended = (totals[(stat, 'sum')] + prior_games * league[stat]) / (games + prior_games)
+        allowance[stat] = blended / league[stat] if league[stat] > 0 else 1.0
+    return allowance
+
+
+class PropProjections:
+    """Simulated stat lines for a set of players (one row per player)"""
+
+    def __init__(self, players, simulations):
+        self.players = players.reset_index(drop=True)
+        self.simulations = simulations  # {stat: (n_players, n_simulations) int16}
+
+    def __len__(self):
+        return len(self.players)
+
+    def row(self, player):
+        """Row index for a player id or (case-insensitive, partial) name"""
+        if isinstance(player, (int, np.integer)):
+            matches = np.flatnonzero(self.players['PLAYER_ID'].to_numpy() == player)
+        else:
+            names = self.players['PLAYER_NAME'].astype(str).str.lower()
+            matches = np.flatnonzero(names == str(player).lower())
+            if not len(matches):
+                matches = np.flatnonzero(names.str.contains(str(player).lower(), regex=False))
+        if not len(matches):
+            raise KeyError(f"No projection for {player}")
+        return int(matches[0])
+
+    def percentiles(self, stat, q=DEFAULT_PERCENTILES):
+        """Per-player percentiles of a stat (columns P10, P25, ...) plus the mean"""
+        sims = self.simulations[stat]
+        values = np.percentile(sims, q, axis=1).T
+        table = self.players[['PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'OPPONENT_ID', 'MINUTES']].copy()
+        table['MEAN'] = sims.mean(1).round(2)
+        for i, percentile in enumerate(q):
+            table[f'P{percentile}'] = values[:, i]
+        return table
+
+    def over_under(self, stat, lines):
+        """P(over), P(under) and P(push) per player at arbitrary lines
+
+        lines is one number for everyone, an array aligned with players, or a dict of
+        player id/name -> line (only those players are returned).
+        """
+        sims = self.simulations[stat]
+        if isinstance(lines, dict):
+            rows = np.array([self.row(player) for player in lines], dtype='int64')
+            line = np.asarray(list(lines.values()), dtype='float64')
+        else:
+            rows = np.arange(len(self.players))
+            line = np.broadcast_to(np.asarray(lines, dtype='float64'), rows.shape)
+        sims = sims[rows]
+        table = self.players.iloc[rows][['PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID']].reset_index(drop=True)
+        table['STAT'] = stat
+        table['LINE'] = line
+        table['OVER'] = (sims > line[:, None]).mean(1)
+        table['UNDER'] = (sims < line[:, None]).mean(1)
+        table['PUSH'] = (sims == line[:, None]).mean(1)
+        return table
+
+    def probability(self, player, stat, line):
+        """P(stat > line) for one player"""
+        return float((self.simulations[stat][self.row(player)] > line).mean())
+
+    def summary(self, q=(10, 50, 90)):
+        """One row per player with the chosen percentiles of every stat"""
+        table = self.players[['PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'OPPONENT_ID', 'MINUTES']].copy()
+        for stat, sims in self.simulations.items():
+            values = np.percentile(sims, q, axis=1)
+            for i, percentile in enumerate(q):
+                table[f'{stat}_P{percentile}'] = values[i]
+        return table
+
+
+class PropEngine:
+    """Fits per-player rates from the bulk log matrix and simulates projections"""
+
+    def __init__(self, window=DEFAULT_WINDOW, simulations=DEFAULT_SIMULATIONS, stats=PROP_STATS, seed=None):
+        self.window = window
+        self.n_simulations = simulations
+        self.stats = tuple(stats)
+        self.seed = seed
+        self.players = None
+        self.allowance = None
+
+    def fit(self, logs):
+        """Per-player minutes, per-minute rates and dispersion from a season of PlayerGameLogs"""
+        logs = logs[pd.to_numeric(logs['MIN'], errors='coerce').fillna(0) > 0]
+        ids, matrices = game_matrices(logs, columns=('MIN',) + self.stats, id_column='PLAYER_ID',
+                                      last_n_games=self.window)
+        minutes = matrices['MIN']
+        played = ~np.isnan(minutes)
+        games = played.sum(1)
+
+        latest = logs.sort_values('GAME_DATE').groupby('PLAYER_ID', observed=True).tail(1).set_index('PLAYER_ID')
+        players = pd.DataFrame({
+            'PLAYER_ID': ids,
+            'PLAYER_NAME': latest.loc[ids, 'PLAYER_NAME'].astype(str).to_numpy(),
+            'TEAM_ID': latest.loc[ids, 'TEAM_ID'].to_numpy(dtype='int64'),
+            'GAMES': games,
+        })
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            players['MINUTES'] = np.nanmean(minutes, 1)
+            players['MINUTES_SD'] = np.maximum(np.nan_to_num(np.nanstd(minutes, 1)), MIN_MINUTES_SD)
+            total_minutes = np.nansum(minutes, 1)
+            for stat in self.stats:
+                counts = matrices[stat]
+                rate = np.where(total_minutes > 0, np.nansum(counts, 1) / np.maximum(total_minutes, 1e-9), 0.0)
+                # Overdispersion beyond what the minutes explain: var = mu + mu^2 / k
+                expected = rate[:, None] * minutes
+                mu = np.nanmean(expected, 1)
+                excess = np.nanmean((counts - expected) ** 2, 1) - mu
+                shape = np.where(excess > 0, mu ** 2 / np.where(excess > 0, excess, 1.0), MAX_DISPERSION)
+                players[f'{stat}_RATE'] = rate
+                players[f'{stat}_SHAPE'] = np.clip(np.nan_to_num(shape, nan=MAX_DISPERSION),
+                                                   MIN_DISPERSION, MAX_DISPERSION)
+        self.players = players
+        self.allowance = opponent_allowance(logs, self.window, self.stats)
+        return self
+
+    def project(self, matchups, minutes=None):
+        """Simulate every player on the teams in matchups [(home_id, away_id), ...]
+
+        minutes overrides projected minutes by player id or name (0 = out, dropped).
+        """
+        opponents = {}
+        for home_id, away_id in matchups:
+            opponents[int(home_id)] = int(away_id)
+            opponents[int(away_id)] = int(home_id)
+        players = self.players[self.players['TEAM_ID'].isin(list(opponents))].copy()
+        players['OPPONENT_ID'] = players['TEAM_ID'].map(opponents)
+        for player, value in (minutes or {}).items():
+            if isinstance(player, (int, np.integer)):
+                mask = players['PLAYER_ID'] == player
+            else:
+                mask = players['PLAYER_NAME'].str.lower() == str(player).lower()
+            players.loc[mask, 'MINUTES'] = float(value)
+        players = players[players['MINUTES'] > 0].reset_index(drop=True)
+        return PropProjections(players, self.simulate(players))
+
+    def simulate(self, players):
+        """{stat: (n_players, n_simulations) int16} drawn for a player table"""
+        rng = np.random.default_rng(self.seed)
+        shape = (len(players), self.n_simulations)
+        minutes = rng.normal(players['MINUTES'].to_numpy()[:, None], players['MINUTES_SD'].to_numpy()[:, None],
+                             shape)
+        np.clip(minutes, 0.0, MAX_MINUTES, out=minutes)
+
+        simulations = {}
+        for stat in self.stats:
+            factor = players['OPPONENT_ID'].map(self.allowance[stat]).fillna(1.0).to_numpy()
+            mean = minutes * (players[f'{stat}_RATE'].to_numpy() * factor)[:, None]
+            dispersion = players[f'{stat}_SHAPE'].to_numpy()[:, None]
+            mean *= rng.gamma(dispersion, 1.0 / dispersion, shape)
+            simulations[stat] = rng.poisson(mean).astype(np.int16)
+        return simulations
+
+
+def slate_matchups(client):
+    """(home_id, away_id) pairs from today's scoreboard"""
+    return [(game['homeTeam']['teamId'], game['awayTeam']['teamId']) for game in client.scoreboard_games() or []]
+
+
+def project_slate(client=None, engine=None, matchups=None, minutes=None):
+    """Projections for every player on today's slate (or the given matchups)"""
+    if client is None:
+        from endpoints import EndpointClient
+        client = EndpointClient()
+    from endpoints import CURRENT_SEASON
+    engine = engine or PropEngine()
+    if engine.players is None:
+        engine.fit(client.league_player_logs(CURRENT_SEASON, cache=True))
+    return engine.project(slate_matchups(client) if matchups is None else matchups, minutes)
+
+
+def main(argv=None):
+    """Print today's prop projections, or over/under odds for one player and line"""
+    argv = sys.argv[1:] if argv is None else argv
+    stat = argv[argv.index('--stat') + 1].upper() if '--stat' in argv else 'PTS'
+    if stat not in PROP_STATS:
+        print(f"❌ Unknown stat {stat} (use one of {', '.join(PROP_STATS)})")
+        return 1
+    projections = project_slate()
+    if not len(projections):
+        print("No games (or no player logs) for today's slate.")
+        return 0
+
+    if '--player' in argv and '--line' in argv:
+        player = argv[argv.index('--player') + 1]
+        line = float(argv[argv.index('--line') + 1])
+        odds = projections.over_under(stat, {player: line}).iloc[0]
+        row = projections.percentiles(stat).iloc[projections.row(player)]
+        print(f"\n🎯 {odds['PLAYER_NAME']} {stat} {line}: over {100 * odds['OVER']:.1f}% | "
+              f"under {100 * odds['UNDER']:.1f}% | push {100 * odds['PUSH']:.1f}%")
+        print(f"   Projection: mean {row['MEAN']:.1f}, 10th-90th percentile {row['P10']:.0f}-{row['P90']:.0f} "
+              f"in {row['MINUTES']:.0f} min")
+        return 0
+
+    table = projections.percentiles(stat).sort_values('MEAN', ascending=False)
+    print(f"\n📈 {stat} PROJECTIONS: {len(projections)} players on today's slate")
+    print(f"   {'player':<26} {'min':>5} {'mean':>6} {'P10':>5} {'P50':>5} {'P90':>5}")
+    for row in table.head(25).itertuples(index=False):
+        print(f"   {row.PLAYER_NAME:<26} {row.MINUTES:>5.1f} {row.MEAN:>6.1f} {row.P10:>5.0f} {row.P50:>5.0f} "
+              f"{row.P90:>5.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Incremental Elo-style team ratings
+Each completed game updates the two teams' ratings in O(1). Every team keeps a
+dated history of its ratings, so the rating as of any date is a binary search.
+
+Usage:
+    python -m src.ratings build --seasons 20    # rebuild from the warehouse (see warehouse.py)
+    python -m src.ratings update                # apply only games newer than the saved state
+    python -m src.ratings show
+"""
+
+import os
+import sys
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.dirname(__file__))
+from columnar import write_table, read_schema, read_table
+from frames import parse_game_dates
+
+DEFAULT_RATINGS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   'data', 'ratings')
+
+
+def _day(value):
+    """Days since epoch for a date-like value (what the histories are keyed by)"""
+    return int(np.datetime64(pd.Timestamp(value), 'D').astype(np.int64))
+
+
+def pair_games(games):
+    """One row per game (home vs away) from a team-level LeagueGameFinder frame
+
+    Returns columns GAME_ID, GAME_DATE, SEASON_ID, HOME_ID, AWAY_ID, HOME_PTS, AWAY_PTS
+    sorted by date, keeping only games where both sides are present.
+    """
+    games = games[['GAME_ID', 'GAME_DATE', 'SEASON_ID', 'TEAM_ID', 'MATCHUP', 'PTS']]
+    is_home = games['MATCHUP'].astype(str).str.contains('vs.', regex=False).to_numpy()
+    home = games[is_home]
+    away = games[~is_home][['GAME_ID', 'TEAM_ID', 'PTS']]
+    paired = home.merge(away, on='GAME_ID', suffixes=('_HOME', '_AWAY'))
+    paired = pd.DataFrame({
+        'GAME_ID': paired['GAME_ID'].astype(str),
+        'GAME_DATE': parse_game_dates(paired['GAME_DATE']),
+        'SEASON_ID': paired['SEASON_ID'].astype(str),
+        'HOME_ID': paired['TEAM_ID_HOME'].astype(np.int64),
+        'AWAY_ID': paired['TEAM_ID_AWAY'].astype(np.int64),
+        'HOME_PTS': paired['PTS_HOME'].astype(np.int64),
+        'AWAY_PTS': paired['PTS_AWAY'].astype(np.int64),
+    })
+    return paired.sort_values(['GAME_DATE', 'GAME_ID'], kind='stable').reset_index(drop=True)
+
+
+class TeamRatings:
+    """Elo ratings with margin-of-victory scaling and between-season regression"""
+
+    def __init__(self, k=20.0, home_advantage=100.0, initial=1500.0, season_carryover=0.75):
+        self.k = k
+        self.home_advantage = home_advantage
+        self.initial = initial
+        self.season_carryover = season_carryover
+        self.ratings = {}        # team_id -> current rating
+        self.games_rated = {}    # team_id -> games applied
+        self._seasons = {}       # team_id -> season of the last game applied
+        self._days = {}          # team_id -> [day of each game] (ascending)
+        self._history = {}       # team_id -> [rating after each game]
+        self._game_ids = set()
+        self.last_day = None
+
+    def expected(self, rating, opponent_rating):
+        """Win probability for rating against opponent_rating"""
+        return 1.0 / (1.0 + 10 ** ((opponent_rating - rating) / 400.0))
+
+    def update_game(self, game_date, home_id, away_id, home_pts, away_pts, season=None, game_id=None):
+        """Apply one completed game; returns the home team's rating change"""
+        if game_id is not None and game_id in self._game_ids:
+            return 0.0
+        day = _day(game_date)
+        if self.last_day is not None and day < self.last_day:
+            raise ValueError(f"Game on {game_date} is older than the last rated game - rebuild the ratings")
+
+        home = self._season_start(home_id, season)
+        away = self._season_start(away_id, season)
+        home_expected = self.expected(home + self.home_advantage, away)
+        home_won = home_pts > away_pts
+
+        # Bigger wins move ratings more, damped when the favourite wins
+        margin = abs(home_pts - away_pts)
+        winner_edge = (home + self.home_advantage - away) * (1 if home_won else -1)
+        multiplier = ((margin + 3) ** 0.8) / (7.5 + 0.006 * winner_edge)
+        change = self.k * multiplier * ((1.0 if home_won else 0.0) - home_expected)
+
+        self._record(home_id, day, home + change)
+        self._record(away_id, day, away - change)
+        if game_id is not None:
+            self._game_ids.add(game_id)
+        self.last_day = day
+        return change
+
+    def update_from_frame(self, games):
+        """Apply every game in a team-level game-log frame that has not been rated yet"""
+        paired = pair_games(games)
+        if self._game_ids:
+            paired = paired[~paired['GAME_ID'].isin(self._game_ids)]
+        for row in zip(paired['GAME_DATE'].to_numpy(), paired['HOME_ID'].to_numpy(),
+                       paired['AWAY_ID'].to_numpy(), paired['HOME_PTS'].to_numpy(),
+                       paired['AWAY_PTS'].to_numpy(), paired['SEASON_ID'].to_numpy(),
+                       paired['GAME_ID'].to_numpy()):
+            game_date, home_id, away_id, home_pts, away_pts, season, game_id = row
+            self.update_game(game_date, int(home_id), int(away_id), int(home_pts), int(away_pts),
+                             season=season, game_id=game_id)
+        return len(paired)
+
+    def rating(self, team_id, as_of=None):
+        """Rating going into as_of (games on that date excluded); current rating if as_of is None"""
+        if as_of is None:
+            return self.ratings.get(team_id, self.initial)
+        days = self._days.get(team_id)
+        if not days:
+            return self.initial
+        index = bisect_left(days, _day(as_of))
+        return self._history[team_id][index - 1] if index else self.initial
+
+    def rating_stats(self, team_id, as_of=None):
+        """Rating summary in the shape calculate_team_score expects"""
+        rating = self.rating(team_id, as_of)
+        if as_of is None:
+            games = self.games_rated.get(team_id, 0)
+        else:
+            games = bisect_left(self._days.get(team_id, []), _day(as_of))
+        return {'rating': round(rating, 1), 'games_rated': games}
+
+    def win_probability(self, home_id, away_id, as_of=None):
+        """Home win probability from ratings alone"""
+        return self.expected(self.rating(home_id, as_of) + self.home_advantage, self.rating(away_id, as_of))
+
+    def standings(self):
+        """(team_id, rating) pairs, best first"""
+        return sorted(self.ratings.items(), key=lambda item: item[1], reverse=True)
+
+    def save(self, path=DEFAULT_RATINGS_DIR):
+        """Persist the rating histories as a columnar table"""
+        team_ids, days, ratings = [], [], []
+        for team_id, team_days in self._days.items():
+            team_ids.extend([team_id] * len(team_days))
+            days.extend(team_days)
+            ratings.extend(self._history[team_id])
+        write_table(path, {
+            'TEAM_ID': np.asarray(team_ids, dtype=np.int64),
+            'DAY': np.asarray(days, dtype=np.int32),
+            'RATING': np.asarray(ratings, dtype=np.float64),
+        }, metadata={
+            'k': self.k, 'home_advantage': self.home_advantage, 'initial': self.initial,
+            'season_carryover': self.season_carryover, 'last_day': self.last_day,
+            'seasons': {str(t): s for t, s in self._seasons.items()},
+            'game_ids': sorted(self._game_ids),
+        })
+
+    @classmethod
+    def load(cls, path=DEFAULT_RATINGS_DIR):
+        """Restore ratings saved with save(), or None if nothing was saved"""
+        schema = read_schema(path)
+        if schema is None:
+            return None
+        meta = schema['metadata']
+        ratings = cls(k=meta['k'], home_advantage=meta['home_advantage'], initial=meta['initial'],
+                      season_carryover=meta['season_carryover'])
+        table = read_table(path, mmap=False)
+        for team_id, day, rating in zip(table['TEAM_ID'].tolist(), table['DAY'].tolist(),
+                                        table['RATING'].tolist()):
+            ratings._days.setdefault(team_id, []).append(day)
+            ratings._history.setdefault(team_id, []).append(rating)
+        for team_id, history in ratings._history.items():
+            ratings.ratings[team_id] = history[-1]
+            ratings.games_rated[team_id] = len(history)
+        ratings._seasons = {int(t): s for t, s in meta['seasons'].items()}
+        ratings._game_ids = set(meta['game_ids'])
+        ratings.last_day = meta['last_day']
+        return ratings
+
+    def _season_start(self, team_id, season):
+        """Current rating, regressed toward the mean on a team's first game of a new season"""
+        rating = self.ratings.get(team_id, self.initial)
+        if season is not None and self._seasons.get(team_id) not in (None, season):
+            rating = self.initial + self.season_carryover * (rating - self.initial)
+        if season is not None:
+            self._seasons[team_id] = season
+        return rating
+
+    def _record(self, team_id, day, rating):
+        self.ratings[team_id] = rating
+        self.games_rated[team_id] = self.games_rated.get(team_id, 0) + 1
+        self._days.setdefault(team_id, []).append(day)
+        self._history.setdefault(team_id, []).append(rating)
+
+
+def build_from_warehouse(warehouse, seasons=None, ratings=None):
+    """Rate every stored game (or only the unrated ones when ratings is given)"""
+    ratings = ratings or TeamRatings()
+    date_from = None
+    if ratings.last_day is not None:
+        date_from = np.datetime64(ratings.last_day, 'D')
+    games = warehouse.load('team_games', seasons=seasons, date_from=date_from,
+                           columns=['GAME_ID', 'GAME_DATE', 'SEASON_ID', 'TEAM_ID', 'MATCHUP', 'PTS'])
+    if not games.empty:
+        ratings.update_from_frame(games)
+    return ratings
+
+
+def main(argv=None):
+    """Ratings command line"""
+    argv = sys.argv[1:] if argv is None else argv
+    from warehouse import HistoricalWarehouse
+    from endpoints import recent_seasons
+    from nba_api.stats.static import teams
+    command = argv[0] if argv else 'show'
+
+    if command == 'build':
+        count = int(argv[argv.index('--seasons') + 1]) if '--seasons' in argv else 20
+        ratings = build_from_warehouse(HistoricalWarehouse(), seasons=recent_seasons(count))
+        ratings.save()
+        print(f"📈 Rated {len(ratings._game_ids)} games for {len(ratings.ratings)} teams")
+    elif command == 'update':
+        ratings = TeamRatings.load() or TeamRatings()
+        before = len(ratings._game_ids)
+        build_from_warehouse(HistoricalWarehouse(), ratings=ratings)
+        ratings.save()
+        print(f"📈 Applied {len(ratings._game_ids) - before} new games")
+    elif command == 'show':
+        ratings = TeamRatings.load()
+        if ratings is None:
+            print("📈 No saved ratings - run: python -m src.ratings build")
+            return
+        names = {t['id']: t['full_name'] for t in teams.get_teams()}
+        for rank, (team_id, rating) in enumerate(ratings.standings(), 1):
+            print(f"   {rank:>2}. {names.get(team_id, team_id):<28} {rating:7.1f}")
+    else:
+        print("Usage: python -m src.ratings [build [--seasons N] | update | show]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Compact storage for the recent_games rows carried in stats dicts
+Rows live in one structured NumPy array instead of a list of per-row dicts,
+but still read like dicts: game.get('PTS'), game['MATCHUP'], records[:5], len(records).
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def _to_python(value):
+    """Plain Python value for one field of a stored row"""
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    if isinstance(value, np.datetime64):
+        return str(value)
+    if isinstance(value, np.float32):
+        # Shortest repr keeps 0.456 as 0.456 instead of 0.4560000002384186
+        return float(str(value))
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _compact_column(values):
+    """Smallest array that holds a DataFrame column without losing information"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy().astype('datetime64[D]')
+    if pd.api.types.is_bool_dtype(values):
+        return values.to_numpy()
+    if pd.api.types.is_float_dtype(values):
+        array = values.to_numpy()
+        finite = array[np.isfinite(array)]
+        # Box-score floats have at most 3 decimals, which float32 reproduces exactly via _to_python
+        if np.all(np.abs(finite) < 10000) and np.array_equal(np.round(finite, 3), finite):
+            return array.astype(np.float32)
+        return array
+    if pd.api.types.is_integer_dtype(values):
+        array = values.to_numpy()
+        for dtype in (np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if len(array) == 0 or (array.min() >= info.min and array.max() <= info.max):
+                return array.astype(dtype)
+        return array.astype(np.int64)
+    # Repeated short strings (dates, matchups, W/L) become fixed-width bytes
+    text = values.astype(object).where(values.notna(), '').astype(str).to_numpy()
+    return np.char.encode(text.astype(str), 'utf-8') if len(text) else np.array([], dtype='S1')
+
+
+class GameRow:
+    """Read-only dict-like view of one stored game"""
+
+    __slots__ = ('_data', '_index')
+
+    def __init__(self, data, index):
+        self._data = data
+        self._index = index
+
+    def __getitem__(self, key):
+        if key not in self._data.dtype.names:
+            raise KeyError(key)
+        return _to_python(self._data[key][self._index])
+
+    def get(self, key, default=None):
+        if key not in self._data.dtype.names:
+            return default
+        return _to_python(self._data[key][self._index])
+
+    def keys(self):
+        return list(self._data.dtype.names)
+
+    def values(self):
+        return [self[key] for key in self._data.dtype.names]
+
+    def items(self):
+        return [(key, self[key]) for key in self._data.dtype.names]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __contains__(self, key):
+        return key in self._data.dtype.names
+
+    def __iter__(self):
+        return iter(self._data.dtype.names)
+
+    def __len__(self):
+        return len(self._data.dtype.names)
+
+    def __eq__(self, other):
+        if isinstance(other, (GameRow, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+class GameRecords(Sequence):
+    """Array-backed replacement for df.to_dict('records')"""
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data):
+        self._data = data
+
+    @classmethod
+    def from_frame(cls, df, columns=None):
+        """Build records from selected DataFrame columns"""
+        columns = list(columns or df.columns)
+        arrays = [_compact_column(df[name]) for name in columns]
+        data = np.empty(len(df), dtype=[(name, array.dtype) for name, array in zip(columns, arrays)])
+        for name, array in zip(columns, arrays):
+            data[name] = array
+        return cls(data)
+
+    @property
+    def columns(self):
+        return list(self._data.dtype.names or [])
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    def column(self, name):
+        """Whole column as an array (for vectorized consumers)"""
+        return self._data[name]
+
+    def to_list(self):
+        """Expand into a list of plain dicts"""
+        return [GameRow(self._data, i).to_dict() for i in range(len(self._data))]
+
+    # json_default/stable_fingerprint serialize anything with tolist()
+    tolist = to_list
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return GameRecords(self._data[index])
+        if index < 0:
+            index += len(self._data)
+        if not 0 <= index < len(self._data):
+            raise IndexError('game record index out of range')
+        return GameRow(self._data, index)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, GameRecords):
+            return self.to_list() == other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == [dict(row.items()) for row in other]
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (GameRecords, (self._data,))
+
+    def __repr__(self):
+        return f"GameRecords({len(self)} games, columns={self.columns})"
@@ -0,0 +1,270 @@
+"""
+Append-only store for match and player predictions
+Each result is written as soon as it completes, partitioned by month, so history
+is kept and months of predictions can be queried without loading everything.
+
+Formats:
+- 'jsonl'    one compact JSON record per line (numpy numbers stay numbers)
+- 'columnar' typed .npy column chunks (see columnar.py), written every chunk_size records;
+              until a chunk is written its records sit in a per-writer JSONL tail, so a
+              crash loses nothing - the next store opened on the directory writes them out
+"""
+
+import json
+import os
+import sys
+import uuid
+from datetime import datetime
+
+import numpy as np
+sys.path.insert(0, os.path.dirname(__file__))
+from columnar import write_table, read_schema, read_table, column_range
+from prediction_cache import json_default
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'results')
+
+# Explicit column types for the columnar format
+RECORD_SCHEMAS = {
+    'matchups': {
+        'recorded_at': 'datetime64[ms]',
+        'home_team': 'U',
+        'away_team': 'U',
+        'favored_team': 'U',
+        'confidence': 'U',
+        'home_win_probability': 'float32',
+        'away_win_probability': 'float32',
+        'predicted_home_score': 'int16',
+        'predicted_away_score': 'int16',
+        'point_spread': 'float32',
+        'data_complete': 'bool',
+    },
+    'players': {
+        'recorded_at': 'datetime64[ms]',
+        'player': 'U',
+        'prediction': 'U',
+        'confidence': 'U',
+        'performance_score': 'float32',
+        'expected_points_low': 'float32',
+        'expected_points_high': 'float32',
+        'consistency': 'float32',
+        'avg_points': 'float32',
+        'avg_rebounds': 'float32',
+        'avg_assists': 'float32',
+    },
+}
+
+
+def _jsonl_value(value):
+    """Plain Python value for a JSONL field (missing numbers become null)"""
+    if hasattr(value, 'item') and getattr(value, 'ndim', 0) == 0:
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def matchup_record(prediction, home_team=None, away_team=None, recorded_at=None):
+    """Flatten a match prediction into one store record"""
+    return {
+        'recorded_at': recorded_at or datetime.now(),
+        'home_team': home_team or '',
+        'away_team': away_team or '',
+        'favored_team': prediction.get('favored_team', ''),
+        'confidence': prediction.get('confidence', ''),
+        'home_win_probability': prediction.get('home_win_probability', np.nan),
+        'away_win_probability': prediction.get('away_win_probability', np.nan),
+        'predicted_home_score': prediction.get('predicted_home_score', 0),
+        'predicted_away_score': prediction.get('predicted_away_score', 0),
+        'point_spread': prediction.get('point_spread', np.nan),
+        # False when any input fell back to defaults or was missing (see data_quality.py)
+        'data_complete': prediction.get('data_quality', {}).get('complete', True),
+    }
+
+
+def player_record(prediction, stats=None, recorded_at=None):
+    """Flatten a player performance prediction into one store record"""
+    stats = stats or {}
+    low, _, high = str(prediction.get('expected_points_range', '')).partition('-')
+    return {
+        'recorded_at': recorded_at or datetime.now(),
+        'player': prediction.get('player') or stats.get('player_name', ''),
+        'prediction': prediction.get('prediction', ''),
+        'confidence': prediction.get('confidence', ''),
+        'performance_score': prediction.get('performance_score', np.nan),
+        'expected_points_low': float(low) if low else np.nan,
+        'expected_points_high': float(high) if high else np.nan,
+        'consistency': float(str(prediction.get('consistency_rating', 'nan')).rstrip('%')),
+        'avg_points': stats.get('avg_points', np.nan),
+        'avg_rebounds': stats.get('avg_rebounds', np.nan),
+        'avg_assists': stats.get('avg_assists', np.nan),
+    }
+
+
+def _month(timestamp):
+    return np.datetime64(timestamp, 'M').astype(str)
+
+
+def _append_line(path, record):
+    """Append one record as a compact JSON line"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as f:
+        record = {key: _jsonl_value(value) for key, value in record.items()}
+        f.write(json.dumps(record, default=json_default, separators=(',', ':')) + '\n')
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class ResultStore:
+    """Append-only writer/reader for prediction results"""
+
+    def __init__(self, root=DEFAULT_RESULTS_DIR, format='jsonl', chunk_size=256):
+        if format not in ('jsonl', 'columnar'):
+            raise ValueError("format must be 'jsonl' or 'columnar'")
+        self.root = root
+        self.format = format
+        self.chunk_size = chunk_size
+        self._buffers = {kind: [] for kind in RECORD_SCHEMAS}
+        self._writer = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        if format == 'columnar':
+            self._recover_tails()
+
+    def append_matchup(self, prediction, home_team=None, away_team=None, **extra):
+        """Record one match prediction as soon as it is available"""
+        self.append('matchups', {**matchup_record(prediction, home_team, away_team), **extra})
+
+    def append_player(self, prediction, stats=None, **extra):
+        """Record one player prediction as soon as it is available"""
+        self.append('players', {**player_record(prediction, stats), **extra})
+
+    def append(self, kind, record):
+        """Append a flat record of the given kind"""
+        if self.format == 'jsonl':
+            _append_line(os.path.join(self.root, f"{kind}-{_month(record['recorded_at'])}.jsonl"), record)
+        else:
+            _append_line(self._tail_path(kind), record)
+            self._buffers[kind].append(record)
+            if len(self._buffers[kind]) >= self.chunk_size:
+                self._flush_kind(kind)
+
+    def flush(self):
+        """Write out any buffered columnar records"""
+        for kind in self._buffers:
+            self._flush_kind(kind)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _tail_path(self, kind):
+        """JSONL tail holding this writer's records that are not in a chunk yet"""
+        return os.path.join(self.root, kind, f"_pending-{self._writer}.jsonl")
+
+    def _recover_tails(self):
+        """Write out the tails left by writers that exited without flushing"""
+        for kind in RECORD_SCHEMAS:
+            kind_dir = os.path.join(self.root, kind)
+            if not os.path.isdir(kind_dir):
+                continue
+            for name in sorted(os.listdir(kind_dir)):
+                if not (name.startswith('_pending-') and name.endswith('.jsonl')):
+                    continue
+                # Tails of running writers (this process included) are theirs to flush
+                if _process_alive(int(name[len('_pending-'):].split('-')[0])):
+                    continue
+                path = os.path.join(kind_dir, name)
+                with open(path) as f:
+                    records = [json.loads(line) for line in f if line.endswith('\n')]
+                for record in records:
+                    record['recorded_at'] = np.datetime64(record['recorded_at'], 'ms')
+                self._write_chunk(kind, records)
+                os.remove(path)
+
+    def _flush_kind(self, kind):
+        records = self._buffers[kind]
+        if not records:
+            return
+        self._buffers[kind] = []
+        self._write_chunk(kind, records)
+        # The chunk is complete (manifest written last), so the tail is no longer needed
+        try:
+            os.remove(self._tail_path(kind))
+        except FileNotFoundError:
+            pass
+
+    def _write_chunk(self, kind, records):
+        if not records:
+            return
+        schema = RECORD_SCHEMAS[kind]
+        columns = {}
+        for name, dtype in schema.items():
+            values = [record.get(name) for record in records]
+            columns[name] = np.asarray(values if dtype != 'U' else [str(v or '') for v in values],
+                                       dtype=dtype if dtype != 'U' else None)
+        # recorded_at min/max in the manifest lets reads skip chunks outside a date range
+        month = _month(columns['recorded_at'].min())
+        path = os.path.join(self.root, kind, f"part-{month}-{uuid.uuid4().hex[:8]}")
+        write_table(path, columns, metadata={'kind': kind, 'month': month})
+
+    def iter_records(self, kind, since=None, until=None):
+        """Stream JSONL records of one kind, only opening the months in range"""
+        since = np.datetime64(since, 'ms') if since is not None else None
+        until = np.datetime64(until, 'ms') if until is not None else None
+        if not os.path.isdir(self.root):
+            return
+        for filename in sorted(os.listdir(self.root)):
+            if not (filename.startswith(kind + '-') and filename.endswith('.jsonl')):
+                continue
+            month = np.datetime64(filename[len(kind) + 1:-len('.jsonl')], 'M')
+            if (since is not None and month < since.astype('datetime64[M]')) or \
+                    (until is not None and month > until.astype('datetime64[M]')):
+                continue
+            with open(os.path.join(self.root, filename)) as f:
+                for line in f:
+                    record = json.loads(line)
+                    recorded_at = np.datetime64(record['recorded_at'], 'ms')
+                    if (since is None or recorded_at >= since) and (until is None or recorded_at <= until):
+                        yield record
+
+    def read_columns(self, kind, columns=None, since=None, until=None):
+        """Load typed columns for one kind, skipping chunks outside [since, until]"""
+        since = np.datetime64(since, 'ms') if since is not None else None
+        until = np.datetime64(until, 'ms') if until is not None else None
+        wanted = columns or list(RECORD_SCHEMAS[kind])
+        parts = {name: [] for name in wanted}
+        kind_dir = os.path.join(self.root, kind)
+        if os.path.isdir(kind_dir):
+            for name in sorted(os.listdir(kind_dir)):
+                if not name.startswith('part-'):
+                    continue
+                path = os.path.join(kind_dir, name)
+                schema = read_schema(path)
+                if schema is None:
+                    continue
+                low, high = (np.datetime64(v, 'ms') for v in column_range(schema, 'recorded_at'))
+                if (since is not None and high < since) or (until is not None and low > until):
+                    continue
+                table = read_table(path, list(set(wanted) | {'recorded_at'}))
+                mask = np.ones(schema['rows'], dtype=bool)
+                if since is not None:
+                    mask &= table['recorded_at'] >= since
+                if until is not None:
+                    mask &= table['recorded_at'] <= until
+                for column in wanted:
+                    parts[column].append(table[column][mask])
+        return {
+            name: np.concatenate(chunks) if chunks else np.array([], dtype=RECORD_SCHEMAS[kind][name])
+            for name, chunks in parts.items()
+        }
@@ -0,0 +1,66 @@
+"""
+Retry policy for NBA API requests
+Transient failures (timeouts, dropped connections, throttling, 5xx and the empty or
+HTML bodies stats.nba.com sends when it throttles) are retried with exponential
+backoff and full jitter; anything else fails immediately.
+"""
+
+import json
+import random
+import time
+
+import requests
+
+# HTTP statuses worth retrying: throttled or a temporary server problem
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def is_retryable(error):
+    """True if a request that raised error may succeed when repeated"""
+    if isinstance(error, (requests.Timeout, requests.ConnectionError, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        return response is not None and response.status_code in RETRYABLE_STATUS
+    # nba_api raises this when a throttled request gets back an empty/HTML body
+    return isinstance(error, json.JSONDecodeError)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for retryable errors"""
+
+    def __init__(self, max_attempts=4, base_delay=1.0, max_delay=20.0, classify=is_retryable,
+                 sleep=time.sleep, rand=random.random):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.classify = classify
+        self._sleep = sleep
+        self._rand = rand
+
+    def delay(self, attempt):
+        """Seconds to back off after the given failed attempt (1-based)"""
+        return self._rand() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+
+    def call(self, func, before_attempt=None, backoff=None, on_retry=None):
+        """Call func until it succeeds, a fatal error occurs or the attempts run out
+
+        before_attempt runs ahead of every attempt (e.g. a rate limiter wait).
+        backoff(delay) replaces the plain sleep, so the delay can be shared with the
+        rate limiter and other threads back off too. on_retry(attempt, error, delay)
+        is called before each retry.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            if before_attempt:
+                before_attempt()
+            try:
+                return func()
+            except Exception as e:
+                if attempt >= self.max_attempts or not self.classify(e):
+                    raise
+                delay = self.delay(attempt)
+                if on_retry:
+                    on_retry(attempt, e, delay)
+                (backoff or self._sleep)(delay)
@@ -0,0 +1,291 @@
+"""
+Streaming player form: rolling statistics updated in O(1) per box score
+Instead of recomputing means over df.head(n) on every query, each player keeps small
+online accumulators that take one new game at a time:
+
+- RollingStats: mean and variance over the last n games (sliding-window Welford)
+- EWMA: exponentially weighted mean and variance (recent games count more)
+- RollingExtremes: max and min over the last n games (monotonic queues)
+
+FormTracker holds them per player and season next to the client's frame cache, ingests
+only the games it has not seen, and returns the same fields get_player_recent_stats
+puts in its stats dict. save()/load() keep the state across sessions.
+"""
+
+import math
+import os
+import sys
+import threading
+from collections import deque
+
+import numpy as np
+sys.path.insert(0, os.path.dirname(__file__))
+from columnar import write_table, read_schema, read_table
+
+DEFAULT_FORM_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'data', 'form')
+
+# stats dict field -> (game log column, scale)
+FORM_FIELDS = (
+    ('avg_points', 'PTS', 1),
+    ('avg_rebounds', 'REB', 1),
+    ('avg_assists', 'AST', 1),
+    ('avg_steals', 'STL', 1),
+    ('avg_blocks', 'BLK', 1),
+    ('avg_fg_pct', 'FG_PCT', 100),
+    ('avg_fg3_pct', 'FG3_PCT', 100),
+    ('avg_ft_pct', 'FT_PCT', 100),
+    ('avg_plus_minus', 'PLUS_MINUS', 1),
+)
+FORM_COLUMNS = tuple(column for _, column, _ in FORM_FIELDS)
+
+DEFAULT_WINDOW = 10           # matches get_player_recent_stats(last_n_games=10)
+CONSISTENCY_WINDOW = 5        # predict_player_performance's consistency uses the last 5 games
+DEFAULT_HALFLIFE = 5          # games
+
+
+class RollingStats:
+    """Mean and population variance of the last size values; NaNs are skipped"""
+
+    __slots__ = ('size', 'values', 'count', 'mean', '_m2')
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value):
+        """Add a value, dropping the oldest once the window is full"""
+        value = float(value)
+        self.values.append(value)
+        if not math.isnan(value):
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (value - self.mean)
+        if len(self.values) > self.size:
+            self._remove(self.values.popleft())
+
+    def _remove(self, value):
+        if math.isnan(value):
+            return
+        if self.count == 1:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self._m2 = max(self._m2 - delta * (value - self.mean), 0.0)
+
+    @property
+    def average(self):
+        return self.mean if self.count else float('nan')
+
+    @property
+    def variance(self):
+        return self._m2 / self.count if self.count else float('nan')
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance) if self.count else float('nan')
+
+
+class EWMA:
+    """Exponentially weighted mean and variance; a game halflife games old has half the weight"""
+
+    __slots__ = ('alpha', 'mean', 'variance', 'count')
+
+    def __init__(self, halflife=DEFAULT_HALFLIFE):
+        self.alpha = 1 - 0.5 ** (1 / halflife)
+        self.mean = float('nan')
+        self.variance = 0.0
+        self.count = 0
+
+    def push(self, value):
+        value = float(value)
+        if math.isnan(value):
+            return
+        self.count += 1
+        if self.count == 1:
+            self.mean, self.variance = value, 0.0
+            return
+        delta = value - self.mean
+        self.mean += self.alpha * delta
+        self.variance = (1 - self.alpha) * (self.variance + self.alpha * delta * delta)
+
+
+class RollingExtremes:
+    """Max and min of the last size values (amortized O(1) with monotonic queues)"""
+
+    __slots__ = ('size', 'seen', '_max', '_min')
+
+    def __init__(self, size):
+        self.size = size
+        self.seen = 0
+        self._max = deque()  # (position, value), values decreasing
+        self._min = deque()  # (position, value), values increasing
+
+    def push(self, value):
+        value = float(value)
+        position = self.seen
+        self.seen += 1
+        if not math.isnan(value):
+            while self._max and self._max[-1][1] <= value:
+                self._max.pop()
+            while self._min and self._min[-1][1] >= value:
+                self._min.pop()
+            self._max.append((position, value))
+            self._min.append((position, value))
+        oldest = self.seen - self.size
+        for queue in (self._max, self._min):
+            while queue and queue[0][0] < oldest:
+                queue.popleft()
+
+    @property
+    def high(self):
+        return self._max[0][1] if self._max else float('nan')
+
+    @property
+    def low(self):
+        return self._min[0][1] if self._min else float('nan')
+
+
+class PlayerForm:
+    """Rolling accumulators for one player's season"""
+
+    def __init__(self, window=DEFAULT_WINDOW, consistency_window=CONSISTENCY_WINDOW, halflife=DEFAULT_HALFLIFE):
+        self.window = window
+        self.rolling = {column: RollingStats(window) for column in FORM_COLUMNS}
+        self.ewma = {column: EWMA(halflife) for column in FORM_COLUMNS}
+        self.points_range = RollingExtremes(consistency_window)
+        self.recent = deque(maxlen=window)  # (GAME_ID, day) of the games in the window
+        self.games = 0
+        self.last_day = None
+
+    def push(self, game_id, day, values):
+        """Add one game (values: column -> number), oldest games first"""
+        for column in FORM_COLUMNS:
+            value = values.get(column, float('nan'))
+            self.rolling[column].push(value)
+            self.ewma[column].push(value)
+        self.points_range.push(values.get('PTS', float('nan')))
+        self.recent.append((game_id, day))
+        self.games += 1
+        self.last_day = day
+
+    def consistency(self):
+        """predict_player_performance's consistency score without the game list"""
+        if min(self.games, self.window) <= 2:
+            return 50
+        high, low = self.points_range.high, self.points_range.low
+        return 100 - (high - low) / high * 100 if high > 0 else 0
+
+    def stats(self):
+        """Stats dict fields for the last window games"""
+        stats = {'games_played': min(self.games, self.window)}
+        for field, column, scale in FORM_FIELDS:
+            stats[field] = self.rolling[column].average * scale
+        stats['std_points'] = self.rolling['PTS'].std
+        stats['ewma_points'] = self.ewma['PTS'].mean
+        stats['consistency'] = self.consistency()
+        return stats
+
+
+class FormTracker:
+    """PlayerForm per (player id, season), fed incrementally from player game logs"""
+
+    def __init__(self, window=DEFAULT_WINDOW, consistency_window=CONSISTENCY_WINDOW, halflife=DEFAULT_HALFLIFE,
+                 root=DEFAULT_FORM_DIR):
+        self.window = window
+        self.consistency_window = consistency_window
+        self.halflife = halflife
+        self.root = root
+        self.forms = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.forms)
+
+    def update(self, player_id, season, games):
+        """Ingest the games not seen yet from a game log (most recent first); returns the PlayerForm
+
+        Only games after the last one ingested are pushed, so a refreshed log costs O(new games).
+        """
+        key = (int(player_id), season)
+        days = games['GAME_DATE'].to_numpy().astype('datetime64[D]').astype('int64')
+        with self._lock:
+            form = self.forms.get(key)
+            if form is None:
+                form = self.forms[key] = PlayerForm(self.window, self.consistency_window, self.halflife)
+            new = np.flatnonzero(days > form.last_day) if form.last_day is not None else np.arange(len(days))
+            # Logs are most recent first: push the oldest new game first
+            new = new[np.argsort(days[new], kind='stable')]
+            id_column = 'Game_ID' if 'Game_ID' in games else 'GAME_ID'
+            ids = games[id_column].to_numpy()[new] if id_column in games else [''] * len(new)
+            columns = {column: games[column].to_numpy(dtype='float64')[new] for column in FORM_COLUMNS if column in games}
+            for i in range(len(new)):
+                form.push(str(ids[i]), int(days[new[i]]), {column: values[i] for column, values in columns.items()})
+            return form
+
+    def get(self, player_id, season):
+        return self.forms.get((int(player_id), season))
+
+    def save(self, root=None):
+        """Persist the window games and EWMA state of every player"""
+        root = root or self.root
+        games = {'PLAYER_ID': [], 'SEASON': [], 'GAME_ID': [], 'DAY': [], **{c: [] for c in FORM_COLUMNS}}
+        state = {'PLAYER_ID': [], 'SEASON': [], 'GAMES': [],
+                 **{f'EWMA_{c}': [] for c in FORM_COLUMNS}, **{f'EWVAR_{c}': [] for c in FORM_COLUMNS},
+                 **{f'EWCOUNT_{c}': [] for c in FORM_COLUMNS}}
+        with self._lock:
+            for (player_id, season), form in self.forms.items():
+                for position, (game_id, day) in enumerate(form.recent):
+                    games['PLAYER_ID'].append(player_id)
+                    games['SEASON'].append(season)
+                    games['GAME_ID'].append(game_id)
+                    games['DAY'].append(day)
+                    for column in FORM_COLUMNS:
+                        games[column].append(form.rolling[column].values[position])
+                state['PLAYER_ID'].append(player_id)
+                state['SEASON'].append(season)
+                state['GAMES'].append(form.games)
+                for column in FORM_COLUMNS:
+                    state[f'EWMA_{column}'].append(form.ewma[column].mean)
+                    state[f'EWVAR_{column}'].append(form.ewma[column].variance)
+                    state[f'EWCOUNT_{column}'].append(form.ewma[column].count)
+        metadata = {'window': self.window, 'consistency_window': self.consistency_window, 'halflife': self.halflife}
+        write_table(os.path.join(root, 'games'), {name: np.asarray(values) for name, values in games.items()},
+                    metadata=metadata)
+        write_table(os.path.join(root, 'state'), {name: np.asarray(values) for name, values in state.items()},
+                    metadata=metadata)
+
+    @classmethod
+    def load(cls, root=DEFAULT_FORM_DIR):
+        """Restore a tracker saved with save(), or None if nothing was saved"""
+        schema = read_schema(os.path.join(root, 'state'))
+        if schema is None or read_schema(os.path.join(root, 'games')) is None:
+            return None
+        tracker = cls(root=root, **schema['metadata'])
+        games = read_table(os.path.join(root, 'games'), mmap=False)
+        state = read_table(os.path.join(root, 'state'), mmap=False)
+        # Replaying the window games rebuilds the rolling sums and extremes exactly
+        for i in range(len(games['DAY'])):
+            key = (int(games['PLAYER_ID'][i]), str(games['SEASON'][i]))
+            form = tracker.forms.get(key)
+            if form is None:
+                form = tracker.forms[key] = PlayerForm(tracker.window, tracker.consistency_window, tracker.halflife)
+            form.push(str(games['GAME_ID'][i]), int(games['DAY'][i]),
+                      {column: float(games[column][i]) for column in FORM_COLUMNS})
+        for i in range(len(state['GAMES'])):
+            form = tracker.forms.get((int(state['PLAYER_ID'][i]), str(state['SEASON'][i])))
+            if form is None:
+                continue
+            form.games = int(state['GAMES'][i])
+            for column in FORM_COLUMNS:
+                ewma = form.ewma[column]
+                ewma.mean = float(state[f'EWMA_{column}'][i])
+                ewma.variance = float(state[f'EWVAR_{column}'][i])
+                ewma.count = int(state[f'EWCOUNT_{column}'][i])
+        return tracker
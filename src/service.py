@@ -0,0 +1,332 @@
+"""
+Local NBA prediction service
+Keeps one extractor, its frame cache and the predictor warm between queries
+
+Usage:
+    python -m src.service serve [--host 127.0.0.1] [--port 8765] [--warm]
+    python -m src.service matchup "Lakers" "Warriors"
+    python -m src.service player "LeBron James"
+    python -m src.service slate
+    python -m src.service today
+    python -m src.service refresh
+    python -m src.service refresh --changed   # only what depends on teams with new games
+    python -m src.service prefetch
+"""
+
+import contextlib
+import io
+import json
+import sys
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(__file__))
+from advanced_enhanced_predictor import SuperPredictor
+from prediction_model import generate_betting_insights
+from result_store import json_default
+from prefetch import REWARM_INTERVAL, SlatePrefetcher
+from ratings import TeamRatings
+from rolling_stats import FormTracker
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Endpoints that change server state; GET requests (crawlers, browser prefetch) must not reach them
+POST_ONLY = ('/refresh', '/prefetch')
+
+
+class PredictionService:
+    """Answers analysis requests from a long-lived SuperPredictor"""
+
+    def __init__(self, predictor=None):
+        # The rolling player form saved by the last session (see serve)
+        self.predictor = predictor or SuperPredictor(ratings=TeamRatings.load(),
+                                                     form=FormTracker.load() or FormTracker())
+        self.started_at = time.time()
+        self.prefetcher = None
+        # Analysis steps print their reports, so requests are captured one at a time
+        self._lock = threading.Lock()
+
+    def _run(self, func, *args, **kwargs):
+        """Run an analysis call and capture its console report"""
+        buffer = io.StringIO()
+        with self._lock, contextlib.redirect_stdout(buffer):
+            result = func(*args, **kwargs)
+        return result, buffer.getvalue()
+
+    def matchup(self, home_team, away_team, key_players_status=None):
+        """Full matchup analysis plus betting insights"""
+        result, report = self._run(
+            self.predictor.comprehensive_matchup_analysis,
+            home_team, away_team, key_players_status
+        )
+        if result:
+            result['insights'] = generate_betting_insights(result['prediction'])
+        return result, report
+
+    def player(self, player_name, last_n_games=10):
+        """Recent stats and performance prediction for one player"""
+        def analyze():
+            stats = self.predictor.get_player_recent_stats(player_name, last_n_games=last_n_games)
+            if not stats:
+                return None
+            return {'stats': stats, 'prediction': self.predictor.predictor.predict_player_performance(stats)}
+
+        return self._run(analyze)
+
+    def today(self):
+        """Today's scoreboard"""
+        return self._run(self.predictor.get_todays_games)
+
+    def slate(self):
+        """Predictions for every game on today's scoreboard"""
+        def analyze():
+            results = []
+            for game in self.predictor.get_todays_games():
+                analysis = self.predictor.comprehensive_matchup_analysis(game['home_team'], game['away_team'])
+                results.append({
+                    'game_id': game['game_id'],
+                    'home_team': game['home_team'],
+                    'away_team': game['away_team'],
+                    'prediction': analysis['prediction'] if analysis else None
+                })
+            return results
+
+        return self._run(analyze)
+
+    def refresh(self, changed_only=False):
+        """Drop cached frames and predictions
+
+        changed_only keeps everything that does not depend on teams with new games and
+        re-runs only the invalidated matchups (see refresh_changed).
+        """
+        if not changed_only:
+            return self._run(self.predictor.refresh_data)
+
+        def refresh_changed():
+            summary = self.predictor.refresh_changed()
+            summary['recomputed'] = len(self.predictor.recompute_stale())
+            return summary
+
+        return self._run(refresh_changed)
+
+    def prefetch(self, include_players=True):
+        """Warm the cache for today's slate in the background, re-warming before it expires"""
+        if self.prefetcher and self.prefetcher.is_running():
+            return {'status': 'already running', 'summary': self.prefetcher.summary}, ''
+        self.prefetcher = SlatePrefetcher(self.predictor, include_players=include_players)
+        self.prefetcher.start(interval=REWARM_INTERVAL)
+        return {'status': 'started'}, ''
+
+    def health(self):
+        """Uptime and cache counters"""
+        return {
+            'status': 'ok',
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'data_version': self.predictor.data_version,
+            'frame_cache': self.predictor.client.stats(),
+            'prediction_cache': self.predictor.predictor.cache.stats(),
+            'dependencies': self.predictor.dependencies.stats(),
+            'prefetch': self.prefetcher.summary if self.prefetcher else None
+        }
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """Maps URL paths onto PredictionService calls"""
+
+    service = None
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        if url.path in POST_ONLY:
+            self._reply(405, {'error': f'{url.path} changes server state - use POST'}, {'Allow': 'POST'})
+            return
+        params = {k: v[-1] for k, v in urllib.parse.parse_qs(url.query).items()}
+        self._dispatch(url.path, params)
+
+    def do_POST(self):
+        url = urllib.parse.urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            params = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._reply(400, {'error': 'Request body is not valid JSON'})
+            return
+        self._dispatch(url.path, params)
+
+    def _dispatch(self, path, params):
+        started = time.perf_counter()
+        try:
+            if path == '/health':
+                self._reply(200, self.service.health())
+                return
+            if path == '/matchup':
+                if not params.get('home') or not params.get('away'):
+                    self._reply(400, {'error': "'home' and 'away' are required"})
+                    return
+                result, report = self.service.matchup(params['home'], params['away'],
+                                                       params.get('key_players_status'))
+            elif path == '/player':
+                if not params.get('name'):
+                    self._reply(400, {'error': "'name' is required"})
+                    return
+                try:
+                    last_n_games = int(params.get('last_n_games', 10))
+                except (TypeError, ValueError):
+                    last_n_games = 0
+                if last_n_games < 1:
+                    self._reply(400, {'error': "'last_n_games' must be a positive integer"})
+                    return
+                result, report = self.service.player(params['name'], last_n_games)
+            elif path == '/today':
+                result, report = self.service.today()
+            elif path == '/slate':
+                result, report = self.service.slate()
+            elif path == '/refresh':
+                result, report = self.service.refresh(str(params.get('changed', False)).lower() == 'true')
+            elif path == '/prefetch':
+                result, report = self.service.prefetch(str(params.get('players', True)).lower() != 'false')
+            else:
+                self._reply(404, {'error': f'Unknown endpoint {path}'})
+                return
+        except Exception as e:
+            self._reply(500, {'error': str(e)})
+            return
+
+        self._reply(200, {
+            'result': result,
+            'report': report,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+        })
+
+    def _reply(self, status, payload, headers=None):
+        body = json.dumps(payload, default=json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"   [service] {format % args}\n")
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, service=None):
+    """Run the prediction service until interrupted"""
+    handler = type('ServiceHandler', (_ServiceHandler,), {'service': service or PredictionService()})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"🏀 NBA prediction service listening on http://{host}:{port}")
+    print("   Endpoints: /matchup /player /slate /today /health, POST /refresh /prefetch")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down prediction service")
+    finally:
+        server.server_close()
+        # Keep the rolling player form for the next session
+        form = getattr(handler.service.predictor, 'form', None)
+        if form is not None and len(form):
+            form.save()
+
+
+class ServiceClient:
+    """Thin client for a running prediction service"""
+
+    def __init__(self, base_url=None, timeout=120):
+        self.base_url = (base_url or os.environ.get('NBA_SERVICE_URL')
+                         or f'http://{DEFAULT_HOST}:{DEFAULT_PORT}').rstrip('/')
+        self.timeout = timeout
+
+    def request(self, path, params=None, body=None):
+        """Call an endpoint and return the decoded JSON reply"""
+        url = self.base_url + path
+        if params:
+            url += '?' + urllib.parse.urlencode(params)
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return json.loads(e.read() or b'{}')
+
+    def matchup(self, home_team, away_team, key_players_status=None):
+        if key_players_status:
+            return self.request('/matchup', body={'home': home_team, 'away': away_team,
+                                                  'key_players_status': key_players_status})
+        return self.request('/matchup', {'home': home_team, 'away': away_team})
+
+    def player(self, player_name, last_n_games=10):
+        return self.request('/player', {'name': player_name, 'last_n_games': last_n_games})
+
+    def slate(self):
+        return self.request('/slate')
+
+    def today(self):
+        return self.request('/today')
+
+    def refresh(self, changed_only=False):
+        return self.request('/refresh', body={'changed': changed_only})
+
+    def prefetch(self, include_players=True):
+        return self.request('/prefetch', body={'players': include_players})
+
+    def health(self):
+        return self.request('/health')
+
+
+def main(argv=None):
+    """Command line entry point - 'serve' starts the service, other commands query it"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print(__doc__)
+        return
+
+    command = argv[0].lower()
+    if command == 'serve':
+        host = argv[argv.index('--host') + 1] if '--host' in argv else DEFAULT_HOST
+        port = int(argv[argv.index('--port') + 1]) if '--port' in argv else DEFAULT_PORT
+        service = PredictionService()
+        if '--warm' in argv:
+            service.prefetch()
+        serve(host, port, service)
+        return
+
+    client = ServiceClient()
+    try:
+        if command == 'matchup' and len(argv) >= 3:
+            reply = client.matchup(argv[1], argv[2])
+        elif command == 'player' and len(argv) >= 2:
+            reply = client.player(' '.join(argv[1:]))
+        elif command == 'refresh':
+            reply = client.refresh(changed_only='--changed' in argv)
+        elif command in ('slate', 'today', 'prefetch', 'health'):
+            reply = getattr(client, command)()
+        else:
+            print(__doc__)
+            return
+    except urllib.error.URLError:
+        print(f"❌ Prediction service not reachable at {client.base_url}")
+        print("   Start it with: python -m src.service serve")
+        return
+
+    if 'error' in reply:
+        print(f"❌ {reply['error']}")
+    elif command in ('health', 'prefetch'):
+        print(json.dumps(reply, indent=2))
+    elif command == 'refresh' and '--changed' in argv:
+        print(json.dumps(reply['result'], indent=2, default=json_default))
+    else:
+        print(reply.get('report', ''))
+        print(f"⚡ Answered in {reply.get('elapsed_ms', 0):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
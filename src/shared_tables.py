@@ -0,0 +1,273 @@
+"""
+League tables in shared memory for process-pool workers
+Backtests and weight searches run on a process pool; without sharing, every worker would
+hold (and re-parse) its own copy of the game and feature tables. Here each column is
+published once into a multiprocessing.shared_memory block and workers attach to it:
+
+- numeric, boolean and datetime columns are zero-copy, read-only NumPy views
+- text columns are stored as fixed-width unicode; frame() turns them into new Python
+  strings in every worker (a per-worker copy), and missing text comes back as ''
+- categoricals keep their integer codes in shared memory and their categories in the handle
+
+Any warehouse table can be published - team or player game logs (the warehouse loads
+repeated text such as MATCHUP as categoricals, so only the codes are copied).
+search_weights publishes the feature table and the paired games it backtests on.
+
+SharedTable handles are small and picklable. shared_pool() publishes the tables, starts
+the pool with them attached, and unlinks every block when the pool exits (including on
+errors; if the parent dies, multiprocessing's resource tracker removes the blocks).
+
+Usage:
+    python -m src.shared_tables --processes 4     # weight search over the feature store
+
+    with shared_pool({'games': games}, processes=4) as pool:
+        results = list(pool.map(worker_function, tasks))   # workers call table('games').frame()
+"""
+
+import os
+import sys
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.dirname(__file__))
+from columnar import _encode_column
+
+# Blocks mapped by this process (block name -> SharedMemory), kept open while views exist
+_ATTACHED = {}
+# Tables the pool initializer attached in a worker (table name -> SharedTable)
+_WORKER_TABLES = {}
+
+
+class SharedTable:
+    """Picklable handle to a table published in shared memory"""
+
+    def __init__(self, name, rows, columns, metadata=None):
+        self.name = name
+        self.rows = rows
+        self.columns = columns  # [{'name', 'block', 'dtype', 'categories'}]
+        self.metadata = metadata or {}
+
+    def __len__(self):
+        return self.rows
+
+    def arrays(self, columns=None):
+        """Column name -> read-only array viewing the shared block"""
+        wanted = [c for c in self.columns if columns is None or c['name'] in columns]
+        result = {}
+        for column in wanted:
+            block = _attach(column['block'])
+            array = np.ndarray((self.rows,), dtype=np.dtype(column['dtype']), buffer=block.buf)
+            array.flags.writeable = False
+            result[column['name']] = array
+        return result
+
+    def frame(self, columns=None):
+        """DataFrame over the shared columns (copy-on-write: edits never reach the block)
+
+        Numeric, datetime and categorical-code columns view the block; text columns are
+        decoded into Python strings owned by the calling process.
+        """
+        categories = {c['name']: c['categories'] for c in self.columns if c['categories'] is not None}
+        data = {}
+        for name, array in self.arrays(columns).items():
+            if name in categories:
+                data[name] = pd.Categorical.from_codes(array, dtype=pd.CategoricalDtype(categories[name]),
+                                                       validate=False)
+            else:
+                data[name] = array
+        return pd.DataFrame(data, copy=False)
+
+
+def _attach(block_name):
+    """Map a shared block once per process"""
+    block = _ATTACHED.get(block_name)
+    if block is None:
+        try:
+            # Python 3.13+: the attaching process must not unlink the block on exit
+            block = shared_memory.SharedMemory(name=block_name, track=False)
+        except TypeError:
+            block = shared_memory.SharedMemory(name=block_name)
+        block = _ATTACHED[block_name] = block
+    return block
+
+
+def _release(blocks):
+    """Close and unlink blocks created by a publisher"""
+    for block in blocks:
+        _ATTACHED.pop(block.name, None)
+        try:
+            block.close()
+        except BufferError:
+            pass  # a frame still views it; the mapping goes away with that frame
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+    blocks.clear()
+
+
+class SharedTables:
+    """Publisher of tables into shared memory; close() (or leaving the with-block) unlinks them"""
+
+    def __init__(self):
+        self.handles = {}
+        self._blocks = []
+        self._finalizer = weakref.finalize(self, _release, self._blocks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getitem__(self, name):
+        return self.handles[name]
+
+    def publish(self, name, frame, metadata=None):
+        """Copy a DataFrame (or dict of columns) into shared memory once; returns its SharedTable"""
+        specs, rows = [], None
+        for column, values in frame.items():
+            array, categories = _encode_column(values)
+            array = np.ascontiguousarray(array)
+            if array.dtype == object:
+                raise TypeError(f"Column {column} cannot be shared (object dtype)")
+            rows = len(array) if rows is None else rows
+            if len(array) != rows:
+                raise ValueError(f"Column {column} has {len(array)} rows, expected {rows}")
+            # Zero-size blocks are not allowed
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            self._blocks.append(block)
+            _ATTACHED[block.name] = block
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            specs.append({'name': str(column), 'block': block.name, 'dtype': array.dtype.str,
+                          'categories': categories})
+        handle = SharedTable(name, rows or 0, specs, metadata)
+        self.handles[name] = handle
+        return handle
+
+    @contextmanager
+    def pool(self, processes=None):
+        """ProcessPoolExecutor whose workers attach every published table at start-up"""
+        executor = ProcessPoolExecutor(processes, initializer=_attach_worker, initargs=(dict(self.handles),))
+        try:
+            yield executor
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def close(self):
+        self._finalizer()
+
+
+def _attach_worker(handles):
+    """Pool initializer: map every table so tasks can call table(name)"""
+    _WORKER_TABLES.update(handles)
+    for handle in handles.values():
+        handle.arrays()
+
+
+def table(name):
+    """SharedTable attached by the pool initializer (inside a shared_pool worker)"""
+    return _WORKER_TABLES[name]
+
+
+@contextmanager
+def shared_pool(tables, processes=None, metadata=None):
+    """Publish {name: frame}, run a process pool over them, and free the blocks when it exits"""
+    with SharedTables() as shared:
+        for name, frame in tables.items():
+            shared.publish(name, frame, (metadata or {}).get(name))
+        with shared.pool(processes) as executor:
+            yield executor
+
+
+# Per-worker state of search_weights: the feature store rebuilt over the shared table
+_WORKER_STORE = {}
+
+
+def _worker_store():
+    if 'store' not in _WORKER_STORE:
+        from feature_store import FeatureStore
+        features = table('features')
+        _WORKER_STORE['store'] = FeatureStore.from_table(features.frame(), window=features.metadata['window'])
+    return _WORKER_STORE['store']
+
+
+def _score_weights(weights):
+    """Backtest one weight set over the shared games (runs in a pool worker)"""
+    from prediction_model import AdvancedPredictor
+    store = _worker_store()
+    games = table('games').frame()
+    predictor = AdvancedPredictor()
+    predictor.weights.update(weights)
+    correct, brier, count = 0, 0.0, 0
+    for home_id, away_id, day, home_won in zip(games['HOME_ID'].tolist(), games['AWAY_ID'].tolist(),
+                                               games['GAME_DATE'], games['HOME_WON'].tolist()):
+        inputs = store.prediction_inputs(home_id, away_id, day)
+        if inputs is None:
+            continue
+        probability = predictor.predict_match_outcome(**inputs)['home_win_probability'] / 100
+        correct += (probability > 0.5) == bool(home_won)
+        brier += (probability - home_won) ** 2
+        count += 1
+    return {'weights': weights, 'games': count,
+            'accuracy': round(100 * correct / count, 2) if count else None,
+            'brier': round(brier / count, 4) if count else None}
+
+
+def search_weights(store, games, weight_sets, processes=None):
+    """Backtest accuracy and Brier score of each weight set on a process pool
+
+    The feature table and the paired games are published once; every worker attaches to
+    them instead of receiving its own copy. Weight sets override AdvancedPredictor defaults.
+    """
+    from ratings import pair_games
+    paired = pair_games(games)
+    paired = pd.DataFrame({
+        'GAME_DATE': paired['GAME_DATE'].to_numpy(dtype='datetime64[ns]'),
+        'HOME_ID': paired['HOME_ID'].to_numpy(),
+        'AWAY_ID': paired['AWAY_ID'].to_numpy(),
+        'HOME_WON': (paired['HOME_PTS'] > paired['AWAY_PTS']).to_numpy(dtype=np.int8),
+    })
+    with shared_pool({'features': store.table, 'games': paired}, processes,
+                     metadata={'features': {'window': store.window}}) as pool:
+        return list(pool.map(_score_weights, weight_sets))
+
+
+def weight_grid(base_weights, factors=(0.5, 1.5)):
+    """The base weights plus each weight scaled by every factor"""
+    grid = [{}]
+    for name, value in base_weights.items():
+        for factor in factors:
+            grid.append({name: round(value * factor, 4)})
+    return grid
+
+
+def main(argv=None):
+    """Weight search over the stored features and warehouse games"""
+    argv = sys.argv[1:] if argv is None else argv
+    processes = int(argv[argv.index('--processes') + 1]) if '--processes' in argv else None
+    from feature_store import FeatureStore
+    from prediction_model import AdvancedPredictor
+    from warehouse import HistoricalWarehouse
+
+    store = FeatureStore.load()
+    if store is None:
+        print("🧮 No feature store yet - run: python -m src.feature_store build")
+        return
+    games = HistoricalWarehouse().load('team_games')
+    grid = weight_grid(AdvancedPredictor().weights)
+    print(f"\n🧪 Backtesting {len(grid)} weight sets on {processes or os.cpu_count()} processes "
+          f"({store.table.memory_usage(deep=True).sum() / 1e6:.1f} MB of features shared)...")
+    results = search_weights(store, games, grid, processes)
+    for result in sorted(results, key=lambda r: (r['brier'] is None, r['brier'])):
+        change = ', '.join(f"{k}={v}" for k, v in result['weights'].items()) or 'default weights'
+        print(f"   {change:<32} accuracy {result['accuracy']}%  brier {result['brier']}  "
+              f"({result['games']} games)")
+
+
+if __name__ == "__main__":
+    main()
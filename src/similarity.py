@@ -0,0 +1,316 @@
+"""
+Similar historical matchups from a nearest-neighbour index
+Each past game is a vector of both teams' pre-game features - the form, offense,
+shooting, defense and rest inputs calculate_team_score uses - read from the point-in-time
+feature store (feature_store.py), so a game only ever sees what was known before tip-off.
+
+The index is an inverted file: vectors are standardized, grouped around k-means
+centroids, and a query only scans the lists of its nprobe nearest centroids before an
+exact re-rank. New games are appended to their nearest list; the centroids are
+retrained once the index has doubled since they were fitted.
+
+The command line saves the index under data/matchup_index/ with the warehouse
+manifest version it was built from, and only rebuilds it (k-means included) when the
+warehouse has changed since.
+
+Usage:
+    python -m src.similarity Lakers Warriors        # needs a built feature store and warehouse
+    python -m src.similarity Celtics Heat --k 20
+"""
+
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.dirname(__file__))
+from columnar import write_table, read_schema, read_frame, read_table
+from ratings import pair_games
+
+DEFAULT_INDEX_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'data', 'matchup_index')
+
+# Pre-game features per side, as (feature store column, team/defense/rest stats key)
+SIDE_FEATURES = (
+    ('WIN_PCT', 'win_percentage'),
+    ('AVG_PTS', 'avg_points_scored'),
+    ('AVG_FG_PCT', 'avg_fg_pct'),
+    ('AVG_FG3_PCT', 'avg_fg3_pct'),
+    ('AVG_PTS_ALLOWED', 'avg_points_allowed'),
+    ('REST_DAYS', 'rest_days'),
+)
+FEATURE_NAMES = [f'{side}_{column}' for side in ('HOME', 'AWAY') for column, _ in SIDE_FEATURES]
+
+# Rest beyond this many days counts the same (season openers would otherwise dominate)
+MAX_REST_DAYS = 7
+
+
+def pregame_features(store, games):
+    """One row per paired game with both teams' features as of the game date
+
+    Same semantics as FeatureStore.lookup (only earlier games), done for every game at
+    once with an as-of merge. Games where either team has no history yet are dropped.
+    """
+    paired = pair_games(games)
+    columns = ['TEAM_ID', 'VALID_FROM', 'GAME_DATE'] + [c for c, _ in SIDE_FEATURES if c != 'REST_DAYS']
+    table = store.table[columns].rename(columns={'GAME_DATE': 'LAST_GAME'})
+    # merge_asof needs both date keys at the same resolution
+    table = table.astype({'VALID_FROM': 'datetime64[ns]', 'LAST_GAME': 'datetime64[ns]'}).sort_values('VALID_FROM')
+    paired = paired.astype({'GAME_DATE': 'datetime64[ns]'}).sort_values('GAME_DATE', kind='stable')
+    for side in ('HOME', 'AWAY'):
+        side_table = table.rename(columns={c: f'{side}_{c}' for c in table.columns if c != 'VALID_FROM'})
+        paired = pd.merge_asof(paired, side_table, left_on='GAME_DATE', right_on='VALID_FROM',
+                               left_by=f'{side}_ID', right_by=f'{side}_TEAM_ID').drop(columns='VALID_FROM')
+        rest = (paired['GAME_DATE'] - paired[f'{side}_LAST_GAME']).dt.days
+        paired[f'{side}_REST_DAYS'] = rest.clip(upper=MAX_REST_DAYS)
+    paired = paired.dropna(subset=FEATURE_NAMES).reset_index(drop=True)
+    return paired
+
+
+def stats_vector(home_team_stats, away_team_stats, home_defensive_stats=None, away_defensive_stats=None,
+                 home_rest_stats=None, away_rest_stats=None, **_):
+    """Query vector from the stats dicts predict_match_outcome takes (e.g. FeatureStore.prediction_inputs)"""
+    values = []
+    for team, defense, rest in ((home_team_stats, home_defensive_stats, home_rest_stats),
+                                (away_team_stats, away_defensive_stats, away_rest_stats)):
+        merged = {**team, **(defense or {}), **(rest or {})}
+        for _, key in SIDE_FEATURES:
+            value = merged.get(key, np.nan)
+            values.append(min(value, MAX_REST_DAYS) if key == 'rest_days' else value)
+    return np.asarray(values, dtype='float64')
+
+
+def _nearest(points, centroids):
+    """Index of the nearest centroid for every point (squared euclidean)"""
+    distances = (points ** 2).sum(1)[:, None] - 2 * points @ centroids.T + (centroids ** 2).sum(1)[None, :]
+    return distances.argmin(1)
+
+
+def _vector_columns(array):
+    """Column name -> values for each dimension of a 2-D array (columnar tables are 1-D)"""
+    return {f'V{i}': array[:, i] for i in range(array.shape[1])}
+
+
+class MatchupIndex:
+    """Inverted-file nearest-neighbour index over standardized feature vectors"""
+
+    def __init__(self, n_lists=None, nprobe=16, iterations=8, seed=0):
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.seed = seed
+        self.vectors = np.empty((0, 0), dtype='float32')
+        self.mean = self.scale = self.centroids = None
+        self.lists = []
+        self._trained_size = 0
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def fit(self, vectors):
+        """Build the index from scratch"""
+        vectors = np.asarray(vectors, dtype='float64')
+        self.mean = vectors.mean(0)
+        self.scale = np.where(vectors.std(0) > 0, vectors.std(0), 1.0)
+        self.vectors = self._standardize(vectors)
+        self._train()
+        return self
+
+    def add(self, vectors):
+        """Append vectors (ids continue from len(self)); retrains when the index has doubled"""
+        if self.mean is None:
+            return self.fit(vectors)
+        start = len(self.vectors)
+        points = self._standardize(np.asarray(vectors, dtype='float64'))
+        self.vectors = np.vstack([self.vectors, points])
+        if len(self.vectors) >= 2 * self._trained_size:
+            self._train()
+        else:
+            for offset, assigned in enumerate(_nearest(points, self.centroids)):
+                self.lists[assigned] = np.append(self.lists[assigned], start + offset)
+        return self
+
+    def query(self, vector, k=10):
+        """(ids, distances) of the k nearest vectors, closest first"""
+        point = self._standardize(np.asarray(vector, dtype='float64')[None, :])[0]
+        to_centroids = ((self.centroids - point) ** 2).sum(1)
+        probe = np.argsort(to_centroids)[:self.nprobe]
+        candidates = np.concatenate([self.lists[i] for i in probe])
+        if len(candidates) < k:
+            candidates = np.arange(len(self.vectors))
+        distances = ((self.vectors[candidates] - point) ** 2).sum(1)
+        top = np.argpartition(distances, k)[:k] if len(distances) > k else np.arange(len(distances))
+        best = top[np.argsort(distances[top])]
+        return candidates[best], np.sqrt(distances[best])
+
+    def save(self, path):
+        """Persist the vectors, centroids and parameters as columnar tables"""
+        assigned = np.empty(len(self.vectors), dtype=np.int32)
+        for list_id, ids in enumerate(self.lists):
+            assigned[ids] = list_id
+        write_table(os.path.join(path, 'vectors'), {**_vector_columns(self.vectors), 'LIST': assigned})
+        write_table(os.path.join(path, 'centroids'), _vector_columns(self.centroids), metadata={
+            'n_lists': self.n_lists, 'nprobe': self.nprobe, 'iterations': self.iterations, 'seed': self.seed,
+            'mean': self.mean.tolist(), 'scale': self.scale.tolist(), 'trained_size': self._trained_size,
+        })
+
+    @classmethod
+    def load(cls, path):
+        """Restore an index saved with save(), or None if nothing was saved"""
+        schema = read_schema(os.path.join(path, 'centroids'))
+        if schema is None or read_schema(os.path.join(path, 'vectors')) is None:
+            return None
+        meta = schema['metadata']
+        index = cls(meta['n_lists'], meta['nprobe'], meta['iterations'], meta['seed'])
+        index.mean, index.scale = np.asarray(meta['mean']), np.asarray(meta['scale'])
+        centroids = read_table(os.path.join(path, 'centroids'), mmap=False)
+        index.centroids = np.column_stack([centroids[f'V{i}'] for i in range(len(centroids))])
+        vectors = read_table(os.path.join(path, 'vectors'), mmap=False)
+        assigned = vectors.pop('LIST')
+        index.vectors = np.column_stack([vectors[f'V{i}'] for i in range(len(vectors))])
+        index.lists = [np.flatnonzero(assigned == i) for i in range(len(index.centroids))]
+        index._trained_size = meta['trained_size']
+        return index
+
+    def _standardize(self, vectors):
+        return ((vectors - self.mean) / self.scale).astype('float32')
+
+    def _train(self):
+        """k-means centroids (a few Lloyd iterations) and the inverted lists"""
+        points = self.vectors
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(points))))
+        n_lists = min(n_lists, len(points))
+        rng = np.random.default_rng(self.seed)
+        centroids = points[rng.choice(len(points), n_lists, replace=False)].astype('float64')
+        for _ in range(self.iterations):
+            assigned = _nearest(points, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assigned, points)
+            counts = np.bincount(assigned, minlength=n_lists)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+        self.centroids = centroids.astype('float32')
+        assigned = _nearest(points, self.centroids)
+        order = np.argsort(assigned, kind='stable')
+        bounds = np.searchsorted(assigned[order], np.arange(n_lists + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(n_lists)]
+        self._trained_size = len(points)
+
+
+class SimilarMatchups:
+    """Historical games searchable by pre-game profile, kept in step with the feature store"""
+
+    def __init__(self, store, index=None):
+        self.store = store
+        self.index = index or MatchupIndex()
+        self.games = pd.DataFrame()
+
+    def update(self, games):
+        """Index games not seen yet (call after FeatureStore.update with the same games)"""
+        rows = pregame_features(self.store, games)
+        if len(self.games):
+            rows = rows[~rows['GAME_ID'].isin(set(self.games['GAME_ID']))]
+        if rows.empty:
+            return 0
+        self.index.add(rows[FEATURE_NAMES].to_numpy(dtype='float64'))
+        keep = ['GAME_ID', 'GAME_DATE', 'HOME_ID', 'AWAY_ID', 'HOME_PTS', 'AWAY_PTS'] + FEATURE_NAMES
+        self.games = pd.concat([self.games, rows[keep]], ignore_index=True) if len(self.games) else rows[keep]
+        return len(rows)
+
+    def save(self, root=DEFAULT_INDEX_DIR, version=None):
+        """Persist the indexed games and the index; version records what they were built from"""
+        if self.games.empty:
+            return
+        write_table(os.path.join(root, 'games'), {name: self.games[name] for name in self.games.columns},
+                    metadata={'version': version})
+        self.index.save(os.path.join(root, 'index'))
+
+    @classmethod
+    def load(cls, store, root=DEFAULT_INDEX_DIR, version=None):
+        """Saved matchups over store, or None if nothing was saved or it was built from another version"""
+        schema = read_schema(os.path.join(root, 'games'))
+        if schema is None or (version is not None and schema['metadata'].get('version') != version):
+            return None
+        index = MatchupIndex.load(os.path.join(root, 'index'))
+        if index is None:
+            return None
+        matchups = cls(store, index)
+        matchups.games = read_frame(os.path.join(root, 'games'), mmap=False)
+        matchups.games['GAME_DATE'] = matchups.games['GAME_DATE'].astype('datetime64[ns]')
+        return matchups
+
+    def similar(self, inputs, k=10, before=None):
+        """Top-k past games for prediction inputs; adds HOME_WON, MARGIN and DISTANCE
+
+        before (a date) keeps only games played earlier - what a backtest of that date may see.
+        """
+        vector = stats_vector(**inputs)
+        fetch = k
+        while True:
+            ids, distances = self.index.query(vector, fetch)
+            if before is not None:
+                keep = (self.games['GAME_DATE'].to_numpy()[ids] < np.datetime64(pd.Timestamp(before)))
+                ids, distances = ids[keep], distances[keep]
+            if len(ids) >= k or fetch >= len(self.index):
+                break
+            fetch *= 4
+        ids, distances = ids[:k], distances[:k]
+        result = self.games.iloc[ids].copy()
+        result['HOME_WON'] = result['HOME_PTS'] > result['AWAY_PTS']
+        result['MARGIN'] = result['HOME_PTS'] - result['AWAY_PTS']
+        result['DISTANCE'] = distances
+        return result.reset_index(drop=True)
+
+
+def outcome_summary(similar):
+    """Outcome summary of a similar-games frame"""
+    return {
+        'games': len(similar),
+        'home_win_pct': round(100 * float(similar['HOME_WON'].mean()), 1) if len(similar) else None,
+        'avg_margin': round(float(similar['MARGIN'].mean()), 1) if len(similar) else None,
+    }
+
+
+def main(argv=None):
+    """Print the most similar past games for a matchup as of today"""
+    argv = sys.argv[1:] if argv is None else argv
+    positional = [arg for i, arg in enumerate(argv) if not arg.startswith('--') and (i == 0 or argv[i - 1] != '--k')]
+    if len(positional) < 2:
+        print("Usage: python -m src.similarity HomeTeam AwayTeam [--k 10]")
+        return
+    k = int(argv[argv.index('--k') + 1]) if '--k' in argv else 10
+    from feature_store import FeatureStore
+    from warehouse import HistoricalWarehouse, resolve_team_id
+
+    store = FeatureStore.load()
+    if store is None:
+        print("🧮 No feature store yet - run: python -m src.feature_store build")
+        return
+    warehouse = HistoricalWarehouse()
+    version = warehouse.manifest_version('team_games')
+    matchups = SimilarMatchups.load(store, version=version)
+    if matchups is None:
+        print("🧭 Building the matchup index (none saved for the current warehouse)...")
+        matchups = SimilarMatchups(store)
+        matchups.update(warehouse.load('team_games'))
+        matchups.save(version=version)
+    home_id, away_id = resolve_team_id(positional[0]), resolve_team_id(positional[1])
+    inputs = store.prediction_inputs(home_id, away_id, date.today())
+    if inputs is None:
+        print("⚠️  No stored features for one of the teams")
+        return
+
+    similar = matchups.similar(inputs, k)
+    summary = outcome_summary(similar)
+    print(f"\n🔎 {k} most similar past games to {inputs['away_team_stats']['team_name']} @ "
+          f"{inputs['home_team_stats']['team_name']} (of {len(matchups.games)} indexed):")
+    for row in similar.itertuples(index=False):
+        print(f"   {row.GAME_DATE:%Y-%m-%d}  {store._names.get(row.AWAY_ID, row.AWAY_ID)} @ "
+              f"{store._names.get(row.HOME_ID, row.HOME_ID)}  {row.AWAY_PTS}-{row.HOME_PTS}  "
+              f"(distance {row.DISTANCE:.2f})")
+    print(f"\n   Home team won {summary['home_win_pct']}% of them, average margin {summary['avg_margin']:+.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Local multi-season warehouse of league game logs for backtests
+Team and player game logs are stored per season and team as columnar tables
+(see columnar.py), so reads only open the partitions and columns they need:
+
+    data/warehouse/team_games/season=2019-20/team=1610612747/PTS.npy ...
+    data/warehouse/player_games/season=2019-20/team=1610612747/...
+
+Usage:
+    python -m src.warehouse ingest --seasons 10     # last ten seasons, team + player logs
+    python -m src.warehouse ingest --seasons 10 --no-players
+    python -m src.warehouse info
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+from nba_api.stats.static import teams
+sys.path.insert(0, os.path.dirname(__file__))
+from columnar import write_table, read_schema, read_frame, column_range
+from endpoints import EndpointClient, CURRENT_SEASON, recent_seasons
+
+DEFAULT_WAREHOUSE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'data', 'warehouse')
+
+DATASETS = ('team_games', 'player_games')
+
+
+def resolve_team_id(team):
+    """Team id from an id, abbreviation ('LAL') or name ('Lakers')"""
+    if isinstance(team, (int, np.integer)) or str(team).isdigit():
+        return int(team)
+    name = str(team).lower()
+    all_teams = teams.get_teams()
+    for t in all_teams:
+        if t['abbreviation'].lower() == name:
+            return t['id']
+    for t in all_teams:
+        if name in t['full_name'].lower() or name in t['nickname'].lower():
+            return t['id']
+    raise ValueError(f"Unknown team: {team}")
+
+
+def _partition_value(directory, key):
+    """'season=2019-20' -> '2019-20' (None for anything else)"""
+    prefix = key + '='
+    return directory[len(prefix):] if directory.startswith(prefix) else None
+
+
+class HistoricalWarehouse:
+    """Partitioned, memory-mapped store of league game logs"""
+
+    def __init__(self, root=DEFAULT_WAREHOUSE_DIR, client=None):
+        self.root = root
+        self.client = client or EndpointClient()
+
+    def ingest(self, seasons, season_type='Regular Season', players=True, refresh=False, verbose=False):
+        """Fetch and store whole seasons; finished seasons already stored are skipped"""
+        summary = {}
+        for season in seasons:
+            if not refresh and season != CURRENT_SEASON and self.has_season('team_games', season) \
+                    and (not players or self.has_season('player_games', season)):
+                if verbose:
+                    print(f"   ⏭️  {season} already in warehouse")
+                continue
+            counts = {'team_games': self.write_season('team_games', season,
+                                                      self.client.league_games(season, season_type))}
+            if players:
+                counts['player_games'] = self.write_season('player_games', season,
+                                                           self.client.league_player_logs(season, season_type))
+            summary[season] = counts
+            if verbose:
+                print(f"   ✅ {season}: " + ", ".join(f"{n} {k} rows" for k, n in counts.items()))
+        return summary
+
+    def write_season(self, dataset, season, frame):
+        """Replace one season of a dataset, split into one table per team; returns rows written"""
+        if dataset not in DATASETS:
+            raise ValueError(f"Unknown dataset: {dataset}")
+        if frame is None or frame.empty:
+            return 0
+        season_dir = os.path.join(self.root, dataset, f"season={season}")
+        # Write the new season next to the old one, then swap it in
+        staging_dir = season_dir + '.staging'
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        for team_id, games in frame.groupby('TEAM_ID', sort=True, observed=True):
+            games = games.sort_values('GAME_DATE')
+            write_table(os.path.join(staging_dir, f"team={int(team_id)}"),
+                        {name: games[name] for name in games.columns},
+                        metadata={'dataset': dataset, 'season': season, 'team_id': int(team_id)})
+        shutil.rmtree(season_dir, ignore_errors=True)
+        os.replace(staging_dir, season_dir)
+        return len(frame)
+
+    def seasons(self, dataset='team_games'):
+        """Seasons stored for a dataset, oldest first"""
+        dataset_dir = os.path.join(self.root, dataset)
+        if not os.path.isdir(dataset_dir):
+            return []
+        return sorted(s for s in (_partition_value(d, 'season') for d in os.listdir(dataset_dir)) if s)
+
+    def has_season(self, dataset, season):
+        return season in self.seasons(dataset)
+
+    def partitions(self, dataset='team_games', teams=None, seasons=None):
+        """Table directories matching the team/season predicates (pruned by path only)"""
+        team_ids = {resolve_team_id(t) for t in teams} if teams is not None else None
+        paths = []
+        for season in self.seasons(dataset):
+            if seasons is not None and season not in seasons:
+                continue
+            season_dir = os.path.join(self.root, dataset, f"season={season}")
+            for directory in sorted(os.listdir(season_dir)):
+                team_id = _partition_value(directory, 'team')
+                if team_id is None or (team_ids is not None and int(team_id) not in team_ids):
+                    continue
+                paths.append(os.path.join(season_dir, directory))
+        return paths
+
+    def load(self, dataset='team_games', teams=None, seasons=None, date_from=None, date_to=None,
+             columns=None):
+        """Load game logs, reading only the partitions and columns the predicates need
+
+        teams/seasons prune partition directories, date_from/date_to skip tables whose
+        GAME_DATE range (from the manifest) is outside the window, and columns limits
+        which column files are memory-mapped. Rows come back newest first like the API.
+        """
+        date_from = np.datetime64(pd.Timestamp(date_from)) if date_from is not None else None
+        date_to = np.datetime64(pd.Timestamp(date_to)) if date_to is not None else None
+        read_columns = None
+        if columns is not None:
+            read_columns = list(columns) + (['GAME_DATE'] if 'GAME_DATE' not in columns else [])
+
+        frames = []
+        for path in self.partitions(dataset, teams, seasons):
+            schema = read_schema(path)
+            if schema is None:
+                continue
+            date_range = column_range(schema, 'GAME_DATE')
+            if date_range is not None:
+                low, high = np.datetime64(date_range[0]), np.datetime64(date_range[1])
+                if (date_from is not None and high < date_from) or (date_to is not None and low > date_to):
+                    continue
+            frame = read_frame(path, read_columns)
+            if date_from is not None or date_to is not None:
+                dates = frame['GAME_DATE'].to_numpy()
+                mask = np.ones(len(frame), dtype=bool)
+                if date_from is not None:
+                    mask &= dates >= date_from
+                if date_to is not None:
+                    mask &= dates <= date_to
+                frame = frame[mask]
+            frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame(columns=columns or [])
+        games = pd.concat(frames, ignore_index=True)
+        # Partitions carry their own categories; concat falls back to object, so re-categorize
+        for name in games.columns:
+            if any(isinstance(f[name].dtype, pd.CategoricalDtype) for f in frames if name in f):
+                games[name] = games[name].astype('category')
+        games = games.sort_values('GAME_DATE', ascending=False, kind='stable').reset_index(drop=True)
+        return games[list(columns)] if columns is not None else games
+
+    def manifest_version(self, dataset='team_games'):
+        """Fingerprint of a dataset's partition manifests; changes when any partition is rewritten"""
+        digest = hashlib.sha1()
+        for path in self.partitions(dataset):
+            digest.update(os.path.relpath(path, self.root).encode())
+            digest.update(json.dumps(read_schema(path), sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def info(self):
+        """Rows and partitions stored per dataset and season"""
+        info = {}
+        for dataset in DATASETS:
+            for season in self.seasons(dataset):
+                paths = self.partitions(dataset, seasons=[season])
+                rows = sum((read_schema(p) or {}).get('rows', 0) for p in paths)
+                info.setdefault(dataset, {})[season] = {'partitions': len(paths), 'rows': rows}
+        return info
+
+
+def main(argv=None):
+    """Warehouse command line"""
+    argv = sys.argv[1:] if argv is None else argv
+    warehouse = HistoricalWarehouse()
+    command = argv[0] if argv else 'info'
+
+    if command == 'ingest':
+        count = int(argv[argv.index('--seasons') + 1]) if '--seasons' in argv else 10
+        seasons = recent_seasons(count)
+        print(f"📦 Ingesting {len(seasons)} seasons ({seasons[0]} to {seasons[-1]}) into {warehouse.root}")
+        warehouse.ingest(seasons, players='--no-players' not in argv,
+                         refresh='--refresh' in argv, verbose=True)
+    elif command == 'info':
+        info = warehouse.info()
+        if not info:
+            print(f"📦 Warehouse at {warehouse.root} is empty - run: python -m src.warehouse ingest")
+        for dataset, seasons in info.items():
+            print(f"\n📦 {dataset}")
+            for season, details in seasons.items():
+                print(f"   {season}: {details['rows']:>7} rows in {details['partitions']} team partitions")
+    else:
+        print("Usage: python -m src.warehouse [ingest [--seasons N] [--no-players] [--refresh] | info]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Offline NBA data shared by the tests
+league_frame() builds a league-wide game table (two paired rows per game) for the
+feature store, ratings, efficiency, similarity and warehouse tests. SyntheticClient is a real EndpointClient - frame cache, single-flight, retries and the
+rate limiter all run - whose fetches are answered from generated game logs. Every fetch
+is counted per endpoint, and the limiter runs on a virtual clock so its sleeps are
+measured instead of slept.
+"""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from nba_api.stats.static import teams
+
+from src.endpoints import CURRENT_SEASON, EndpointClient, RateLimiter
+from src.frames import normalize_game_frame
+from src.retry import RetryPolicy
+
+TEAMS = {t['id']: t for t in teams.get_teams()}
+ABBREVIATIONS = sorted(t['abbreviation'] for t in TEAMS.values())
+LAKERS = 1610612747
+
+
+def team_games(team_id, n=40):
+    """One season of a team's games (newest first) against a rotating set of opponents"""
+    rng = np.random.default_rng(team_id % 1000)
+    abbr = TEAMS[team_id]['abbreviation']
+    opponents = [a for a in ABBREVIATIONS if a != abbr]
+    return pd.DataFrame({
+        'SEASON_ID': '22024', 'TEAM_ID': team_id, 'TEAM_ABBREVIATION': abbr,
+        'TEAM_NAME': TEAMS[team_id]['full_name'],
+        'GAME_ID': [f'0022{team_id % 1000:03d}{i:03d}' for i in range(n)],
+        'GAME_DATE': pd.date_range('2025-01-01', periods=n, freq='2D')[::-1].strftime('%Y-%m-%d'),
+        'MATCHUP': [f'{abbr} vs. {opponents[i % len(opponents)]}' if i % 2
+                    else f'{abbr} @ {opponents[i % len(opponents)]}' for i in range(n)],
+        'WL': rng.choice(['W', 'L'], n), 'MIN': 240, 'PTS': rng.integers(95, 130, n),
+        'FGM': 40, 'FGA': rng.integers(80, 95, n), 'FG_PCT': rng.uniform(0.4, 0.5, n),
+        'FG3M': 12, 'FG3A': 35, 'FG3_PCT': rng.uniform(0.3, 0.4, n), 'FTM': 18,
+        'FTA': rng.integers(15, 30, n), 'FT_PCT': 0.8, 'OREB': rng.integers(6, 14, n), 'DREB': 34,
+        'REB': 44, 'AST': 25, 'STL': 7, 'BLK': 5, 'TOV': rng.integers(9, 18, n), 'PF': 19,
+        'PLUS_MINUS': rng.integers(-15, 15, n).astype(float),
+    })
+
+
+def league_frame(n_games=90, n_teams=6, seed=5, season='2024-25', start='2025-01-01', games_per_day=3,
+                 team_ids=None, strength=0):
+    """Home and away rows per game, like a normalized league-wide LeagueGameFinder frame
+
+    Teams are team_ids (default 1..n_teams). With strength, every place earlier in that
+    list is worth that many points a game, so the first teams are the strongest.
+    """
+    rng = np.random.default_rng(seed)
+    team_ids = list(team_ids) if team_ids is not None else list(range(1, n_teams + 1))
+    year = season[:4]
+    rows = []
+    for game in range(n_games):
+        home, away = (int(i) for i in rng.choice(len(team_ids), 2, replace=False))
+        date = (pd.Timestamp(start) + pd.Timedelta(days=game // games_per_day)).strftime('%Y-%m-%d')
+        points = {i: int(rng.integers(95, 130)) + strength * (len(team_ids) - i) for i in (home, away)}
+        if points[home] == points[away]:
+            points[home] += 1
+        names = {i: TEAMS[team_ids[i]]['abbreviation'] if team_ids[i] in TEAMS else f'T{team_ids[i]}'
+                 for i in (home, away)}
+        for team, opponent, matchup in ((home, away, f'{names[home]} vs. {names[away]}'),
+                                        (away, home, f'{names[away]} @ {names[home]}')):
+            rows.append({'SEASON_ID': f'2{year}', 'GAME_ID': f'00{year[2:]}{game:06d}', 'TEAM_ID': team_ids[team],
+                         'TEAM_ABBREVIATION': names[team], 'GAME_DATE': date, 'MATCHUP': matchup,
+                         'WL': 'W' if points[team] > points[opponent] else 'L', 'MIN': 240, 'PTS': points[team],
+                         'FGA': int(rng.integers(80, 95)), 'FG_PCT': float(rng.uniform(0.4, 0.5)),
+                         'FG3_PCT': float(rng.uniform(0.3, 0.4)), 'FTA': int(rng.integers(15, 30)),
+                         'OREB': int(rng.integers(6, 14)), 'TOV': int(rng.integers(9, 18)),
+                         'PLUS_MINUS': points[team] - points[opponent]})
+    return normalize_game_frame(pd.DataFrame(rows))
+
+
+class SyntheticClient(EndpointClient):
+    """EndpointClient answering every endpoint from team_games(); calls counts fetches per endpoint"""
+
+    SLATE = [('Lakers', 'Warriors'), ('Celtics', 'Heat'), ('Bucks', 'Pacers')]
+
+    def __init__(self, games_per_team=40):
+        self.now = 0.0
+        self.slept = 0.0
+        super().__init__(rate_limiter=RateLimiter(clock=lambda: self.now, sleep=self._sleep),
+                         retry_policy=RetryPolicy(sleep=self._sleep))
+        self.games_per_team = games_per_team
+        self.calls = Counter()
+
+    def _sleep(self, seconds):
+        self.slept += seconds
+        self.now += seconds
+
+    def _team_games(self, team_id):
+        return team_games(team_id, self.games_per_team)
+
+    def _fetch(self, endpoint, build):
+        def fetch():
+            self.calls[endpoint] += 1
+            return build()
+        return fetch
+
+    def league_game_finder(self, team_id, season, season_type='Regular Season', ttl=None, refresh=False):
+        build = lambda: normalize_game_frame(self._team_games(team_id))
+        return self._cached(('leaguegamefinder', team_id, season, season_type),
+                            self._fetch('LeagueGameFinder', build), ttl=ttl, refresh=refresh)
+
+    def league_games(self, season, season_type='Regular Season', cache=False):
+        build = lambda: normalize_game_frame(pd.concat([self._team_games(t) for t in TEAMS], ignore_index=True))
+        return self._cached(('leaguegames', season, season_type),
+                            self._fetch('LeagueGameFinder(league)', build), store=cache)
+
+    def player_game_log(self, player_id, season, season_type='Regular Season', ttl=None, refresh=False):
+        build = lambda: normalize_game_frame(self._team_games(LAKERS).assign(PLAYER_ID=player_id))
+        return self._cached(('playergamelog', player_id, season, season_type), self._fetch('PlayerGameLog', build),
+                            ttl=ttl, refresh=refresh)
+
+    def team_roster(self, team_id, season=CURRENT_SEASON, ttl=None, refresh=False):
+        build = lambda: pd.DataFrame({'PLAYER_ID': [2544, 201939], 'PLAYER': ['LeBron James', 'Stephen Curry']})
+        return self._cached(('commonteamroster', team_id, season), self._fetch('CommonTeamRoster', build),
+                            ttl=ttl, refresh=refresh)
+
+    def scoreboard_games(self):
+        def build():
+            return [{'gameId': str(i), 'gameStatusText': '7:30 pm ET',
+                     'homeTeam': {'teamName': home, 'teamCity': '', 'score': 0},
+                     'awayTeam': {'teamName': away, 'teamCity': '', 'score': 0}}
+                    for i, (home, away) in enumerate(self.SLATE)]
+        return self._cached(('scoreboard',), self._fetch('ScoreBoard', build), ttl=self.scoreboard_ttl,
+                            throttle=False)
@@ -0,0 +1,76 @@
+"""
+Tests for batch matchup files
+Runs offline against the synthetic backend in tests/fakes.py
+"""
+
+import json
+
+from src.advanced_enhanced_predictor import SuperPredictor
+from src.batch import BatchRunner, load_matchups, results_table, write_results
+from tests.fakes import SyntheticClient
+
+
+def test_csv_and_json_inputs_load_the_same_matchups(tmp_path):
+    csv_path = tmp_path / 'scenarios.csv'
+    csv_path.write_text("home_team,away_team,home_out,away_out\n"
+                        "Celtics,Knicks,,Jalen Brunson:high\n"
+                        "Nuggets,Lakers,Jamal Murray;Aaron Gordon:low,\n")
+    json_path = tmp_path / 'scenarios.json'
+    json_path.write_text(json.dumps([
+        {'home_team': 'Celtics', 'away_team': 'Knicks', 'away_out': ['Jalen Brunson:high']},
+        {'home_team': 'Nuggets', 'away_team': 'Lakers',
+         'key_players_status': {'home': [{'name': 'Jamal Murray', 'playing': False, 'impact': 'medium'},
+                                         {'name': 'Aaron Gordon', 'playing': False, 'impact': 'low'}],
+                                'away': []}},
+    ]))
+
+    from_csv, from_json = load_matchups(str(csv_path)), load_matchups(str(json_path))
+    assert from_csv == from_json
+    assert from_csv[0]['key_players_status']['away'] == [{'name': 'Jalen Brunson', 'playing': False,
+                                                          'impact': 'high'}]
+
+
+def test_json_player_status_is_normalized_like_the_csv_columns(tmp_path):
+    json_path = tmp_path / 'scenarios.json'
+    json_path.write_text(json.dumps([
+        {'home_team': 'Celtics', 'away_team': 'Knicks',
+         'key_players_status': {'home': [{'name': 'Jayson Tatum'}, 'Jrue Holiday:low'], 'away': 'Jalen Brunson'}},
+    ]))
+
+    games = load_matchups(str(json_path))
+    assert games[0]['key_players_status'] == {
+        'home': [{'name': 'Jayson Tatum', 'playing': False, 'impact': 'medium'},
+                 {'name': 'Jrue Holiday', 'playing': False, 'impact': 'low'}],
+        'away': [{'name': 'Jalen Brunson', 'playing': False, 'impact': 'medium'}],
+    }
+    table = results_table(games, [{'prediction': {'favored_team': 'Celtics'}, 'home_team': 'Celtics',
+                                   'away_team': 'Knicks'}])
+    assert table['players_out'][0] == 'home: Jayson Tatum; home: Jrue Holiday; away: Jalen Brunson'
+
+
+def test_batch_fetches_each_team_once_and_keeps_input_order(tmp_path):
+    games = [{'game_id': str(i), 'home_team': home, 'away_team': away, 'key_players_status': None}
+             for i, (home, away) in enumerate([('Celtics', 'Knicks'), ('Knicks', 'Celtics'), ('Lakers', 'Celtics'),
+                                               ('Nuggets', 'Nowhere'), ('Lakers', 'Knicks')])]
+    games[4]['key_players_status'] = {'home': [{'name': 'LeBron James', 'playing': False, 'impact': 'high'}]}
+    client = SyntheticClient()
+    runner = BatchRunner(SuperPredictor(client=client), workers=3)
+
+    results = runner.run(games)
+
+    # Four real teams plus one league-wide table, however many matchups use them
+    assert runner.summary['teams'] == 4
+    assert client.stats()['requests'] == 5
+    assert [r.get('game_id', r.get('game', {}).get('game_id')) for r in results] == ['0', '1', '2', '3', '4']
+    assert 'error' in results[3] and runner.summary['errors'] == 1
+
+    table = results_table(games, results)
+    assert list(table['home_team']) == [game['home_team'] for game in games]
+    assert list(table['home_team_name']) == ['Boston Celtics', 'New York Knicks', 'Los Angeles Lakers', '',
+                                             'Los Angeles Lakers']
+    assert table.loc[4, 'players_out'] == 'home: LeBron James'
+    baseline = runner.run([{**games[4], 'key_players_status': None}])
+    assert table.loc[4, 'home_win_probability'] < baseline[0]['prediction']['home_win_probability']
+
+    write_results(table, str(tmp_path / 'out.csv'))
+    assert (tmp_path / 'out.csv').read_text().count('\n') == 6
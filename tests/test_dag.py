@@ -0,0 +1,98 @@
+"""
+Tests for the declarative analysis DAG
+The matchup test runs offline on the synthetic league in tests/fakes.py
+"""
+
+import io
+import threading
+from collections import Counter
+from contextlib import redirect_stdout
+
+from src.advanced_enhanced_predictor import SuperPredictor
+from src.dag import AnalysisDAG, Step
+from tests.fakes import SyntheticClient
+
+
+def _toy_dag(calls, barrier):
+    def stats_step(name, side):
+        def run(analyzer, context, inputs):
+            calls[context[side]] += 1
+            barrier.wait(timeout=5)  # every team's stats must be in flight at once
+            return len(context[side])
+        return Step(name, (), run, key=lambda context: ('stats', context[side]))
+
+    def unused(analyzer, context, inputs):
+        calls['unused'] += 1
+
+    return AnalysisDAG([
+        stats_step('home', 'home'),
+        stats_step('away', 'away'),
+        Step('unused', (), unused),
+        Step('diff', ('home', 'away'), lambda analyzer, context, inputs: inputs['home'] - inputs['away']),
+    ])
+
+
+def test_runs_only_needed_steps_concurrently_and_shares_keyed_steps():
+    calls = Counter()
+    # Three distinct teams, three barrier parties: the run hangs unless they execute concurrently
+    dag = _toy_dag(calls, threading.Barrier(3))
+    assert dag.required(['diff']) == ['home', 'away', 'diff']
+
+    contexts = [{'home': 'Lakers', 'away': 'Heat', 'key': (1,)}, {'home': 'Lakers', 'away': 'Jazz', 'key': (2,)}]
+    results = dag.run(contexts, ['diff'], analyzer=None, workers=3)
+
+    assert [r['diff'] for r in results] == [2, 2]
+    assert calls == {'Lakers': 1, 'Heat': 1, 'Jazz': 1}
+
+
+def test_parallel_step_output_is_replayed_in_declaration_order():
+    finished = threading.Event()
+
+    def noisy(name, wait_for=None):
+        def run(analyzer, context, inputs):
+            if wait_for is not None:
+                wait_for.wait(timeout=5)  # 'first' only finishes after 'second' has printed
+            print(f"{name}: fetching")
+            print(f"{name}: done")
+            if wait_for is None:
+                finished.set()
+            return name
+        return Step(name, (), run)
+
+    dag = AnalysisDAG([noisy('first', finished), noisy('second'),
+                       Step('both', ('first', 'second'), lambda a, c, i: print('both: done'))])
+    outputs = {}
+    for workers in (1, 3):
+        # In order there is nothing to wait for; on the pool 'first' is held back
+        if workers == 1:
+            finished.set()
+        else:
+            finished.clear()
+        with redirect_stdout(io.StringIO()) as output:
+            dag.run([{'key': ()}], ['both'], analyzer=None, workers=workers)
+        outputs[workers] = output.getvalue()
+
+    assert outputs[3] == outputs[1] == ("first: fetching\nfirst: done\nsecond: fetching\nsecond: done\n"
+                                        "both: done\n")
+
+
+def test_batch_matchups_share_team_steps_and_match_single_analysis():
+    predictor = SuperPredictor(client=SyntheticClient())
+    with redirect_stdout(io.StringIO()):
+        single = predictor.comprehensive_matchup_analysis('Lakers', 'Warriors')
+        predictor.predictor.cache.invalidate()
+        fetched = Counter()
+        original = predictor.get_team_recent_performance
+
+        def counted(team_name, **kwargs):
+            fetched[team_name] += 1
+            return original(team_name, **kwargs)
+        predictor.get_team_recent_performance = counted
+        batch = predictor.analyze_matchups([('Lakers', 'Warriors'), ('Lakers', 'Celtics'), ('Heat', 'Lakers')])
+
+    assert fetched == {'Lakers': 1, 'Warriors': 1, 'Celtics': 1, 'Heat': 1}
+    lakers_warriors = batch[('Lakers', 'Warriors')]
+    assert lakers_warriors['prediction']['home_win_probability'] == single['prediction']['home_win_probability']
+    assert lakers_warriors['insights'] == predictor.analyze_matchups([('Lakers', 'Warriors')])[(
+        'Lakers', 'Warriors')]['insights']
+    assert ('matchup', 'Heat', 'Lakers') in predictor.dependencies.nodes('matchup')
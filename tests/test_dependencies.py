@@ -0,0 +1,179 @@
+"""
+Tests for dependency-tracked invalidation
+Runs offline on the synthetic league in tests/fakes.py
+"""
+
+import io
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+from src.advanced_enhanced_predictor import SuperPredictor
+from src.dependencies import DependencyGraph
+from src.endpoints import CURRENT_SEASON
+from tests.fakes import SyntheticClient
+
+
+def test_graph_records_nested_inputs_and_invalidates_dependents_only():
+    graph = DependencyGraph()
+    dropped = []
+    graph.on_invalidate('frame', dropped.append)
+    with graph.track(('matchup', 'A', 'B')):
+        with graph.track(('feature', 'form', 'A')):
+            graph.touch(('frame', 'A'))
+        with graph.track(('feature', 'form', 'B')):
+            graph.touch(('frame', 'B'))
+    with graph.track(('matchup', 'C', 'D')):
+        with graph.track(('feature', 'form', 'C')):
+            graph.touch(('frame', 'C'))
+
+    affected = graph.invalidate([('frame', 'A')])
+    assert affected == {('feature', 'form', 'A'), ('matchup', 'A', 'B')}
+    assert dropped == [('frame', 'A')]
+    # Invalidated nodes forget their inputs until they are recomputed
+    assert graph.dependencies(('matchup', 'A', 'B')) == set()
+    assert graph.affected([('frame', 'B')]) == {('feature', 'form', 'B')}
+    assert graph.affected([('frame', 'C')]) == {('feature', 'form', 'C'), ('matchup', 'C', 'D')}
+
+
+def test_forget_drops_a_node_but_keeps_invalidation_paths():
+    graph = DependencyGraph()
+    with graph.track(('matchup', 'A', 'B')):
+        with graph.track(('prediction', 'k')):
+            graph.touch(('feature', 'form', 'A'))
+            graph.touch(('weights', 'w1'))
+
+    graph.forget(('prediction', 'k'))
+    assert ('prediction', 'k') not in graph.nodes()
+    assert graph.dependencies(('matchup', 'A', 'B')) == {('feature', 'form', 'A'), ('weights', 'w1')}
+    assert graph.affected([('weights', 'w1')]) == {('matchup', 'A', 'B')}
+
+    # Invalidated nodes leave the graph entirely; inputs nothing else uses go with them
+    assert graph.invalidate([('feature', 'form', 'A')]) == {('matchup', 'A', 'B')}
+    assert len(graph) == 0 and graph.stats()['edges'] == 0
+
+
+class _NightlyClient(SyntheticClient):
+    """Synthetic league where teams can play one more game"""
+
+    def __init__(self):
+        super().__init__()
+        self.extra_games = {}
+
+    def play(self, team_id):
+        self.extra_games[team_id] = self.extra_games.get(team_id, 0) + 1
+
+    def _team_games(self, team_id):
+        games = super()._team_games(team_id)
+        extra = self.extra_games.get(team_id, 0)
+        if not extra:
+            return games
+        latest = pd.Timestamp(games['GAME_DATE'].iloc[0])
+        new = games.head(extra).copy()
+        new['GAME_ID'] = [f'0029{team_id % 1000:03d}{i:03d}' for i in range(extra)]
+        new['GAME_DATE'] = [(latest + pd.Timedelta(days=extra - i)).strftime('%Y-%m-%d') for i in range(extra)]
+        return pd.concat([new, games], ignore_index=True)
+
+
+def test_new_games_only_invalidate_matchups_of_teams_that_played():
+    client = _NightlyClient()
+    predictor = SuperPredictor(client=client)
+    matchups = [('Celtics', 'Knicks'), ('Lakers', 'Warriors'), ('Heat', 'Bulls')]
+    with redirect_stdout(io.StringIO()):
+        for home, away in matchups:
+            predictor.comprehensive_matchup_analysis(home, away)
+    assert len(predictor.predictor.cache) == 3
+    lakers = predictor.get_team_by_name('Lakers')['id']
+
+    client.play(lakers)
+    requests = client.request_count
+    summary = predictor.refresh_changed()
+    assert summary['changed_teams'] == [lakers]
+    assert summary['stale_matchups'] == [('Lakers', 'Warriors')]
+    assert summary['invalidated']['prediction'] == 1
+    assert len(predictor.predictor.cache) == 2
+    assert client.cached(('leaguegamefinder', lakers, CURRENT_SEASON, 'Regular Season')) is None
+    assert client.cached(('leaguegamefinder', predictor.get_team_by_name('Celtics')['id'], CURRENT_SEASON,
+                          'Regular Season')) is not None
+
+    with redirect_stdout(io.StringIO()):
+        results = predictor.recompute_stale()
+    assert list(results) == [('Lakers', 'Warriors')] and not predictor.stale_matchups
+    # The league table and the Lakers log are the only fetches
+    assert client.request_count - requests == 2
+    assert results[('Lakers', 'Warriors')]['home_team']['games_played'] == 10
+
+    # New weights invalidate every prediction made with the old ones
+    affected = predictor.predictor.update_weights(home_court=0.2)
+    assert {node for node in affected if node[0] == 'matchup'} == {('matchup',) + m for m in matchups}
+    assert len(predictor.predictor.cache) == 0
+
+
+def test_stale_matchups_are_recomputed_with_their_player_availability():
+    client = _NightlyClient()
+    predictor = SuperPredictor(client=client)
+    status = {'home': [{'name': 'LeBron James', 'playing': False, 'impact': 'high'}], 'away': []}
+    with redirect_stdout(io.StringIO()):
+        before = predictor.comprehensive_matchup_analysis('Lakers', 'Warriors', status)
+        predictor.comprehensive_matchup_analysis('Celtics', 'Knicks')
+
+    predictor.predictor.update_weights(home_court=0.2)
+    assert predictor.stale_matchups == {('matchup', 'Lakers', 'Warriors'), ('matchup', 'Celtics', 'Knicks')}
+    with redirect_stdout(io.StringIO()):
+        results = predictor.recompute_stale()
+        healthy = predictor.comprehensive_matchup_analysis('Lakers', 'Warriors')
+        expected = predictor.comprehensive_matchup_analysis('Lakers', 'Warriors', status)
+
+    recomputed = results[('Lakers', 'Warriors')]['prediction']['home_win_probability']
+    assert recomputed == expected['prediction']['home_win_probability']
+    assert recomputed != healthy['prediction']['home_win_probability']
+    assert recomputed != before['prediction']['home_win_probability']  # new weights did apply
+    assert predictor.matchup_status == {('matchup', 'Lakers', 'Warriors'): status}
+
+
+def test_player_logs_of_teams_that_played_are_dropped():
+    client = _NightlyClient()
+    predictor = SuperPredictor(client=client)
+    ids = {name: predictor.get_team_by_name(name)['id'] for name in ('Lakers', 'Warriors', 'Celtics')}
+    logs = [('playergamelog', player_id, CURRENT_SEASON, 'Regular Season') for player_id in (2544, 201939)]
+
+    def fetch_logs():
+        with redirect_stdout(io.StringIO()):
+            predictor.get_player_recent_stats('LeBron James')
+            predictor.get_player_recent_stats('Stephen Curry')
+    fetch_logs()
+    predictor.refresh_changed()
+
+    # Without a cached roster a player's team is read from the player's own log (the synthetic logs are Lakers games)
+    client.play(ids['Warriors'])
+    predictor.refresh_changed()
+    assert all(client.cached(log) is not None for log in logs)
+    client.play(ids['Lakers'])
+    predictor.refresh_changed()
+    assert all(client.cached(log) is None for log in logs)
+
+    # A cached roster ties both players to the Celtics
+    fetch_logs()
+    client.team_roster(ids['Celtics'], CURRENT_SEASON)
+    client.play(ids['Celtics'])
+    predictor.refresh_changed()
+    assert all(client.cached(log) is None for log in logs)
+
+
+def test_matchups_are_forgotten_with_their_evicted_prediction_or_failed_recompute():
+    predictor = SuperPredictor(client=SyntheticClient())
+    predictor.predictor.cache.maxsize = 2
+    status = {'home': [{'name': 'LeBron James', 'playing': False, 'impact': 'high'}], 'away': []}
+    with redirect_stdout(io.StringIO()):
+        predictor.comprehensive_matchup_analysis('Lakers', 'Warriors', status)
+        predictor.comprehensive_matchup_analysis('Celtics', 'Knicks')
+        predictor.comprehensive_matchup_analysis('Heat', 'Bulls')
+
+    assert predictor.dependencies.nodes('matchup') == {('matchup', 'Celtics', 'Knicks'), ('matchup', 'Heat', 'Bulls')}
+    assert predictor.matchup_status == {}
+
+    predictor.stale_matchups.add(('matchup', 'Nowhere', 'Bulls'))
+    with redirect_stdout(io.StringIO()):
+        assert predictor.recompute_stale() == {('Nowhere', 'Bulls'): None}
+    assert not predictor.stale_matchups
+    assert ('matchup', 'Nowhere', 'Bulls') not in predictor.dependencies.nodes()
@@ -0,0 +1,102 @@
+"""
+Tests for possession-based efficiency metrics
+Ratings are checked against hand computations on a paired synthetic league
+"""
+
+import numpy as np
+
+from src.efficiency import estimate_possessions, game_efficiency, rolling_efficiency, team_efficiency
+from src.prediction_model import AdvancedPredictor
+from tests.fakes import league_frame
+
+
+
+def test_game_ratings_use_both_teams_possessions():
+    games = league_frame(n_games=60, seed=11)
+    rated = game_efficiency(games)
+    first = rated[rated['GAME_ID'] == games['GAME_ID'].iloc[0]]
+    a, b = first.iloc[0], first.iloc[1]
+
+    poss = (estimate_possessions(a['FGA'], a['FTA'], a['OREB'], a['TOV'])
+            + estimate_possessions(b['FGA'], b['FTA'], b['OREB'], b['TOV'])) / 2
+    assert np.isclose(a['POSS'], poss) and np.isclose(b['POSS'], poss)
+    assert np.isclose(a['OFF_RTG'], 100 * a['PTS'] / poss)
+    assert np.isclose(a['DEF_RTG'], b['OFF_RTG'])
+    assert np.isclose(a['PACE'], poss)
+
+
+def test_rolling_windows_match_a_direct_computation():
+    games = league_frame(n_games=60, seed=11)
+    rolled = rolling_efficiency(games, windows=(5, 10))
+    rated = game_efficiency(games).sort_values(['TEAM_ID', 'GAME_DATE'], kind='stable')
+
+    for team_id, team_games in rated.groupby('TEAM_ID'):
+        last = team_games.tail(5)
+        expected = 100 * last['PTS'].sum() / last['POSS'].sum()
+        row = rolled[rolled['TEAM_ID'] == team_id].iloc[-1]
+        assert np.isclose(row['OFF_RTG_5'], expected)
+        assert row['GAMES_10'] == min(10, len(team_games))
+
+
+def test_team_efficiency_feeds_the_predictor():
+    games = league_frame(n_games=60, seed=11)
+    table = team_efficiency(games, window=10)
+    assert set(table) == set(games['TEAM_ID'])
+    league = next(iter(table.values()))['league_rating']
+    assert all(stats['league_rating'] == league and stats['games'] <= 10 for stats in table.values())
+
+    # Same points per possession at a faster pace scores the same offensive value
+    predictor = AdvancedPredictor()
+    team = {'win_percentage': 50, 'avg_points_scored': 100}
+    slow = {'off_rating': 115, 'def_rating': 110, 'pace': 95, 'league_rating': 112}
+    fast = {**slow, 'pace': 104}
+    assert predictor.calculate_team_score({**team, 'avg_points_scored': 120}, efficiency_stats=fast) == \
+        predictor.calculate_team_score(team, efficiency_stats=slow)
+
+
+def test_single_team_frames_fall_back_to_plus_minus():
+    games = league_frame(n_games=60, seed=11)
+    one_team = games[games['TEAM_ID'] == 1].copy()
+    one_team['PLUS_MINUS'] = 4
+    rated = game_efficiency(one_team)
+    assert np.allclose(rated['OPP_PTS'], rated['PTS'].astype(float) - 4)
+    assert rated['POSS'].notna().all()
+
+
+class _LeagueClient:
+    """Serves one league frame; swapping it stands in for a refetch"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.dependencies = None
+
+    def league_games(self, season, season_type='Regular Season', cache=False):
+        return self.frame
+
+    def invalidate(self, key):
+        pass
+
+
+def test_extractor_recomputes_ratings_for_a_refetched_league_frame():
+    from nba_api.stats.static import teams
+    from src.main import NBADataExtractor
+
+    games = league_frame(n_games=60, seed=11)
+    games['TEAM_ID'] = games['TEAM_ID'].astype('int64') + 1610612736  # real ids: Hawks, Celtics, ...
+    hawks = teams.find_team_name_by_id(1610612737)['full_name']
+    client = _LeagueClient(games)
+    extractor = NBADataExtractor(client=client)
+    first = extractor.get_team_efficiency_stats(hawks)
+    assert first == team_efficiency(games, window=10)[1610612737]
+    assert extractor.get_team_efficiency_stats(hawks, last_n_games=5) == team_efficiency(games, window=5)[1610612737]
+
+    # A new frame (even one that could reuse the old frame's id()) is never served the old table
+    refetched = games.copy()
+    refetched['PTS'] = refetched['PTS'] + 10
+    client.frame = refetched
+    assert extractor.get_team_efficiency_stats(hawks) == team_efficiency(refetched, window=10)[1610612737]
+    assert extractor.get_team_efficiency_stats(hawks) != first
+
+    # Invalidating the league frame drops the table (and the frame it holds)
+    extractor.dependencies.invalidate({('frame', 'leaguegames', '2024-25', 'Regular Season')})
+    assert extractor._efficiency_table is None
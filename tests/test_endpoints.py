@@ -0,0 +1,68 @@
+"""
+Tests for the EndpointClient request layer
+Runs offline - fetch functions are plain callables
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.endpoints import EndpointClient
+from src.retry import RetryPolicy
+
+
+def _slow_fetch(calls, result, delay=0.2):
+    def fetch():
+        calls.append(threading.current_thread().name)
+        time.sleep(delay)
+        return result
+    return fetch
+
+
+def test_concurrent_identical_requests_share_one_fetch():
+    client = EndpointClient(request_delay=0)
+    calls = []
+    frame = object()
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: client._cached(('lgf', 1, '2024-25'), _slow_fetch(calls, frame)),
+                                range(8)))
+
+    assert len(calls) == 1
+    assert all(result is frame for result in results)
+    assert client.stats()['requests'] == 1
+    assert client.stats()['coalesced'] + client.stats()['cache_hits'] == 7
+    assert client.stats()['in_flight'] == 0
+
+
+def test_different_keys_are_not_coalesced():
+    client = EndpointClient(request_delay=0)
+    calls = []
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda team_id: client._cached(('lgf', team_id), _slow_fetch(calls, team_id, 0.05)),
+                      range(4)))
+
+    assert len(calls) == 4
+
+
+def test_waiters_see_the_leaders_error_and_the_key_is_retried():
+    client = EndpointClient(request_delay=0, retry_policy=RetryPolicy(max_attempts=1))
+    started = threading.Event()
+
+    def failing_fetch():
+        started.set()
+        time.sleep(0.2)
+        raise ConnectionError('stats.nba.com timed out')
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(client._cached, ('lgf', 1), failing_fetch)
+        started.wait(1)
+        waiter = pool.submit(client._cached, ('lgf', 1), lambda: 'not called')
+        for future in (leader, waiter):
+            with pytest.raises(ConnectionError):
+                future.result()
+
+    assert client._cached(('lgf', 1), lambda: 'fresh') == 'fresh'
@@ -0,0 +1,94 @@
+"""
+Tests for the point-in-time feature store
+Builds and queries the store on tests/fakes.league_frame()
+"""
+
+import io
+from contextlib import redirect_stdout
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.advanced_enhanced_predictor import SuperPredictor
+from src.feature_store import FeatureStore, backtest
+from src.prediction_model import AdvancedPredictor
+from tests.fakes import SyntheticClient, league_frame
+
+
+
+def test_lookup_only_sees_games_before_the_as_of_date():
+    games = league_frame()
+    store = FeatureStore('unused')
+    store.build(games)
+
+    as_of = pd.Timestamp('2025-01-20')
+    for team_id in (1, 4):
+        before = games[(games['TEAM_ID'] == team_id) & (games['GAME_DATE'] < as_of)]
+        last = before.sort_values('GAME_DATE').tail(10)
+        row = store.lookup(team_id, as_of)
+        assert row['GAME_DATE'] == before['GAME_DATE'].max()
+        assert row['GAMES'] == len(last)
+        assert np.isclose(row['AVG_PTS'], last['PTS'].mean())
+        assert np.isclose(row['WIN_PCT'], 100 * (last['WL'].astype(str) == 'W').mean())
+        assert np.isclose(row['RATING'], store.ratings.rating(team_id, as_of))
+
+    assert store.lookup(1, '2024-12-31') is None
+
+
+def test_incremental_update_matches_a_full_build():
+    games = league_frame()
+    cutoff = pd.Timestamp('2025-01-18')
+    full = FeatureStore('unused')
+    full.build(games)
+    incremental = FeatureStore('unused')
+    incremental.build(games[games['GAME_DATE'] < cutoff])
+
+    added = incremental.update(games)
+    assert added == (games['GAME_DATE'] >= cutoff).sum()
+    assert incremental.update(games) == 0
+    columns = ['TEAM_ID', 'GAME_ID', 'WIN_PCT', 'AVG_PTS_ALLOWED', 'OFF_RTG', 'PREV_GAP', 'RATING']
+    pd.testing.assert_frame_equal(incremental.table[columns], full.table[columns])
+
+
+def test_saved_store_feeds_live_and_backtest_predictions(tmp_path):
+    games = league_frame()
+    store = FeatureStore(str(tmp_path / 'features'))
+    store.build(games)
+    store.save()
+    loaded = FeatureStore.load(str(tmp_path / 'features'))
+
+    inputs = loaded.prediction_inputs(1, 2, '2025-01-25')
+    assert inputs == store.prediction_inputs(1, 2, '2025-01-25')
+    assert inputs['h2h_stats']['games_played'] > 0
+    prediction = AdvancedPredictor().predict_match_outcome(**inputs)
+    assert prediction['favored_team'] in (inputs['home_team_stats']['team_name'],
+                                          inputs['away_team_stats']['team_name'])
+
+    results = list(backtest(loaded, AdvancedPredictor(), games))
+    assert 0 < len(results) < 90
+    assert FeatureStore.load(str(tmp_path / 'missing')) is None
+
+
+def test_live_analysis_reads_the_same_inputs_as_the_store():
+    lakers, warriors = 1610612747, 1610612744
+    store = FeatureStore('unused')
+    store.build(league_frame(n_games=80, team_ids=(lakers, warriors, 1610612738, 1610612748)))
+    client = SyntheticClient()
+    predictor = SuperPredictor(client=client, feature_store=store)
+
+    steps = ('stats', 'defense', 'rest', 'efficiency', 'rating')
+    outputs = tuple(f'{side}_{step}' for side in ('home', 'away') for step in steps) + ('h2h', 'prediction')
+    with redirect_stdout(io.StringIO()):
+        live = predictor.analyze_matchups([('Lakers', 'Warriors')], outputs=outputs)[('Lakers', 'Warriors')]
+
+    inputs = store.prediction_inputs(lakers, warriors, date.today())
+    names = {'stats': 'team_stats', 'defense': 'defensive_stats', 'rest': 'rest_stats',
+             'efficiency': 'efficiency_stats', 'rating': 'rating_stats'}
+    for side in ('home', 'away'):
+        for step, name in names.items():
+            assert live[f'{side}_{step}'] == inputs[f'{side}_{name}']
+    assert live['h2h'] == inputs['h2h_stats'] and inputs['h2h_stats']['games_played'] > 0
+    assert live['prediction']['home_win_probability'] == \
+        AdvancedPredictor().predict_match_outcome(**inputs)['home_win_probability']
+    assert client.stats()['requests'] == 0
@@ -0,0 +1,66 @@
+"""
+Tests for the slim game-log schema
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.frames import column_mean, normalize_game_frame, parse_game_dates
+
+
+def _raw_player_log(dates, minutes):
+    """A PlayerGameLog-shaped frame as nba_api returns it (object strings, int64/float64 numbers)"""
+    return pd.DataFrame({
+        'SEASON_ID': ['22024'] * 3,
+        'Player_ID': np.array([1628369] * 3, dtype=np.int64),
+        'Game_ID': ['0022400003', '0022400002', '0022400001'],
+        'GAME_DATE': dates,
+        'MATCHUP': ['BOS vs. MIA', 'BOS @ NYK', 'BOS vs. MIA'],
+        'WL': ['W', 'L', 'W'],
+        'MIN': minutes,
+        'PTS': np.array([31, 18, 27], dtype=np.int64),
+        'FG_PCT': [0.456, 0.381, 0.5],
+        'PLUS_MINUS': [12.0, -7.0, 3.0],
+        'VIDEO_AVAILABLE': np.array([1, 1, 0], dtype=np.int64),
+    }).astype({'SEASON_ID': object, 'Game_ID': object, 'GAME_DATE': object, 'MATCHUP': object, 'WL': object})
+
+
+def test_slim_dtypes_keep_every_value():
+    raw = _raw_player_log(['JAN 05, 2025', 'JAN 03, 2025', 'JAN 01, 2025'], np.array([36, 31, 40], dtype=np.int64))
+    frame = normalize_game_frame(raw)
+
+    assert isinstance(frame['SEASON_ID'].dtype, pd.CategoricalDtype)
+    assert isinstance(frame['MATCHUP'].dtype, pd.CategoricalDtype)
+    assert isinstance(frame['WL'].dtype, pd.CategoricalDtype)
+    assert frame['MATCHUP'].cat.categories.tolist() == ['BOS @ NYK', 'BOS vs. MIA']
+    assert frame['Player_ID'].dtype == np.int32
+    assert frame['MIN'].dtype == np.int16 and frame['PTS'].dtype == np.int16
+    assert frame['VIDEO_AVAILABLE'].dtype == np.int16
+    assert frame['FG_PCT'].dtype == np.float32 and frame['PLUS_MINUS'].dtype == np.float32
+    assert frame['Game_ID'].tolist() == raw['Game_ID'].tolist()  # not in the schema: untouched
+
+    for column in ('SEASON_ID', 'MATCHUP', 'WL'):
+        assert frame[column].astype(str).tolist() == raw[column].tolist()
+    for column in ('Player_ID', 'MIN', 'PTS', 'PLUS_MINUS', 'VIDEO_AVAILABLE'):
+        assert frame[column].tolist() == raw[column].tolist()
+    assert np.allclose(frame['FG_PCT'].to_numpy(dtype='float64'), raw['FG_PCT'], atol=1e-7)
+    assert np.isclose(column_mean(frame, 'FG_PCT'), raw['FG_PCT'].mean())
+    assert frame.index.equals(raw.index)
+
+
+def test_fractional_minutes_and_both_date_formats():
+    # Fractional (or missing) minutes cannot be int16
+    raw = _raw_player_log(['2025-01-05', '2025-01-03', '2025-01-01'], [36.5, 31.25, np.nan])
+    frame = normalize_game_frame(raw)
+    assert frame['MIN'].dtype == np.float32
+    assert frame['MIN'].iloc[:2].tolist() == [36.5, 31.25] and np.isnan(frame['MIN'].iloc[2])
+    assert frame['PTS'].dtype == np.int16
+
+    expected = pd.to_datetime(['2025-01-05', '2025-01-03', '2025-01-01'])
+    assert pd.api.types.is_datetime64_any_dtype(frame['GAME_DATE'])
+    assert frame['GAME_DATE'].tolist() == expected.tolist()
+    assert parse_game_dates(pd.Series(['JAN 05, 2025', 'JAN 03, 2025', 'JAN 01, 2025'])).tolist() == expected.tolist()
+    assert parse_game_dates(pd.Series(['2025-01-05T00:00:00'])).tolist() == expected[:1].tolist()
+    # Already-parsed dates pass through
+    dates = frame['GAME_DATE']
+    assert parse_game_dates(dates) is dates
@@ -0,0 +1,87 @@
+"""
+Tests for the pooled nba_api session
+A local transport adapter stands in for stats.nba.com, so nothing leaves the process
+"""
+
+import json
+
+import requests
+from requests.adapters import BaseAdapter
+
+from nba_api.live.nba.library.http import NBALiveHTTP
+from nba_api.stats.library.http import NBAStatsHTTP
+
+from src.http_session import PooledHTTP
+from src.main import NBADataExtractor
+
+HEADERS = ['SEASON_ID', 'TEAM_ID', 'TEAM_ABBREVIATION', 'TEAM_NAME', 'GAME_ID', 'GAME_DATE',
+           'MATCHUP', 'WL', 'PTS', 'FG_PCT']
+
+
+class LocalStatsAdapter(BaseAdapter):
+    """Answers every request with a canned LeagueGameFinder payload and records what was sent"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def send(self, request, timeout=None, **kwargs):
+        self.requests.append((request, timeout))
+        rows = [['22024', 1610612747, 'LAL', 'Los Angeles Lakers', f'00224000{i}', f'2025-01-0{i + 1}',
+                 'LAL vs. GSW', 'W', 110 + i, 0.5] for i in range(3)]
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response._content = json.dumps({'resultSets': [{'name': 'LeagueGameFinderResults',
+                                                         'headers': HEADERS, 'rowSet': rows}]}).encode()
+        return response
+
+    def close(self):
+        pass
+
+
+def test_extractor_requests_go_through_the_injected_session():
+    adapter = LocalStatsAdapter()
+    session = requests.Session()
+    session.mount('https://', adapter)
+    http = PooledHTTP(timeout=(1, 7), headers={'X-Test': 'stand-in'}, session=session)
+    saved = NBAStatsHTTP.get_session(), NBALiveHTTP.get_session()
+    try:
+        extractor = NBADataExtractor(http=http)
+        games = extractor.client.league_game_finder(1610612747, '2024-25')
+        extractor.client.league_game_finder(1610612744, '2024-25')
+    finally:
+        NBAStatsHTTP.set_session(saved[0])
+        NBALiveHTTP.set_session(saved[1])
+
+    assert len(adapter.requests) == 2
+    request, timeout = adapter.requests[0]
+    assert timeout == (1, 7)
+    assert request.headers['X-Test'] == 'stand-in'
+    assert 'gzip' in request.headers['Accept-Encoding']
+    assert 'leaguegamefinder' in request.url
+    assert games['PTS'].tolist() == [110, 111, 112]
+    assert str(games['GAME_DATE'].dtype).startswith('datetime64')
+
+
+def test_clients_share_one_default_pool():
+    first = NBADataExtractor().client.http
+    second = NBADataExtractor().client.http
+    assert first is second
+    assert NBAStatsHTTP.get_session() is NBALiveHTTP.get_session() is first.session
+    assert first.session.get_adapter('https://stats.nba.com')._pool_maxsize == 10
+
+
+def test_default_clients_leave_an_installed_session_alone():
+    stand_in = requests.Session()
+    saved = NBAStatsHTTP.get_session(), NBALiveHTTP.get_session()
+    try:
+        NBADataExtractor().client.http  # the default pool exists (and was installed once)
+        NBAStatsHTTP.set_session(stand_in)
+        NBALiveHTTP.set_session(stand_in)
+        NBADataExtractor()
+        assert NBAStatsHTTP.get_session() is NBALiveHTTP.get_session() is stand_in
+    finally:
+        NBAStatsHTTP.set_session(saved[0])
+        NBALiveHTTP.set_session(saved[1])
@@ -0,0 +1,40 @@
+"""
+Memory budget for repeated matchup analyses
+Runs src/memory_benchmark.py offline against the synthetic backend in tests/fakes.py
+"""
+
+from src.advanced_enhanced_predictor import SuperPredictor
+from src.memory_benchmark import check_budgets, matchups, run_benchmark
+from tests.fakes import SyntheticClient
+
+
+def _offline_predictor():
+    predictor = SuperPredictor(client=SyntheticClient())
+    predictor.workers = 1  # steps in order, so each phase's peak memory is its own
+    return predictor
+
+
+def test_repeated_matchups_stay_within_memory_budget():
+    report = run_benchmark(40, _offline_predictor(), warmup=15, top=5, distinct=10)
+
+    assert check_budgets(report, {'peak_mb': 16.0, 'growth_per_matchup_kb': 16.0}) == []
+    assert report['phases'] and all(p['runs'] == 40 for p in report['phases'])
+    assert all(p['peak_kb'] >= 0 for p in report['phases'])
+
+
+def test_dependency_graph_stays_bounded_over_many_distinct_matchups():
+    predictor = _offline_predictor()
+    predictor.predictor.cache.maxsize = 16  # evicts long before the 125 pairings come round again
+    report = run_benchmark(140, predictor, warmup=30, top=5)
+
+    assert check_budgets(report, {'peak_mb': 16.0, 'growth_per_matchup_kb': 16.0}) == []
+    nodes = predictor.dependencies.stats()['nodes']
+    # Finished steps leave the graph; evicted predictions take their matchups with them
+    assert nodes['prediction'] == len(predictor.predictor.cache) == 16
+    assert 'step' not in nodes
+    assert nodes['matchup'] == 16 < len(set(matchups(140)))
+
+
+def test_budget_violations_are_reported():
+    report = {'peak_mb': 20.0, 'growth_per_matchup_kb': 1.0}
+    assert check_budgets(report, {'peak_mb': 16.0, 'growth_per_matchup_kb': 16.0}) == ['peak_mb: 20.0 > 16.0']
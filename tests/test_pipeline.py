@@ -0,0 +1,93 @@
+"""
+Tests for the streaming slate pipeline
+Runs offline with an in-memory extractor
+"""
+
+import threading
+
+from src.pipeline import SlatePipeline
+from src.result_store import ResultStore
+
+
+class _Extractor:
+    """Minimal stand-in for NBADataExtractor with canned team stats"""
+
+    def __init__(self, release_after=None):
+        self.fetched = []
+        self.release_after = release_after
+        self.gate = threading.Event()
+
+    def get_team_recent_performance(self, team_name, last_n_games=10):
+        self.fetched.append(team_name)
+        if self.release_after and len(self.fetched) > self.release_after:
+            self.gate.wait(5)
+        if team_name == 'Unknown':
+            return None
+        return {'team_name': team_name, 'win_percentage': 50 + len(team_name), 'avg_points_scored': 110,
+                'avg_fg_pct': 46, 'avg_fg3_pct': 36, 'wins': 5, 'losses': 5}
+
+    def get_head_to_head_history(self, team1_name, team2_name, last_n_games=5):
+        return None
+
+    def get_rest_days(self, team_name):
+        return {'rest_days': 1, 'is_back_to_back': False, 'fatigue_factor': 0}
+
+    def get_team_defensive_stats(self, team_name, last_n_games=10):
+        return {'avg_points_allowed': 108}
+
+
+def _games(n):
+    return [{'game_id': f'g{i}', 'home_team': f'Home{i}', 'away_team': f'Away{i}'} for i in range(n)]
+
+
+def test_streams_every_game_and_writes_results(tmp_path):
+    store = ResultStore(str(tmp_path))
+    pipeline = SlatePipeline(_Extractor(), store=store)
+
+    results = list(pipeline.run(_games(12) + [{'game_id': 'x', 'home_team': 'Unknown', 'away_team': 'Away'}]))
+
+    assert len(results) == 13
+    assert [r['game_id'] for r in results if 'error' not in r] == [f'g{i}' for i in range(12)]
+    assert results[-1]['error'] == 'missing team data'
+    assert pipeline.summary['errors'] == 1
+    assert len(list(store.iter_records('matchups'))) == 12
+
+
+def test_first_result_arrives_before_slate_is_fetched():
+    """A game is yielded while later games are still blocked in the fetch stage"""
+    extractor = _Extractor(release_after=2)
+    results = SlatePipeline(extractor).run(_games(10))
+
+    first = next(results)
+    assert first['game_id'] == 'g0'
+    assert len(extractor.fetched) < 2 * 10
+    extractor.gate.set()
+    assert len(list(results)) == 9
+
+
+def test_closing_early_stops_the_stages():
+    extractor = _Extractor()
+    results = SlatePipeline(extractor, queue_size=1).run(_games(200))
+    next(results)
+    results.close()
+
+    # Bounded queues mean only a handful of games were fetched ahead of the consumer
+    assert len(extractor.fetched) < 2 * 20
+
+
+def test_predict_workers_run_predictions_concurrently():
+    """Three predictions must be in flight at once to get past the barrier"""
+    from src.prediction_model import AdvancedPredictor
+
+    barrier = threading.Barrier(3)
+
+    class _Predictor(AdvancedPredictor):
+        def predict_match_outcome(self, **inputs):
+            barrier.wait(timeout=5)
+            return super().predict_match_outcome(**inputs)
+
+    pipeline = SlatePipeline(_Extractor(), _Predictor(), fetch_workers=2, predict_workers=3, queue_size=3)
+    results = list(pipeline.run(_games(6)))
+
+    assert sorted(r['game_id'] for r in results) == [f'g{i}' for i in range(6)]
+    assert pipeline.summary['errors'] == 0
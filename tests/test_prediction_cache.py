@@ -0,0 +1,94 @@
+"""
+Tests for memoized predictions
+Runs offline - only uses hand-built stats dicts
+"""
+
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+from src.prediction_cache import PredictionCache, stable_fingerprint
+from src.prediction_model import AdvancedPredictor, apply_availability, generate_betting_insights
+
+
+HOME_STATS = {
+    'team_name': 'Test Home Team',
+    'win_percentage': 60,
+    'avg_points_scored': 112,
+    'avg_fg_pct': 47.5,
+    'avg_fg3_pct': 36.8
+}
+
+AWAY_STATS = {
+    'team_name': 'Test Away Team',
+    'win_percentage': 55,
+    'avg_points_scored': 108,
+    'avg_fg_pct': 46.2,
+    'avg_fg3_pct': 35.5
+}
+
+
+def test_fingerprint_is_stable():
+    """Key order and numpy scalar types must not change the fingerprint"""
+    a = {'wins': 6, 'avg_points_scored': 112.0}
+    b = {'avg_points_scored': np.float64(112.0), 'wins': np.int64(6)}
+    assert stable_fingerprint(a) == stable_fingerprint(b)
+    assert stable_fingerprint(a) != stable_fingerprint({'wins': 7, 'avg_points_scored': 112.0})
+
+
+def test_lru_eviction():
+    """Oldest entry is evicted once the cache is full"""
+    cache = PredictionCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+
+
+def test_match_prediction_is_memoized():
+    """Second identical query is a cache hit and returns an equal result"""
+    predictor = AdvancedPredictor()
+    first = predictor.predict_match_outcome(HOME_STATS, AWAY_STATS)
+    second = predictor.predict_match_outcome(HOME_STATS, AWAY_STATS)
+    assert first == second
+    assert predictor.cache.stats()['hits'] == 1
+
+
+def test_cached_result_is_shared_read_only():
+    """Hits return the stored value without copying; changing it needs a new dict"""
+    predictor = AdvancedPredictor()
+    first = predictor.predict_match_outcome(HOME_STATS, AWAY_STATS)
+    assert predictor.predict_match_outcome(HOME_STATS, AWAY_STATS) is first
+    expected = first['home_win_probability']
+    with pytest.raises(TypeError):
+        first['home_win_probability'] = 0
+    with pytest.raises(TypeError):
+        first.update(favored_team='nobody')
+
+    adjusted = apply_availability(first, -10, 0, HOME_STATS['team_name'], AWAY_STATS['team_name'])
+    assert adjusted['home_win_probability'] < expected and first['home_win_probability'] == expected
+    assert {**first, 'data_quality': {}}['data_quality'] == {}
+    # Still a dict for JSON, equality and pickling
+    assert json.loads(json.dumps(first)) == first == pickle.loads(pickle.dumps(first))
+
+
+def test_weight_change_misses_cache():
+    """Changing a weight produces a new key"""
+    predictor = AdvancedPredictor()
+    before = predictor.predict_match_outcome(HOME_STATS, AWAY_STATS)
+    predictor.weights['home_court'] = 0.0
+    after = predictor.predict_match_outcome(HOME_STATS, AWAY_STATS)
+    assert predictor.cache.stats()['hits'] == 0
+    assert after['home_win_probability'] < before['home_win_probability']
+
+
+def test_betting_insights_memoized():
+    """Insights come back as the same read-only sequence"""
+    prediction = AdvancedPredictor().predict_match_outcome(HOME_STATS, AWAY_STATS)
+    first = generate_betting_insights(prediction)
+    assert generate_betting_insights(prediction) is first
+    assert isinstance(first, tuple) and json.loads(json.dumps(first)) == list(first)
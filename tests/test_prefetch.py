@@ -0,0 +1,128 @@
+"""
+Tests for the slate cache warmer
+A stand-in client records every fetch; nothing touches the network
+"""
+
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+
+from src.endpoints import CURRENT_SEASON, EndpointClient
+from src.prefetch import SlatePrefetcher
+
+TEAMS = {'Lakers': 1, 'Warriors': 2, 'Celtics': 3, 'Heat': 4}
+
+
+class _StandInClient:
+    def __init__(self, block_player_logs=False):
+        self.calls = Counter()
+        self.first_player_log = threading.Event()
+        self.release = threading.Event()
+        if not block_player_logs:
+            self.release.set()
+
+    def scoreboard_games(self):
+        # The Lakers play twice on this slate; they must still be warmed once
+        return [{'homeTeam': {'teamName': home}, 'awayTeam': {'teamName': away}}
+                for home, away in (('Lakers', 'Warriors'), ('Celtics', 'Heat'), ('Lakers', 'Heat'))]
+
+    def league_game_finder(self, team_id, season, season_type='Regular Season', ttl=None, refresh=False):
+        self.calls[('games', team_id)] += 1
+        return pd.DataFrame({'GAME_ID': ['1']})
+
+    def team_roster(self, team_id, season, ttl=None, refresh=False):
+        self.calls[('roster', team_id)] += 1
+        return pd.DataFrame({'PLAYER_ID': [team_id * 100 + i for i in range(3)]})
+
+    def player_game_log(self, player_id, season, ttl=None, refresh=False):
+        self.calls[('player', player_id)] += 1
+        self.first_player_log.set()
+        self.release.wait(5)
+        return pd.DataFrame({'PTS': [20]})
+
+
+class _StandInExtractor:
+    def __init__(self, client):
+        self.client = client
+
+    def get_team_by_name(self, name):
+        return {'id': TEAMS[name], 'full_name': name} if name in TEAMS else None
+
+
+def test_each_slate_team_and_player_is_fetched_once():
+    client = _StandInClient()
+    summary = SlatePrefetcher(_StandInExtractor(client)).run()
+
+    expected = {('games', t) for t in TEAMS.values()} | {('roster', t) for t in TEAMS.values()} | \
+        {('player', t * 100 + i) for t in TEAMS.values() for i in range(3)}
+    assert set(client.calls) == expected
+    assert set(client.calls.values()) == {1}
+    assert summary['teams'] == 4 and summary['frames'] == len(expected) and summary['errors'] == 0
+
+
+def test_stop_ends_a_background_prefetch_and_joins_its_thread():
+    client = _StandInClient(block_player_logs=True)
+    prefetcher = SlatePrefetcher(_StandInExtractor(client))
+    thread = prefetcher.start()
+    assert client.first_player_log.wait(5) and prefetcher.is_running()
+
+    # The in-flight request finishes, then the prefetch stops instead of fetching the rest
+    threading.Timer(0.05, client.release.set).start()
+    prefetcher.stop(timeout=5)
+
+    assert not thread.is_alive() and not prefetcher.is_running()
+    assert sum(1 for call in client.calls if call[0] == 'player') == 1
+    assert prefetcher.summary['teams'] == 1
+
+
+class _ClockedClient(EndpointClient):
+    """Real frame cache on a settable clock; every fetch is counted"""
+
+    def __init__(self):
+        self.now = 1000.0
+        super().__init__(request_delay=0, clock=lambda: self.now)
+        self.fetches = Counter()
+
+    def scoreboard_games(self):
+        return [{'homeTeam': {'teamName': 'Lakers'}, 'awayTeam': {'teamName': 'Warriors'}}]
+
+    def league_game_finder(self, team_id, season, season_type='Regular Season', ttl=None, refresh=False):
+        def fetch():
+            self.fetches[team_id] += 1
+            return pd.DataFrame({'GAME_ID': [str(self.fetches[team_id])]})
+        return self._cached(('leaguegamefinder', team_id, season, season_type), fetch, ttl=ttl, refresh=refresh)
+
+
+def test_warmed_frames_outlive_the_default_ttl_until_rewarmed():
+    client = _ClockedClient()
+    prefetcher = SlatePrefetcher(_StandInExtractor(client), include_players=False, ttl=client.cache_ttl * 4)
+    key = ('leaguegamefinder', 1, CURRENT_SEASON, 'Regular Season')
+    prefetcher.run()
+    assert client.fetches == {1: 1, 2: 1}
+
+    # Past the default cache_ttl but inside the prefetch ttl: still a cache hit
+    client.now += prefetcher.ttl - 1
+    assert client.league_game_finder(1, CURRENT_SEASON)['GAME_ID'].tolist() == ['1']
+    assert client.fetches == {1: 1, 2: 1}
+    client.now += 2
+    assert not client.is_cached(key)
+
+    # The next pass fetches again and starts a new prefetch ttl (even over a fresh frame)
+    prefetcher.run()
+    assert client.fetches == {1: 2, 2: 2} and client.cached(key)['GAME_ID'].tolist() == ['2']
+    client.now += prefetcher.ttl - 1
+    assert client.is_cached(key)
+
+
+def test_interval_rewarms_until_stopped():
+    client = _StandInClient()
+    prefetcher = SlatePrefetcher(_StandInExtractor(client), include_players=False)
+    prefetcher.start(interval=0.01)
+    deadline = time.time() + 5
+    while client.calls[('games', 1)] < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    prefetcher.stop(timeout=5)
+
+    assert client.calls[('games', 1)] >= 3 and not prefetcher.is_running()
@@ -0,0 +1,49 @@
+"""
+Tests for the profiling hooks used by the command line entry points
+"""
+
+import time
+
+from src.profiling import PhaseTimer, parse_profile_args, profile_main
+
+
+def test_phase_timer_separates_wall_from_cpu():
+    timer = PhaseTimer()
+    timer.start('waiting')
+    time.sleep(0.05)
+    timer.start('computing')
+    sum(i * i for i in range(200000))
+    with timer.phase('waiting'):
+        time.sleep(0.02)
+
+    phases = {p['phase']: p for p in timer.summary()}
+    assert list(phases) == ['waiting', 'computing']
+    assert phases['waiting']['wall'] >= 0.07
+    assert phases['waiting']['cpu'] < phases['waiting']['wall'] / 2
+    assert phases['computing']['cpu'] > 0
+
+
+def test_profile_flags_are_removed_from_argv():
+    argv = ['predict.py', 'Lakers', '--profile=sample', 'Warriors', '--profile-out', 'out/p', '--timings']
+    assert parse_profile_args(argv) == ('sample', 'out/p', True)
+    assert argv == ['predict.py', 'Lakers', 'Warriors']
+    assert parse_profile_args(['x', '--profile'])[0] == 'cprofile'
+    assert parse_profile_args(['x'])[0] is None
+
+
+def test_profiled_runs_write_flame_graph_inputs(tmp_path, monkeypatch):
+    monkeypatch.delenv('NBA_TIMINGS', raising=False)
+
+    def work():
+        time.sleep(0.05)
+        return sum(i * i for i in range(100000))
+
+    for flag, suffix in (('--profile', '.prof'), ('--profile=sample', '.folded')):
+        output = tmp_path / flag.strip('-').replace('=', '-')
+        argv = ['entry', flag, '--profile-out', str(output)]
+        assert profile_main(work, argv) == work()
+        assert (tmp_path / (output.name + suffix)).stat().st_size > 0
+
+    folded = (tmp_path / 'profile-sample.folded').read_text().splitlines()
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in folded)
+    assert any('test_profiling.py:work' in line for line in folded)
@@ -0,0 +1,81 @@
+"""
+Tests for the vectorized player prop engine
+Runs offline on a synthetic league of player game logs
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.frames import normalize_game_frame
+from src.props import PropEngine
+
+
+def _player_logs(n_teams=20, per_team=15, n_games=30, seed=1):
+    """Poisson box scores driven by minutes, per-minute scoring and the opponent's defense"""
+    rng = np.random.default_rng(seed)
+    defense = np.linspace(0.8, 1.2, n_teams)
+    minutes = rng.uniform(10, 36, (n_teams, per_team))
+    points_per_minute = rng.uniform(0.3, 0.9, (n_teams, per_team))
+    frames = []
+    for game in range(n_games):
+        order = rng.permutation(n_teams)
+        for home, away in zip(order[::2], order[1::2]):
+            for team, opponent, separator in ((home, away, 'vs.'), (away, home, '@')):
+                played = np.clip(rng.normal(minutes[team], 3), 1, 48).round(1)
+                scale = played * defense[opponent]
+                frames.append(pd.DataFrame({
+                    'PLAYER_ID': team * 100 + np.arange(per_team),
+                    'PLAYER_NAME': [f'Player {team}-{p}' for p in range(per_team)],
+                    'TEAM_ID': 1000 + team, 'TEAM_ABBREVIATION': f'T{team:02d}',
+                    'GAME_ID': f'{game:03d}{min(home, away):02d}',
+                    'GAME_DATE': (pd.Timestamp('2025-01-01') + pd.Timedelta(days=2 * game)).strftime('%Y-%m-%d'),
+                    'MATCHUP': f'T{team:02d} {separator} T{opponent:02d}', 'MIN': played,
+                    'PTS': rng.poisson(scale * points_per_minute[team]), 'REB': rng.poisson(scale * 0.2),
+                    'AST': rng.poisson(scale * 0.12), 'FG3M': rng.poisson(scale * 0.05),
+                }))
+    return normalize_game_frame(pd.concat(frames, ignore_index=True)), defense
+
+
+def test_projections_follow_minutes_rates_and_opponent_defense():
+    logs, defense = _player_logs()
+    engine = PropEngine(seed=0).fit(logs)
+    allowance = engine.allowance.sort_index()
+    assert np.corrcoef(allowance['PTS'], defense)[0, 1] > 0.8
+
+    # The same player projects higher against the most generous defense
+    weak, strong = engine.project([(1005, 1019)]), engine.project([(1005, 1000)])
+    assert weak.percentiles('PTS').set_index('PLAYER_ID').loc[500, 'MEAN'] > \
+        strong.percentiles('PTS').set_index('PLAYER_ID').loc[500, 'MEAN']
+
+    projections = engine.project([(1000, 1001), (1002, 1003)])
+    assert len(projections) == 60
+    table = projections.percentiles('PTS')
+    assert (np.diff(table[['P10', 'P25', 'P50', 'P75', 'P90']].to_numpy(), axis=1) >= 0).all()
+    player = engine.players.set_index('PLAYER_ID').loc[table['PLAYER_ID']]
+    factor = table['OPPONENT_ID'].map(engine.allowance['PTS']).to_numpy()
+    expected = player['PTS_RATE'].to_numpy() * player['MINUTES'].to_numpy() * factor
+    assert np.allclose(table['MEAN'], expected, rtol=0.1, atol=0.5)
+
+    odds = projections.over_under('REB', 4.0)
+    assert np.allclose(odds[['OVER', 'UNDER', 'PUSH']].sum(axis=1), 1.0)
+    assert projections.over_under('REB', 4.5)['PUSH'].eq(0).all()
+    single = projections.over_under('PTS', {'Player 0-3': 12.5})
+    assert len(single) == 1 and single.loc[0, 'OVER'] == projections.probability(3, 'PTS', 12.5)
+
+
+def test_minute_overrides_and_full_slate_speed():
+    logs, _ = _player_logs(n_teams=20)
+    engine = PropEngine(seed=0).fit(logs)
+    base = engine.project([(1000, 1001)])
+    changed = engine.project([(1000, 1001)], minutes={'Player 0-0': 0, 2: 2 * base.players.loc[2, 'MINUTES']})
+    assert len(changed) == len(base) - 1 and 0 not in set(changed.players['PLAYER_ID'])
+    assert changed.percentiles('PTS').set_index('PLAYER_ID').loc[2, 'MEAN'] > \
+        1.5 * base.percentiles('PTS').set_index('PLAYER_ID').loc[2, 'MEAN']
+
+    started = time.perf_counter()
+    slate = engine.project([(1000 + i, 1010 + i) for i in range(10)])
+    summary = slate.summary()
+    assert len(summary) == 300 and 'FG3M_P90' in summary
+    assert time.perf_counter() - started < 10
@@ -0,0 +1,86 @@
+"""
+Tests for the incremental team rating engine
+Three synthetic seasons where the order of the team ids is the order of strength
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.prediction_model import AdvancedPredictor
+from src.ratings import TeamRatings
+from tests.fakes import league_frame
+
+
+def _league_games(seasons=3, games_per_season=300, n_teams=10):
+    """Multi-season league where lower team ids are stronger"""
+    return pd.concat([league_frame(games_per_season, seed=3 + i, season=f"{2020 + i}-{21 + i}",
+                                   start=f"{2020 + i}-10-20", games_per_day=5, team_ids=range(n_teams), strength=2)
+                      for i in range(seasons)], ignore_index=True)
+
+
+def test_ratings_rank_stronger_teams_higher():
+    ratings = TeamRatings()
+    assert ratings.update_from_frame(_league_games()) == 900
+
+    order = [team_id for team_id, _ in ratings.standings()]
+    assert set(order[:3]) <= {0, 1, 2, 3}
+    assert ratings.win_probability(0, 9) > 0.5 > ratings.win_probability(9, 0)
+
+
+def test_incremental_update_matches_full_rebuild(tmp_path):
+    """Saving, reloading and applying only new games gives the same ratings as one pass"""
+    games = _league_games()
+    cutoff = pd.Timestamp('2022-01-01')
+
+    full = TeamRatings()
+    full.update_from_frame(games)
+
+    partial = TeamRatings()
+    partial.update_from_frame(games[pd.to_datetime(games['GAME_DATE']) < cutoff])
+    partial.save(str(tmp_path))
+    resumed = TeamRatings.load(str(tmp_path))
+    assert resumed.update_from_frame(games) == 900 - len(partial._game_ids)
+
+    for team_id in range(10):
+        assert np.isclose(resumed.rating(team_id), full.rating(team_id))
+        assert np.isclose(resumed.rating(team_id, as_of='2021-03-01'), full.rating(team_id, as_of='2021-03-01'))
+
+
+def test_as_of_lookup_excludes_games_on_that_date():
+    ratings = TeamRatings()
+    ratings.update_game('2024-01-01', 1, 2, 120, 100)
+    ratings.update_game('2024-01-03', 1, 2, 120, 100)
+
+    assert ratings.rating(1, as_of='2024-01-01') == ratings.initial
+    assert ratings.rating_stats(1, as_of='2024-01-03')['games_rated'] == 1
+    assert ratings.rating(1, as_of='2024-01-02') < ratings.rating(1)
+
+
+def test_rating_factor_is_optional_in_team_score():
+    predictor = AdvancedPredictor()
+    stats = {'win_percentage': 60, 'avg_points_scored': 112, 'avg_fg_pct': 47, 'avg_fg3_pct': 36}
+    base = predictor.calculate_team_score(stats)
+
+    assert predictor.calculate_team_score(stats, rating_stats={'rating': 1500, 'games_rated': 0}) == base
+    strong = predictor.calculate_team_score(stats, rating_stats={'rating': 1650, 'games_rated': 82})
+    weak = predictor.calculate_team_score(stats, rating_stats={'rating': 1350, 'games_rated': 82})
+    assert strong > weak > base
+
+
+def test_rating_factor_needs_both_teams_rated():
+    predictor = AdvancedPredictor()
+    home = {'team_name': 'Home', 'win_percentage': 55, 'avg_points_scored': 112, 'avg_fg_pct': 47, 'avg_fg3_pct': 36}
+    away = {**home, 'team_name': 'Away'}
+    base = predictor.predict_match_outcome(home, away)
+
+    unrated = {'rating': 1500, 'games_rated': 0}
+    # One unrated side: the factor is dropped for both instead of handing the rated side a free bonus
+    for rated in ({'rating': 1500, 'games_rated': 82}, {'rating': 1650, 'games_rated': 82}):
+        assert predictor.predict_match_outcome(home, away, home_rating_stats=rated, away_rating_stats=unrated) == base
+        assert predictor.predict_match_outcome(home, away, home_rating_stats=None, away_rating_stats=rated) == base
+
+    even = predictor.predict_match_outcome(home, away, home_rating_stats={'rating': 1500, 'games_rated': 82},
+                                           away_rating_stats={'rating': 1500, 'games_rated': 82})
+    stronger = predictor.predict_match_outcome(home, away, home_rating_stats={'rating': 1650, 'games_rated': 82},
+                                               away_rating_stats={'rating': 1500, 'games_rated': 82})
+    assert stronger['home_win_probability'] > even['home_win_probability']
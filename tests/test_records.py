@@ -0,0 +1,73 @@
+"""
+Tests for the array-backed recent_games records
+"""
+
+import json
+import pickle
+
+import pandas as pd
+import pytest
+
+from src.prediction_cache import stable_fingerprint
+from src.prediction_model import AdvancedPredictor
+from src.records import GameRecords, GameRow
+from src.result_store import json_default
+
+
+def _games():
+    frame = pd.DataFrame({
+        'GAME_DATE': pd.to_datetime(['2025-01-05', '2025-01-03', '2025-01-01']),
+        'MATCHUP': ['BOS vs. MIA', 'BOS @ NYK', 'BOS vs. LAL'],
+        'WL': ['W', 'L', 'W'],
+        'PTS': [31, 18, 27],
+        'FG_PCT': [0.456, 0.381, 0.5],
+        'PLUS_MINUS': [12.0, -7.0, 3.0],
+    })
+    expected = [
+        {'GAME_DATE': '2025-01-05', 'MATCHUP': 'BOS vs. MIA', 'WL': 'W', 'PTS': 31, 'FG_PCT': 0.456, 'PLUS_MINUS': 12.0},
+        {'GAME_DATE': '2025-01-03', 'MATCHUP': 'BOS @ NYK', 'WL': 'L', 'PTS': 18, 'FG_PCT': 0.381, 'PLUS_MINUS': -7.0},
+        {'GAME_DATE': '2025-01-01', 'MATCHUP': 'BOS vs. LAL', 'WL': 'W', 'PTS': 27, 'FG_PCT': 0.5, 'PLUS_MINUS': 3.0},
+    ]
+    return GameRecords.from_frame(frame), expected
+
+
+def test_rows_read_like_the_dicts_they_replace():
+    records, expected = _games()
+
+    assert len(records) == 3 and records.columns == list(expected[0])
+    row = records[0]
+    assert isinstance(row, GameRow)
+    assert row['PTS'] == 31 and type(row['PTS']) is int
+    assert row['FG_PCT'] == 0.456 and row['MATCHUP'] == 'BOS vs. MIA' and row['GAME_DATE'] == '2025-01-05'
+    assert row.get('REB') is None and row.get('REB', 0) == 0
+    with pytest.raises(KeyError):
+        row['REB']
+    assert 'WL' in row and 'REB' not in row
+    assert dict(row) == dict(row.items()) == row.to_dict() == expected[0]
+    assert records[-1] == expected[2]
+    with pytest.raises(IndexError):
+        records[3]
+    assert [game.get('PTS', 0) for game in records[:2]] == [31, 18]
+    assert records.column('PTS').tolist() == [31, 18, 27]
+
+    # Equal to (and fingerprinted like) the list of dicts it replaces
+    assert records == expected and records[1:] == expected[1:]
+    assert records != expected[:2]
+    assert stable_fingerprint({'recent_games': records}) == stable_fingerprint({'recent_games': expected})
+    # The predictor's consistency score reads rows through get()
+    predictor = AdvancedPredictor()
+    stats = {'player_name': 'Jayson Tatum', 'avg_points': 25.3, 'avg_fg_pct': 44.6, 'avg_plus_minus': 2.7}
+    assert predictor._predict_player_performance({**stats, 'recent_games': records}) == \
+        predictor._predict_player_performance({**stats, 'recent_games': expected})
+
+
+def test_records_serialize_to_json_and_survive_pickling():
+    records, expected = _games()
+
+    assert json.loads(json.dumps({'recent_games': records}, default=json_default)) == {'recent_games': expected}
+    assert json.loads(json.dumps(records[0], default=json_default)) == expected[0]
+
+    restored = pickle.loads(pickle.dumps(records))
+    assert isinstance(restored, GameRecords)
+    assert restored == records and restored == expected
+    assert restored.column('FG_PCT').dtype == records.column('FG_PCT').dtype
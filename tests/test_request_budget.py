@@ -0,0 +1,71 @@
+"""
+Request-budget regression tests for the analysis entry points
+Each entry point runs against the counting synthetic backend in tests/fakes.py: network
+requests, rate-limit sleep and wall time must stay under a fixed budget, so an extra API
+call added to a method fails here instead of slowing down (or getting throttled) in production.
+"""
+
+import time
+
+from src.advanced_enhanced_predictor import SuperPredictor
+from src.analyze import analyze_matchup
+from src.enhanced_predictor import EnhancedPredictor
+from src.main import NBADataExtractor
+from src.pipeline import SlatePipeline
+from tests.fakes import SyntheticClient
+
+
+def _run(entry_point):
+    """Run an entry point; returns (result, per-endpoint calls, total requests, sleep seconds, wall seconds)"""
+    client = SyntheticClient()
+    started = time.perf_counter()
+    result = entry_point(client)
+    wall = time.perf_counter() - started
+    return result, client.calls, sum(client.calls.values()), client.slept, wall
+
+
+def test_analyze_matchup_budget():
+    result, calls, requests, slept, wall = _run(
+        lambda client: analyze_matchup('Lakers', 'Warriors', ['LeBron James'],
+                                       extractor=NBADataExtractor(client=client)))
+    assert calls == {'LeagueGameFinder': 2, 'PlayerGameLog': 1}
+    assert requests <= 3
+    assert slept <= 3 * 0.6
+    assert wall < 5
+
+
+def test_comprehensive_matchup_analysis_budget():
+    result, calls, requests, slept, wall = _run(
+        lambda client: SuperPredictor(client=client).comprehensive_matchup_analysis('Lakers', 'Warriors'))
+    assert result is not None
+    # Team logs are fetched once and shared by form, H2H, rest and defense; one league table for efficiency
+    assert calls == {'LeagueGameFinder': 2, 'LeagueGameFinder(league)': 1}
+    assert requests <= 3
+    assert slept <= 3 * 0.6
+    assert wall < 5
+
+
+def test_analyze_with_injuries_budget():
+    result, calls, requests, slept, wall = _run(
+        lambda client: EnhancedPredictor(client=client).analyze_with_injuries(
+            'Lakers', 'Warriors', {'home': [{'name': 'LeBron James', 'playing': False, 'impact': 'high'}],
+                                   'away': []}))
+    assert result is not None
+    assert calls == {'LeagueGameFinder': 2}
+    assert requests <= 2
+    assert slept <= 2 * 0.6
+    assert wall < 5
+
+
+def test_slate_budget():
+    def run_slate(client):
+        pipeline = SlatePipeline(SuperPredictor(client=client))
+        return list(pipeline.run())
+
+    results, calls, requests, slept, wall = _run(run_slate)
+    assert len(results) == 3 and not any('error' in r for r in results)
+    # One scoreboard, two team logs per game, one league table shared by the whole slate
+    assert calls == {'ScoreBoard': 1, 'LeagueGameFinder': 6, 'LeagueGameFinder(league)': 1}
+    assert requests <= 8
+    assert slept <= 7 * 0.6
+    assert wall < 10
@@ -0,0 +1,80 @@
+"""
+Tests for the append-only prediction result store
+"""
+
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from src.result_store import ResultStore, matchup_record
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_columnar_records_survive_a_crash_before_the_chunk_is_written(tmp_path):
+    # The writer dies (no flush, no atexit) with 3 of its 256 records buffered
+    script = (
+        "import os, sys\n"
+        f"sys.path.insert(0, {ROOT!r})\n"
+        "from src.result_store import ResultStore\n"
+        f"store = ResultStore({str(tmp_path)!r}, format='columnar')\n"
+        "for i in range(3):\n"
+        "    store.append_matchup({'favored_team': f'Team {i}', 'home_win_probability': 50.0 + i,\n"
+        "                          'predicted_home_score': 110 + i}, 'Home', 'Away')\n"
+        "os._exit(1)\n"
+    )
+    subprocess.run([sys.executable, '-c', script], check=False)
+    assert [name.split('-')[0] for name in os.listdir(tmp_path / 'matchups')] == ['_pending']
+
+    columns = ResultStore(str(tmp_path), format='columnar').read_columns('matchups')
+    assert columns['favored_team'].tolist() == ['Team 0', 'Team 1', 'Team 2']
+    assert columns['predicted_home_score'].tolist() == [110, 111, 112]
+    assert not [name for name in os.listdir(tmp_path / 'matchups') if name.startswith('_pending-')]
+
+
+def _append_matchups(store):
+    """Five predictions over two months (January and March 2025)"""
+    for i in range(5):
+        prediction = {'favored_team': f'Team {i}', 'confidence': 'Medium', 'home_win_probability': 50.0 + i,
+                      'away_win_probability': 50.0 - i, 'predicted_home_score': 110 + i,
+                      'predicted_away_score': 108, 'point_spread': 2.0 + i}
+        recorded_at = datetime(2025, 1 + 2 * (i // 3), 10 + i)
+        store.append('matchups', matchup_record(prediction, f'Home {i}', f'Away {i}', recorded_at))
+
+
+def test_jsonl_round_trip_with_date_filter(tmp_path):
+    store = ResultStore(str(tmp_path), format='jsonl')
+    _append_matchups(store)
+    store.append_player({'player': 'Jayson Tatum', 'prediction': 'GOOD', 'confidence': 'Medium',
+                         'performance_score': np.float64(61.5), 'expected_points_range': '22-32',
+                         'consistency_rating': '80%'}, {'avg_points': np.float32(27.0)})
+
+    records = list(store.iter_records('matchups'))
+    assert [r['favored_team'] for r in records] == [f'Team {i}' for i in range(5)]
+    assert records[4]['predicted_home_score'] == 114 and records[4]['home_win_probability'] == 54.0
+    assert sorted(os.listdir(tmp_path))[:2] == ['matchups-2025-01.jsonl', 'matchups-2025-03.jsonl']
+    assert [r['home_team'] for r in store.iter_records('matchups', since='2025-03-01')] == ['Home 3', 'Home 4']
+
+    player = next(store.iter_records('players'))
+    assert player['performance_score'] == 61.5 and player['avg_points'] == 27.0
+    assert (player['expected_points_low'], player['expected_points_high'], player['consistency']) == (22, 32, 80)
+
+
+def test_columnar_round_trip_with_partial_chunk_and_flush(tmp_path):
+    store = ResultStore(str(tmp_path), format='columnar', chunk_size=3)
+    _append_matchups(store)
+    # One full chunk written; the last two records are still pending
+    assert store.read_columns('matchups')['favored_team'].tolist() == ['Team 0', 'Team 1', 'Team 2']
+    store.flush()
+
+    columns = store.read_columns('matchups')
+    assert columns['favored_team'].tolist() == [f'Team {i}' for i in range(5)]
+    assert columns['predicted_home_score'].dtype == np.int16
+    assert columns['home_win_probability'].tolist() == [50.0, 51.0, 52.0, 53.0, 54.0]
+    assert columns['recorded_at'].dtype == np.dtype('datetime64[ms]')
+    subset = store.read_columns('matchups', ['away_team'], since='2025-03-01')
+    assert list(subset) == ['away_team'] and subset['away_team'].tolist() == ['Away 3', 'Away 4']
+    assert not [name for name in os.listdir(tmp_path / 'matchups') if name.startswith('_pending-')]
@@ -0,0 +1,98 @@
+"""
+Tests for the retry policy and data-quality reporting
+Runs offline - failures are raised by plain callables
+"""
+
+import pytest
+import requests
+
+from src.endpoints import EndpointClient, RateLimiter
+from src.main import NBADataExtractor
+from src.retry import RetryPolicy, is_retryable
+
+
+class _Flaky:
+    """Raises the given errors in turn, then returns 'ok'"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+def test_classification():
+    assert is_retryable(requests.Timeout())
+    assert is_retryable(requests.ConnectionError())
+    assert is_retryable(_http_error(429)) and is_retryable(_http_error(503))
+    assert not is_retryable(_http_error(400))
+    assert not is_retryable(KeyError('resultSets'))
+
+
+def test_backoff_is_exponential_with_full_jitter():
+    delays = []
+    policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=6.0, sleep=delays.append, rand=lambda: 1.0)
+    flaky = _Flaky(*[requests.Timeout()] * 4)
+
+    assert policy.call(flaky) == 'ok'
+    assert delays == [1.0, 2.0, 4.0, 6.0]
+    assert RetryPolicy(rand=lambda: 0.25).delay(3) == 1.0
+
+
+def test_fatal_errors_and_exhausted_attempts_are_raised():
+    policy = RetryPolicy(max_attempts=3, sleep=lambda _: None)
+    fatal = _Flaky(ValueError('bad parameter'))
+    with pytest.raises(ValueError):
+        policy.call(fatal)
+    assert fatal.calls == 1
+
+    flaky = _Flaky(*[requests.Timeout()] * 5)
+    with pytest.raises(requests.Timeout):
+        policy.call(flaky)
+    assert flaky.calls == 3
+
+
+def test_client_backoff_goes_through_the_rate_limiter():
+    """Retries wait for a rate-limiter slot pushed back by the backoff delay"""
+    now = [0.0]
+    limiter = RateLimiter(0.5, clock=lambda: now[0], sleep=lambda s: now.__setitem__(0, now[0] + s))
+    client = EndpointClient(rate_limiter=limiter, retry_policy=RetryPolicy(rand=lambda: 1.0))
+    flaky = _Flaky(requests.Timeout(), requests.ConnectionError())
+
+    assert client._cached(('lgf', 1), flaky) == 'ok'
+    assert flaky.calls == 3
+    assert client.stats()['retries'] == 2
+    # 1s then 2s backoff, each served as a rate-limiter wait
+    assert limiter.total_wait == pytest.approx(3.0)
+
+
+class _DownClient(EndpointClient):
+    """Every stats request fails with a non-retryable error"""
+
+    def __init__(self):
+        super().__init__(request_delay=0)
+
+    def league_game_finder(self, team_id, season, season_type='Regular Season'):
+        raise requests.HTTPError('403 Forbidden')
+
+
+def test_fallbacks_and_missing_inputs_are_recorded():
+    extractor = NBADataExtractor(client=_DownClient())
+    with extractor.data_quality.collect() as issues:
+        stats = extractor.get_team_recent_performance('Lakers')
+        rest = extractor.get_rest_days('Lakers')
+
+    assert stats['data_source'] == 'fallback'
+    assert rest is None
+    assert [(i['field'], i['status']) for i in issues] == [('team_stats', 'fallback'), ('rest_stats', 'missing')]
+    assert issues[0]['team'] == 'Los Angeles Lakers'
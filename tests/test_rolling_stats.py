@@ -0,0 +1,101 @@
+"""
+Tests for the streaming player-form accumulators
+Runs offline against a stand-in client serving a growing game log
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.endpoints import CURRENT_SEASON
+from src.frames import column_mean, normalize_game_frame
+from src.main import NBADataExtractor
+from src.prediction_model import AdvancedPredictor
+from src.rolling_stats import EWMA, FORM_FIELDS, FormTracker, RollingExtremes, RollingStats
+
+
+def test_accumulators_match_recomputed_window_statistics():
+    rng = np.random.default_rng(0)
+    values = rng.normal(20, 6, 300)
+    values[rng.random(300) < 0.1] = np.nan
+    rolling, extremes, ewma = RollingStats(10), RollingExtremes(5), EWMA(halflife=5)
+    for i, value in enumerate(values):
+        rolling.push(value)
+        extremes.push(value)
+        ewma.push(value)
+        window = values[max(0, i - 9):i + 1]
+        assert np.isclose(rolling.average, np.nanmean(window))
+        assert np.isclose(rolling.variance, np.nanvar(window))
+        if not np.isnan(values[max(0, i - 4):i + 1]).all():
+            assert extremes.high == np.nanmax(values[max(0, i - 4):i + 1])
+            assert extremes.low == np.nanmin(values[max(0, i - 4):i + 1])
+    expected = pd.Series(values).ewm(halflife=5, adjust=False, ignore_na=True).mean().iloc[-1]
+    assert np.isclose(ewma.mean, expected)
+
+
+class _GrowingLogClient:
+    """Serves a player's season log, most recent game first, n_games at a time"""
+
+    def __init__(self, log):
+        self.log = log
+        self.n_games = 0
+
+    def player_game_log(self, player_id, season, season_type='Regular Season'):
+        return self.log.head(self.n_games).iloc[::-1].reset_index(drop=True)
+
+
+def _season_log(n_games=25, seed=3):
+    rng = np.random.default_rng(seed)
+    return normalize_game_frame(pd.DataFrame({
+        'Player_ID': 2544,
+        'Game_ID': [f'00224{i:05d}' for i in range(n_games)],
+        'GAME_DATE': pd.date_range('2025-01-01', periods=n_games, freq='2D').strftime('%b %d, %Y').str.upper(),
+        'MATCHUP': 'LAL vs. GSW',
+        'PTS': rng.integers(10, 40, n_games), 'REB': rng.integers(2, 12, n_games),
+        'AST': rng.integers(2, 12, n_games), 'STL': rng.integers(0, 4, n_games),
+        'BLK': rng.integers(0, 3, n_games), 'FG_PCT': rng.uniform(0.3, 0.6, n_games).round(3),
+        'FG3_PCT': rng.uniform(0.2, 0.5, n_games).round(3), 'FT_PCT': rng.uniform(0.6, 1, n_games).round(3),
+        'PLUS_MINUS': rng.integers(-15, 15, n_games),
+    }))
+
+
+def test_player_stats_update_incrementally_and_persist(tmp_path):
+    log = _season_log()
+    client = _GrowingLogClient(log)
+    extractor = NBADataExtractor(client=client, form=FormTracker(root=str(tmp_path)))
+    for n_games in (3, 12, 13, 25):
+        client.n_games = n_games
+        stats = extractor.get_player_recent_stats('LeBron James')
+        recent = client.player_game_log(2544, None).head(10)
+        for field, column, scale in FORM_FIELDS:
+            assert np.isclose(stats[field], column_mean(recent, column) * scale)
+        assert stats['games_played'] == len(recent)
+        assert extractor.form.get(2544, CURRENT_SEASON).games == n_games  # each game pushed exactly once
+
+        # The rolling consistency gives the same prediction as recomputing it from the games
+        without = {key: value for key, value in stats.items() if key != 'consistency'}
+        predictor = AdvancedPredictor()
+        assert predictor._predict_player_performance(stats) == predictor._predict_player_performance(without)
+
+    extractor.form.save()
+    restored = FormTracker.load(str(tmp_path))
+    assert restored.forms.keys() == extractor.form.forms.keys()
+    for key, form in extractor.form.forms.items():
+        restored_stats, stats = restored.forms[key].stats(), form.stats()
+        assert restored_stats.keys() == stats.keys()
+        assert all(np.isclose(restored_stats[name], stats[name]) for name in stats)
+        assert restored.forms[key].games == form.games
+
+
+def test_extractor_starts_with_empty_form_unless_given_one(tmp_path, monkeypatch):
+    def persisted(*args, **kwargs):
+        raise AssertionError("the saved form is loaded only by the service")
+    # main.py imports rolling_stats as a sibling module
+    tracker = sys.modules[NBADataExtractor.__module__].FormTracker
+    monkeypatch.setattr(tracker, 'load', classmethod(persisted))
+
+    extractor = NBADataExtractor(client=_GrowingLogClient(_season_log()))
+    assert isinstance(extractor.form, tracker) and len(extractor.form) == 0
+    form = FormTracker(root=str(tmp_path))
+    assert NBADataExtractor(client=_GrowingLogClient(_season_log()), form=form).form is form
@@ -0,0 +1,111 @@
+"""
+Tests for the local prediction service
+A stand-in extractor answers offline; the HTTP server runs on an ephemeral port
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+from src.dependencies import DependencyGraph
+from src.prediction_model import AdvancedPredictor
+from src.service import PredictionService, ServiceClient, _ServiceHandler
+
+
+class _StandInClient:
+    def stats(self):
+        return {'frames': 0}
+
+
+class _StandInExtractor:
+    """The SuperPredictor surface the service uses, without network access"""
+
+    def __init__(self):
+        self.predictor = AdvancedPredictor()
+        self.client = _StandInClient()
+        self.dependencies = DependencyGraph()
+        self.data_version = 0
+        self.calls = []
+
+    def comprehensive_matchup_analysis(self, home_team, away_team, key_players_status=None):
+        self.calls.append(('matchup', home_team, away_team, key_players_status))
+        print(f"report for {away_team} @ {home_team}")
+        return {'prediction': {'home_win_probability': 62.5, 'away_win_probability': 37.5,
+                               'predicted_home_score': 114, 'predicted_away_score': 110,
+                               'favored_team': home_team, 'point_spread': 4.0, 'confidence': 'Medium'}}
+
+    def get_player_recent_stats(self, player_name, last_n_games=10):
+        self.calls.append(('player', player_name, last_n_games))
+        if player_name == 'Nobody':
+            return None
+        return {'player_name': player_name, 'avg_points': 27.0, 'avg_fg_pct': 51.0, 'avg_plus_minus': 4.0,
+                'consistency': 80.0, 'games_played': last_n_games}
+
+    def refresh_data(self):
+        self.calls.append(('refresh',))
+        self.data_version += 1
+
+
+def _serve(service):
+    handler = type('ServiceHandler', (_ServiceHandler,), {'service': service, 'log_message': lambda *a: None})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, ServiceClient(f'http://127.0.0.1:{server.server_address[1]}', timeout=10)
+
+
+def _get_status(client, path):
+    try:
+        with urllib.request.urlopen(client.base_url + path, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_endpoints_answer_with_results_and_captured_reports():
+    extractor = _StandInExtractor()
+    server, client = _serve(PredictionService(extractor))
+    try:
+        reply = client.matchup('Lakers', 'Warriors')
+        assert reply['result']['prediction']['favored_team'] == 'Lakers'
+        assert reply['result']['insights']
+        assert reply['report'] == 'report for Warriors @ Lakers\n'
+
+        status = {'home': [{'name': 'LeBron James', 'playing': False, 'impact': 'high'}]}
+        client.matchup('Lakers', 'Warriors', status)
+        assert extractor.calls[-1] == ('matchup', 'Lakers', 'Warriors', status)
+
+        reply = client.player('Jayson Tatum', last_n_games=5)
+        assert reply['result']['stats']['games_played'] == 5
+        assert reply['result']['prediction']['player'] == 'Jayson Tatum'
+        assert client.player('Nobody')['result'] is None
+
+        health = client.health()
+        assert health['status'] == 'ok'
+        assert health['prediction_cache']['misses'] >= 1
+        assert 'nodes' in health['dependencies']
+
+        assert client.refresh()['result'] is None and extractor.data_version == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_bad_requests_unknown_paths_and_state_changes_over_get_are_rejected():
+    extractor = _StandInExtractor()
+    server, client = _serve(PredictionService(extractor))
+    try:
+        assert _get_status(client, '/matchup?home=Lakers')[0] == 400
+        assert _get_status(client, '/player')[0] == 400
+        status, reply = _get_status(client, '/player?name=Jayson+Tatum&last_n_games=ten')
+        assert status == 400 and 'last_n_games' in reply['error']
+        assert _get_status(client, '/player?name=Jayson+Tatum&last_n_games=0')[0] == 400
+        assert _get_status(client, '/nope')[0] == 404
+        assert _get_status(client, '/refresh')[0] == 405
+        assert _get_status(client, '/prefetch')[0] == 405
+        assert extractor.data_version == 0
+        assert not [call for call in extractor.calls if call[0] == 'player']
+    finally:
+        server.shutdown()
+        server.server_close()
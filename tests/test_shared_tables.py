@@ -0,0 +1,83 @@
+"""
+Tests for league tables shared with process-pool workers
+Publishes tests/fakes.league_frame() and a hand-built table to pool workers
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.feature_store import FeatureStore, backtest
+from src.prediction_model import AdvancedPredictor
+from src.shared_tables import SharedTables, search_weights, table
+from src.warehouse import HistoricalWarehouse
+from tests.fakes import league_frame
+
+
+def _worker_summary(column):
+    """Runs in a pool worker: read a shared column and check it cannot be written"""
+    frame = table('games').frame()
+    array = table('games').arrays([column])[column]
+    return float(frame[column].sum()), array.flags.writeable, len(frame)
+
+
+def test_workers_attach_read_only_views_and_blocks_are_freed_on_exit():
+    games = pd.DataFrame({
+        'TEAM_ID': np.arange(1000, dtype=np.int64),
+        'PTS': np.linspace(90, 130, 1000),
+        'GAME_DATE': pd.date_range('2025-01-01', periods=1000, freq='h'),
+        'WL': pd.Categorical(['W', 'L'] * 500),
+        'MATCHUP': [f'T{i} vs. T{i + 1}' for i in range(1000)],
+    })
+    with SharedTables() as shared:
+        handle = shared.publish('games', games)
+        with shared.pool(2) as pool:
+            results = list(pool.map(_worker_summary, ['PTS', 'TEAM_ID']))
+    blocks = [column['block'] for column in handle.columns]
+
+    assert results == [(float(games['PTS'].sum()), False, 1000), (float(games['TEAM_ID'].sum()), False, 1000)]
+    for block in blocks:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=block)
+
+
+def test_weight_search_matches_an_in_process_backtest():
+    games = league_frame()
+    store = FeatureStore('unused')
+    store.build(games)
+
+    results = search_weights(store, games, [{}, {'home_court': 0.3}], processes=2)
+
+    rows = list(backtest(store, AdvancedPredictor(), games))
+    accuracy = round(100 * np.mean([(p['home_win_probability'] > 50) == won for _, p, won in rows]), 2)
+    assert results[0]['games'] == len(rows)
+    assert results[0]['accuracy'] == accuracy
+    assert results[1]['weights'] == {'home_court': 0.3}
+
+
+def test_text_and_categorical_columns_round_trip_through_frame():
+    frame = pd.DataFrame({
+        'PLAYER_NAME': pd.Series(['LeBron James', None, 'Stephen Curry'], dtype='str'),
+        'WL': pd.Categorical(['W', 'L', None]),
+        'PTS': [30, 25, 20],
+    })
+    with SharedTables() as shared:
+        shared_frame = shared.publish('players', frame).frame()
+
+        assert shared_frame['PLAYER_NAME'].tolist() == ['LeBron James', '', 'Stephen Curry']
+        pd.testing.assert_series_equal(shared_frame['WL'], frame['WL'])
+        assert shared_frame['PTS'].tolist() == [30, 25, 20]
+
+
+def test_warehouse_player_logs_can_be_published(tmp_path):
+    games = league_frame(n_games=30, n_teams=3, team_ids=(1610612747, 1610612744, 1610612738))
+    logs = games.assign(PLAYER_ID=games['TEAM_ID'] * 10,
+                        PLAYER_NAME='Player ' + games['TEAM_ABBREVIATION'].astype(str))
+    warehouse = HistoricalWarehouse(str(tmp_path), client=object())
+    warehouse.write_season('player_games', '2024-25', logs)
+    players = warehouse.load('player_games')
+
+    with SharedTables() as shared:
+        pd.testing.assert_frame_equal(shared.publish('players', players).frame(), players)
@@ -0,0 +1,91 @@
+"""
+Tests for the similar-matchup nearest-neighbour index
+Runs offline on a synthetic league through the feature store
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.feature_store import FeatureStore
+from src.similarity import FEATURE_NAMES, MatchupIndex, SimilarMatchups
+from src.warehouse import HistoricalWarehouse
+from tests.fakes import league_frame
+
+
+def _brute_force(index, vector, k):
+    point = index._standardize(np.asarray(vector, dtype='float64')[None, :])[0]
+    return np.argsort(((index.vectors - point) ** 2).sum(1), kind='stable')[:k]
+
+
+def test_index_finds_the_nearest_vectors_and_grows_incrementally():
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(4000, 12)) @ rng.normal(size=(12, 12))
+    index = MatchupIndex().fit(vectors[:2000])
+    index.add(vectors[2000:2500])  # appended to existing lists
+    assert index._trained_size == 2000 and len(index) == 2500
+    assert sum(len(ids) for ids in index.lists) == 2500
+
+    queries = vectors[:50] + rng.normal(size=(50, 12)) * 0.2
+    recall = np.mean([len(set(index.query(q, 10)[0]) & set(_brute_force(index, q, 10))) / 10 for q in queries])
+    assert recall > 0.9
+
+    # Probing every list is an exact search
+    index.nprobe = len(index.lists)
+    ids, distances = index.query(queries[0], 10)
+    assert list(ids) == list(_brute_force(index, queries[0], 10))
+    assert np.all(np.diff(distances) >= 0)
+
+    index.add(vectors[2500:])  # doubled since training: centroids are refitted
+    assert index._trained_size == 4000 and len(index.lists) == 63
+
+
+def test_similar_games_come_from_pre_game_features():
+    games = league_frame(n_games=600, n_teams=10)
+    store = FeatureStore('unused')
+    store.build(games)
+    matchups = SimilarMatchups(store)
+    indexed = matchups.update(games)
+    assert 0 < indexed <= 600
+    assert matchups.update(games) == 0
+
+    # A past game's own inputs find that game first
+    game = matchups.games.iloc[len(matchups.games) // 2]
+    inputs = store.prediction_inputs(game['HOME_ID'], game['AWAY_ID'], game['GAME_DATE'])
+    similar = matchups.similar(inputs, k=5)
+    assert similar.loc[0, 'GAME_ID'] == game['GAME_ID']
+    assert similar.loc[0, 'DISTANCE'] < 1e-3
+    assert np.allclose(similar.loc[0, FEATURE_NAMES].to_numpy(dtype=float),
+                       game[FEATURE_NAMES].to_numpy(dtype=float))
+
+    # A backtest of that date only sees earlier games
+    earlier = matchups.similar(inputs, k=5, before=game['GAME_DATE'])
+    assert len(earlier) == 5 and (earlier['GAME_DATE'] < pd.Timestamp(game['GAME_DATE'])).all()
+
+
+def test_saved_index_is_reused_until_the_warehouse_changes(tmp_path):
+    warehouse = HistoricalWarehouse(str(tmp_path / 'warehouse'), client=object())
+    for year in (2023, 2024):
+        season = f'{year}-{year - 1999}'
+        warehouse.write_season('team_games', season, league_frame(300, 8, seed=year, season=season,
+                                                                  start=f'{year}-10-20'))
+    games = warehouse.load('team_games')
+    store = FeatureStore('unused')
+    store.build(games)
+    matchups = SimilarMatchups(store)
+    matchups.update(games)
+    version = warehouse.manifest_version('team_games')
+    matchups.save(str(tmp_path / 'index'), version=version)
+
+    loaded = SimilarMatchups.load(store, str(tmp_path / 'index'), version=version)
+    assert [list(ids) for ids in loaded.index.lists] == [list(ids) for ids in matchups.index.lists]
+    assert loaded.update(games) == 0
+    game = matchups.games.iloc[-1]
+    inputs = store.prediction_inputs(game['HOME_ID'], game['AWAY_ID'], game['GAME_DATE'])
+    pd.testing.assert_frame_equal(loaded.similar(inputs, k=5), matchups.similar(inputs, k=5), check_dtype=False)
+
+    # Rewriting a season changes the manifest, so the saved index is stale
+    warehouse.write_season('team_games', '2024-25', league_frame(320, 8, seed=1, season='2024-25',
+                                                                 start='2024-10-20'))
+    assert warehouse.manifest_version('team_games') != version
+    assert SimilarMatchups.load(store, str(tmp_path / 'index'),
+                                version=warehouse.manifest_version('team_games')) is None
@@ -0,0 +1,70 @@
+"""
+Tests for the partitioned historical warehouse
+Partitions are written from tests/fakes.league_frame() under tmp_path
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.endpoints import recent_seasons
+from src.warehouse import HistoricalWarehouse
+from tests.fakes import league_frame
+
+TEAM_IDS = (1610612747, 1610612744, 1610612738)  # LAL, GSW, BOS
+
+
+def _league_games(season, n_games=30):
+    """One game a day from October 20 between the three teams"""
+    return league_frame(n_games, seed=int(season[:4]), season=season, start=f"{season[:4]}-10-20",
+                        games_per_day=1, team_ids=TEAM_IDS)
+
+
+def _warehouse(tmp_path, seasons):
+    warehouse = HistoricalWarehouse(str(tmp_path), client=object())
+    for season in seasons:
+        warehouse.write_season('team_games', season, _league_games(season))
+    return warehouse
+
+
+def test_team_and_season_predicates_prune_partitions(tmp_path):
+    """Loading one team's seasons only opens that team's partitions"""
+    seasons = recent_seasons(6)
+    warehouse = _warehouse(tmp_path, seasons)
+
+    assert warehouse.seasons() == seasons
+    assert len(warehouse.partitions(teams=['LAL'], seasons=seasons[-5:])) == 5
+
+    games = warehouse.load(teams=['Lakers'], seasons=seasons[-5:])
+    assert len(games) == sum((_league_games(season)['TEAM_ID'] == 1610612747).sum() for season in seasons[-5:])
+    assert set(games['TEAM_ABBREVIATION']) == {'LAL'}
+    assert games['GAME_DATE'].is_monotonic_decreasing
+    assert games['PTS'].dtype == np.int16
+
+
+def test_date_range_and_column_projection(tmp_path):
+    """Date bounds filter rows across seasons and only requested columns come back"""
+    seasons = recent_seasons(3)
+    warehouse = _warehouse(tmp_path, seasons)
+    date_from = pd.Timestamp(f"{seasons[1][:4]}-11-01")
+    date_to = pd.Timestamp(f"{seasons[1][:4]}-11-30")
+
+    games = warehouse.load(teams=['BOS', 'GSW'], date_from=date_from, date_to=date_to,
+                           columns=['TEAM_ABBREVIATION', 'PTS', 'GAME_DATE'])
+
+    expected = _league_games(seasons[1])
+    expected = expected[expected['TEAM_ID'].isin([1610612738, 1610612744])
+                        & expected['GAME_DATE'].between(date_from, date_to)]
+    assert list(games.columns) == ['TEAM_ABBREVIATION', 'PTS', 'GAME_DATE']
+    assert len(games) == len(expected) > 0
+    assert sorted(games['PTS'].tolist()) == sorted(expected['PTS'].tolist())
+    assert warehouse.load(date_from='2100-01-01').empty
+
+
+def test_rewriting_a_season_replaces_it(tmp_path):
+    """Re-ingesting a season swaps in the new partitions instead of appending"""
+    season = recent_seasons(1)[0]
+    warehouse = _warehouse(tmp_path, [season])
+    warehouse.write_season('team_games', season, _league_games(season, n_games=40))
+
+    assert len(warehouse.load()) == 2 * 40
+    assert warehouse.info()['team_games'][season] == {'partitions': 3, 'rows': 80}